@@ -0,0 +1,74 @@
+#! /usr/bin/env python
+
+# Import time budget check for the PyBERT package.
+#
+# Original author: agent <agent@local>
+# Original date:   October 19, 2026
+#
+# Copyright (c) 2026 agent; all rights reserved World wide.
+
+"""
+Import time budget check for the PyBERT package.
+
+This Python script imports each of the compute modules of the PyBERT
+package, in a fresh interpreter, and checks that:
+
+  - the import completes within its time budget, and
+  - none of the heavy, or GUI related, packages got pulled in along the way.
+
+It exits with a non-zero status, if any check fails.
+
+Usage:
+
+    python benchmarks/import_time.py [n_trials]
+
+(Run from the directory containing the 'pybert' package.)
+"""
+
+import os
+import subprocess
+import sys
+
+# Import time budgets (s), by module. (The best of several trials is compared against these.)
+gBudgets = {
+    'pybert.pybert_util': 0.25,
+    'pybert.stat_eye':    0.25,
+    'pybert.simulation':  0.35,
+}
+
+# Modules which must not be loaded, as a side effect of importing any of the above.
+gForbidden = ['pylab', 'matplotlib', 'traits', 'traitsui', 'chaco', 'enable', 'scipy.stats', 'scipy.signal']
+
+gProbe = """
+import sys, time
+t = time.time()
+import %s
+dt = time.time() - t
+print dt
+print ' '.join([name for name in %r if name in sys.modules])
+"""
+
+def time_import(module):
+    """Return the time taken to import 'module' in a fresh interpreter, along w/ any forbidden modules loaded."""
+
+    out = subprocess.check_output([sys.executable, '-W', 'ignore', '-c', gProbe % (module, gForbidden)],
+                                  cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    lines = out.split('\n')
+    return (float(lines[0]), lines[1].split())
+
+def main(n_trials=5):
+    failed = False
+    for module in sorted(gBudgets):
+        trials = [time_import(module) for i in range(n_trials)]
+        best   = min([dt for (dt, loaded) in trials])
+        loaded = trials[-1][1]
+        ok     = best <= gBudgets[module] and not loaded
+        print "%-20s %6.3f s (budget: %5.3f s) %s %s" % (module, best, gBudgets[module],
+                                                        ok and 'OK' or 'FAIL', loaded and 'loaded: ' + ', '.join(loaded) or '')
+        failed = failed or not ok
+    return failed
+
+if __name__ == '__main__':
+    if(len(sys.argv) > 1):
+        sys.exit(main(int(sys.argv[1])))
+    sys.exit(main())
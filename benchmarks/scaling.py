@@ -0,0 +1,209 @@
+#! /usr/bin/env python
+
+# Scaling benchmarks for the PyBERT simulation kernels.
+#
+# Original author: agent <agent@local>
+# Original date:   October 19, 2026
+#
+# Copyright (c) 2026 agent; all rights reserved World wide.
+
+"""
+Scaling benchmarks for the PyBERT simulation kernels.
+
+This Python script runs the headless simulation (See 'simulation.py'.),
+followed by the eye diagram calculations done by the GUI, over a matrix
+of run lengths, over-sampling ratios, modulation types, and DFE summing
+node models, and reports the throughput of each kernel, along with the
+peak memory usage of the run.
+
+Each case is run in a fresh interpreter, so that its peak memory usage
+is its own. The kernel timings are taken from the run's profile (See
+'instrument.py'.), and are reported for:
+
+  - the full simulation, and each of its stages,
+  - the convolutions (summed over the stages),
+  - DFE.run(),
+  - calc_jitter() (summed over the four probe points), and
+  - calc_eye() (summed over the four probe points).
+
+Throughput is given in samples (i.e. - nbits * nspb) per second of
+wall clock time, as the old per-stage performance numbers were.
+
+The results are written, as JSON, to the output file, and may be
+compared against those of an earlier run. A kernel whose throughput has
+dropped by more than the tolerance is flagged, and the script exits w/
+a non-zero status.
+
+The full matrix is large; the longest runs need several GB of memory,
+and hours. So, cases of more than '--max-samples' samples are skipped.
+
+Usage:
+
+    python benchmarks/scaling.py [--out scaling.json] [--baseline old.json] [--max-samples N] ...
+
+(Run from the directory containing the 'pybert' package. Use '--help' for all the options.)
+"""
+
+import argparse
+import itertools
+import json
+import os
+import subprocess
+import sys
+
+gNbits      = [10000, 100000, 1000000, 10000000]
+gNspb       = [8, 16, 32, 64]
+gModTypes   = {'nrz': 0, 'duo': 1, 'pam4': 2}
+gSumModels  = {'ideal': True, 'real': False}
+gMaxSamples = 2000000 # default limit on nbits * nspb
+gTolerance  = 0.10    # default allowed fractional loss of throughput, relative to the baseline
+
+# The profile sections reported individually, by path, and those summed over all paths ending in the given name.
+gSections = ['simulation', 'simulation/signal', 'simulation/channel', 'simulation/tx', 'simulation/ctle',
+             'simulation/dfe', 'simulation/stat_eye', 'simulation/jitter']
+gKernels  = ['convolve', 'DFE.run', 'calc_jitter', 'calc_eye']
+
+def run_case(nbits, nspb, mod_type, sum_ideal, seed=0):
+    """
+    Run one case, in this process, returning its results.
+
+    Outputs:
+
+      - results   A dictionary containing: 'kernels', a dictionary, keyed by section/kernel name,
+                  of dictionaries of: 'calls', 'wall', 'cpu', and 'samples_per_s';
+                  and 'peak_rss', the peak memory usage of the process (bytes).
+
+    """
+
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'pybert'))
+    from simulation  import Params, simulate
+    from pybert_util import calc_eye
+    from instrument  import _peak_rss
+
+    # (The eye is kept at the GUI's default fraction of the run, since the jitter rejection ratio
+    #  calculation requires the run length to be a whole multiple of it.)
+    params  = Params(nbits=nbits, nspb=nspb, mod_type=mod_type, sum_ideal=sum_ideal, seed=seed,
+                     eye_bits=nbits * Params.eye_bits // Params.nbits)
+    results = simulate(params)
+
+    # The eye diagrams, as calculated by the GUI. (See 'update_results()', in pybert_cntrl.py.)
+    ui           = params.ui * 1.e-12
+    samps_per_ui = nspb
+    if(mod_type == 2):
+        ui           *= 2.
+        samps_per_ui *= 2
+    ignore_until = (nbits - params.eye_bits) * ui
+    with results.profile.section('eyes'):
+        for y in (results.chnl_out, results.tx_out, results.ctle_out):
+            calc_eye(ui, samps_per_ui, 100, y)
+        calc_eye(ui, samps_per_ui, 100, results.dfe_out, [t for t in results.clock_times if t > ignore_until])
+
+    n_samps = nbits * nspb
+    kernels = {}
+    for total in results.profile.totals():
+        name = total['path'].split('/')[-1]
+        if(total['path'] in gSections):
+            name = total['path']
+        elif(name not in gKernels):
+            continue
+        kernel = kernels.setdefault(name, {'calls': 0, 'wall': 0., 'cpu': 0.})
+        kernel['calls'] += total['calls']
+        kernel['wall']  += total['wall']
+        kernel['cpu']   += total['cpu']
+    for kernel in kernels.values():
+        kernel['samples_per_s'] = kernel['wall'] and n_samps / kernel['wall'] or None
+
+    return {'kernels': kernels, 'peak_rss': _peak_rss()}
+
+def case_name(nbits, nspb, mod, summer):
+    return '%s-%s-nbits%d-nspb%d' % (mod, summer, nbits, nspb)
+
+def spawn_case(nbits, nspb, mod, summer):
+    """Run one case, in a fresh interpreter, returning its results, or an error message."""
+
+    proc = subprocess.Popen([sys.executable, '-W', 'ignore', os.path.abspath(__file__), '--case',
+                             str(nbits), str(nspb), mod, summer],
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    (out, err) = proc.communicate()
+    if(proc.returncode):
+        lines = err.strip().split('\n')
+        return {'error': lines[-1]}
+    return json.loads(out)
+
+def compare(results, baseline, tolerance):
+    """Print the change in each kernel's throughput, relative to the baseline, returning True, if any has regressed."""
+
+    regressed = False
+    print
+    print "Change in throughput, relative to the baseline: (flagged, if worse than -%d%%)" % (tolerance * 100)
+    for case in sorted(results):
+        if(case not in baseline or 'kernels' not in results[case] or 'kernels' not in baseline[case]):
+            continue
+        for (name, kernel) in sorted(results[case]['kernels'].items()):
+            old = baseline[case]['kernels'].get(name)
+            if(not old or not old['samples_per_s'] or not kernel['samples_per_s']):
+                continue
+            change = kernel['samples_per_s'] / old['samples_per_s'] - 1.
+            flag   = ''
+            if(change < -tolerance):
+                flag      = '  <-- REGRESSION'
+                regressed = True
+            print "  %-32s %-24s %+7.1f%%%s" % (case, name, change * 100., flag)
+    return regressed
+
+def main():
+    parser = argparse.ArgumentParser(description='Runs the PyBERT simulation kernels over a scaling matrix.')
+    parser.add_argument('--nbits',       type=int, nargs='+', default=gNbits,  help='run lengths (bits)')
+    parser.add_argument('--nspb',        type=int, nargs='+', default=gNspb,   help='samples per bit')
+    parser.add_argument('--mod',         nargs='+', default=sorted(gModTypes),  choices=sorted(gModTypes),  help='modulation types')
+    parser.add_argument('--sum',         nargs='+', default=sorted(gSumModels), choices=sorted(gSumModels), help='DFE summing node models')
+    parser.add_argument('--max-samples', type=float, default=gMaxSamples, help='skip cases w/ more than this many samples')
+    parser.add_argument('--repeat',      type=int, default=1, help='run each case this many times, keeping the fastest')
+    parser.add_argument('--out',         default='scaling.json', help='output file')
+    parser.add_argument('--baseline',    help='results of an earlier run, to compare against')
+    parser.add_argument('--tolerance',   type=float, default=gTolerance, help='allowed fractional loss of throughput')
+    parser.add_argument('--case',        nargs=4, help=argparse.SUPPRESS) # (Used internally, to run one case.)
+    args = parser.parse_args()
+
+    if(args.case):
+        (nbits, nspb, mod, summer) = args.case
+        print json.dumps(run_case(int(nbits), int(nspb), gModTypes[mod], gSumModels[summer]))
+        return 0
+
+    results = {}
+    for (nbits, nspb, mod, summer) in itertools.product(args.nbits, args.nspb, args.mod, args.sum):
+        if(nbits * nspb > args.max_samples):
+            continue
+        case = case_name(nbits, nspb, mod, summer)
+        best = None
+        for i in range(args.repeat):
+            result = spawn_case(nbits, nspb, mod, summer)
+            if('error' in result):
+                best = result
+                break
+            if(best is None or result['kernels']['simulation']['wall'] < best['kernels']['simulation']['wall']):
+                best = result
+        best['params']  = {'nbits': nbits, 'nspb': nspb, 'mod': mod, 'sum': summer}
+        results[case]   = best
+        if('error' in best):
+            print "%-32s ERROR: %s" % (case, best['error'])
+        else:
+            kernels = best['kernels']
+            print "%-32s %8.3f Msmpls/s total; %6.3f DFE.run; %6.3f calc_jitter; %6.3f calc_eye; peak RSS: %6.1f MB" % \
+                    (case, kernels['simulation']['samples_per_s'] * 1.e-6, kernels['DFE.run']['samples_per_s'] * 1.e-6,
+                     kernels['calc_jitter']['samples_per_s'] * 1.e-6, kernels['calc_eye']['samples_per_s'] * 1.e-6,
+                     (best['peak_rss'] or 0) * 1.e-6)
+        sys.stdout.flush()
+
+    with open(args.out, 'w') as f:
+        json.dump(results, f, indent=1, sort_keys=True)
+    print "Results written to '%s'." % args.out
+
+    if(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        return compare(results, baseline, args.tolerance)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
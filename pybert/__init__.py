@@ -12,12 +12,9 @@ Testing by:      Mark Marlett <mark.marlett@gmail.com>
 Copyright (c) 2014 by David Banas; All rights reserved World wide.
 """
 
-import pybert
-import pybert_view
-import pybert_cntrl
-import pybert_util
-import dfe
-import cdr
-
-__all__ = ['pybert', 'pybert_view', 'pybert_cntrl', 'pybert_util', 'dfe', 'cdr']
+# Note: The modules are not imported here, so that using one of them (e.g. - 'pybert.pybert_util')
+#       doesn't pay for importing the rest (and, in particular, the GUI machinery).
+#       'from pybert import *' still imports all of them, by way of '__all__'.
+
+__all__ = ['pybert', 'pybert_view', 'pybert_cntrl', 'pybert_util', 'dfe', 'cdr', 'parallel', 'stat_eye', 'pipeline', 'simulation', 'sweep', 'worker', 'store', 'instrument', 'stream', 'rng', 'montecarlo', 'decimate', 'precision', 'bit_errs']
 
@@ -0,0 +1,175 @@
+# Bit error counting for PyBERT.
+#
+# Original author: agent <agent@local>
+# Original date:   October 19, 2026
+#
+# Copyright (c) 2026 agent; all rights reserved World wide.
+
+"""
+Bit error counting for PyBERT.
+
+This Python script compares the bits recovered by the receiver to those
+transmitted, reporting the number and positions of the bit errors, and
+how they cluster into bursts (e.g. - through DFE error propagation).
+
+The delay of the recovered bits, relative to those transmitted, is found
+by cross-correlating the two sequences, via FFT; so, alignment takes
+O(N log N) time, rather than the O(N^2) of direct correlation. The
+aligned sequences are then packed, eight bits to the byte, XORed, and
+the errors counted by table lookup of the population count of each byte;
+so, error counting takes time proportional to the number of bits checked.
+
+Typical usage:
+
+    errs = check_bits(bits, bits_out, first_bit=nbits - eye_bits)
+    print errs.bit_errs, errs.bits_checked, errs.n_bursts, errs.max_burst
+"""
+
+from numpy     import array, asarray, concatenate, diff, flatnonzero, packbits, unpackbits, rint, conj, uint8, zeros
+from numpy.fft import rfft, irfft
+
+gBurstGap = 1 # errors no more than this many bits apart belong to the same burst
+
+# The number of set bits in each possible byte value.
+gPopCount = array([bin(i).count('1') for i in range(256)], dtype=uint8)
+
+class BitErrors(object):
+    """
+    The results of a bit error check.
+
+    Attributes:
+
+      - bit_errs      The number of bit errors.
+
+      - bits_checked  The number of bits checked.
+
+      - bit_dly       The delay, in bits, of the recovered bits, relative to those transmitted.
+
+      - auto_corr     The correlation of the recovered bits w/ those transmitted, vs. delay,
+                      from which 'bit_dly' was found. (Normalized to the number of transmitted ones.)
+
+      - positions     The indices, into the transmitted bits, of the bits received in error.
+
+      - burst_starts  The index, into 'positions', of the first error of each burst.
+
+      - burst_lens    The number of errors in each burst.
+
+      - n_bursts      The number of bursts.
+
+      - max_burst     The number of errors in the longest burst. (Zero, if there are no errors.)
+
+      - mean_burst    The mean number of errors per burst. (Zero, if there are no errors.)
+    """
+
+    pass
+
+def align_bits(bits, bits_out):
+    """
+    Find the delay of the recovered bits, relative to those transmitted, by FFT cross-correlation.
+
+    Inputs:
+
+      - bits          The transmitted bits.
+
+      - bits_out      The recovered bits.
+
+    Outputs:
+
+      - bit_dly       The delay (bits) at which the correlation is greatest. (The least such, in case of a tie,
+                      as there is for a repeating pattern.)
+
+      - auto_corr     The correlation, vs. delay, for delays up to half the longer sequence.
+                      (Normalized to the number of ones transmitted.)
+
+    """
+
+    bits     = asarray(bits,     dtype=float)
+    bits_out = asarray(bits_out, dtype=float)
+    n        = max(len(bits), len(bits_out))
+    n_fft    = 1
+    while(n_fft < len(bits) + len(bits_out)):    # (No wrap around.)
+        n_fft *= 2
+
+    corr      = rint(irfft(rfft(bits_out, n_fft) * conj(rfft(bits, n_fft)), n_fft))
+    auto_corr = corr[: n - n // 2] / bits.sum()
+    bit_dly   = int(auto_corr.argmax())
+    return (bit_dly, auto_corr)
+
+def find_bursts(positions, burst_gap=gBurstGap):
+    """
+    Group bit errors into bursts.
+
+    Inputs:
+
+      - positions     The (ascending) positions of the bit errors.
+
+      - burst_gap     Errors no more than this many bits apart belong to the same burst.
+
+    Outputs:
+
+      - burst_starts  The index, into 'positions', of the first error of each burst.
+
+      - burst_lens    The number of errors in each burst.
+
+    """
+
+    positions = asarray(positions)
+    if(not len(positions)):
+        return (zeros(0, dtype=int), zeros(0, dtype=int))
+    burst_starts = concatenate([[0], flatnonzero(diff(positions) > burst_gap) + 1])
+    burst_lens   = diff(concatenate([burst_starts, [len(positions)]]))
+    return (burst_starts, burst_lens)
+
+def check_bits(bits, bits_out, first_bit=0, burst_gap=gBurstGap):
+    """
+    Count, and locate, the bit errors in a recovered bit sequence.
+
+    Inputs:
+
+      Required:
+
+      - bits          The transmitted bits.
+
+      - bits_out      The recovered bits.
+
+      Optional:
+
+      - first_bit     The index of the first transmitted bit to be checked. (Earlier bits are
+                      excluded, to give the receiver time to adapt and lock.)
+
+      - burst_gap     Errors no more than this many bits apart belong to the same burst.
+
+    Outputs:
+
+      - errs          The results, as a 'BitErrors' instance.
+
+    """
+
+    bits     = asarray(bits,     dtype=uint8)
+    bits_out = asarray(bits_out, dtype=uint8)
+
+    errs = BitErrors()
+    (errs.bit_dly, errs.auto_corr) = align_bits(bits[first_bit:], bits_out[first_bit:])
+
+    # Pack the aligned sequences, and count the ones in their XOR.
+    sent     = bits[first_bit : len(bits_out) - errs.bit_dly]
+    received = bits_out[first_bit + errs.bit_dly : first_bit + errs.bit_dly + len(sent)]
+    xor      = packbits(sent) ^ packbits(received)
+    errs.bits_checked = len(sent)
+    errs.bit_errs     = int(gPopCount[xor].sum())
+
+    # Locate the errors, and group them into bursts.
+    if(errs.bit_errs):
+        errs.positions = first_bit + flatnonzero(unpackbits(xor)[: len(sent)])
+    else:
+        errs.positions = zeros(0, dtype=int)
+    (errs.burst_starts, errs.burst_lens) = find_bursts(errs.positions, burst_gap)
+    errs.n_bursts = len(errs.burst_lens)
+    if(errs.n_bursts):
+        errs.max_burst  = int(errs.burst_lens.max())
+        errs.mean_burst = float(errs.bit_errs) / errs.n_bursts
+    else:
+        errs.max_burst  = 0
+        errs.mean_burst = 0.
+
+    return errs
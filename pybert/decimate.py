@@ -0,0 +1,208 @@
+# Level of detail decimation of waveforms, for plotting.
+#
+# Original author: agent <agent@local>
+# Original date:   October 19, 2026
+#
+# Copyright (c) 2026 agent; all rights reserved World wide.
+
+"""
+Level of detail decimation of waveforms, for plotting.
+
+This Python script provides a min/max decimation pyramid, which lets the
+GUI plot waveforms of millions of samples, while handing the plotting
+library no more points than there are pixels to draw them on.
+
+Each level of the pyramid divides the waveforms into blocks (of 8, 16,
+32, ... samples) and keeps just the minimum and maximum of each block,
+along w/ which of the two came first. Drawing those two points, in that
+order, for each block reproduces the envelope of the full resolution
+trace exactly (i.e. - no peaks are lost, as they would be by simple
+subsampling), at a pixel width of about one block.
+
+The pyramid is built once per run, in time proportional to the length
+of the waveforms, and takes about a quarter as much memory as they do.
+The plots then pull the level appropriate to the range of time they're
+showing, and their width in pixels. (See 'update_lod()', in pybert_cntrl.py.)
+
+Typical usage:
+
+    pyramid = WaveformPyramid(t_ns, {'chnl_out': chnl_out, 'ctle_out': ctle_out})
+    window  = pyramid.window(t_lo, t_hi, width)
+    (t, ys) = pyramid.data(window, ['chnl_out', 'ctle_out'])
+"""
+
+import numpy as np
+
+gBaseBlock      = 8   # number of samples per block, at the first decimated level
+gPointsPerPixel = 2   # full resolution is used, as long as there are no more than this many samples per pixel
+gMargin         = 0.5 # extra time range supplied, on either side of that requested, as a fraction of it (for smooth panning)
+
+class WaveformPyramid(object):
+    """
+    A min/max decimation pyramid, of a set of waveforms sharing a time vector.
+
+    Level 0 is the full resolution data; level k (k > 0) holds the minimum and maximum,
+    and their order, of each block of 'base_block * 2**(k-1)' samples.
+    (The extrema are kept in single precision; they're only for display.)
+    """
+
+    def __init__(self, t, waves, base_block=gBaseBlock):
+        """
+        Inputs:
+
+          Required:
+
+          - t           The sample times.
+
+          - waves       A dictionary, keyed by name, of the waveforms, each the same length as 't'.
+
+          Optional:
+
+          - base_block  The number of samples per block, at level 1. Must be a power of 2.
+        """
+
+        assert base_block >= 2 and not (base_block & (base_block - 1)), "WaveformPyramid: 'base_block' must be a power of 2!"
+
+        self.t          = np.asarray(t, dtype=float)
+        self.waves      = {}
+        self.base_block = base_block
+        self.levels     = {}                     # name -> list of (mins, maxs, min_first), one per level, starting at 1
+        n               = len(self.t)
+        for (name, y) in waves.items():
+            y = np.asarray(y, dtype=float)
+            assert len(y) == n, "WaveformPyramid: Waveform '%s' has %d samples, but there are %d sample times!" % (name, len(y), n)
+            self.waves[name]  = y
+            self.levels[name] = self._build(y)
+        self.n_levels   = 1 + len(self._blocks_per_level())
+
+    def _blocks_per_level(self):
+        """Return the number of (whole) blocks at each decimated level."""
+
+        counts = []
+        n      = len(self.t) // self.base_block
+        while(n >= 2):
+            counts.append(n)
+            n //= 2
+        return counts
+
+    def _build(self, y):
+        """Return the decimated levels of one waveform."""
+
+        levels = []
+        counts = self._blocks_per_level()
+        if(not counts):
+            return levels
+
+        # Level 1, straight from the samples. (Any partial block, at the end, is left out.)
+        block  = self.base_block
+        blocks = y[:counts[0] * block].reshape((counts[0], block))
+        rows   = np.arange(counts[0])
+        min_ix = blocks.argmin(axis=1)
+        max_ix = blocks.argmax(axis=1)
+        mins   = blocks[rows, min_ix]
+        maxs   = blocks[rows, max_ix]
+        min_ix = min_ix + rows * block           # (positions within the whole waveform, for ordering the parents)
+        max_ix = max_ix + rows * block
+        levels.append((mins.astype(np.float32), maxs.astype(np.float32), min_ix < max_ix))
+
+        # Each further level, from the one below it.
+        for n in counts[1:]:
+            lo_min   = mins[0 : 2 * n : 2] <= mins[1 : 2 * n : 2]
+            hi_max   = maxs[0 : 2 * n : 2] >= maxs[1 : 2 * n : 2]
+            mins     = np.where(lo_min, mins[0 : 2 * n : 2], mins[1 : 2 * n : 2])
+            maxs     = np.where(hi_max, maxs[0 : 2 * n : 2], maxs[1 : 2 * n : 2])
+            min_ix   = np.where(lo_min, min_ix[0 : 2 * n : 2], min_ix[1 : 2 * n : 2])
+            max_ix   = np.where(hi_max, max_ix[0 : 2 * n : 2], max_ix[1 : 2 * n : 2])
+            levels.append((mins.astype(np.float32), maxs.astype(np.float32), min_ix < max_ix))
+
+        return levels
+
+    def block_size(self, level):
+        """Return the number of samples per block at the given level. (1, at level 0.)"""
+
+        if(level == 0):
+            return 1
+        return self.base_block * 2 ** (level - 1)
+
+    def window(self, t_lo=None, t_hi=None, width=1000, margin=gMargin):
+        """
+        Choose the level, and range of blocks, to plot, for a given time range and plot width.
+
+        Inputs:
+
+          - t_lo, t_hi  The time range being shown. (Default = everything.)
+
+          - width       The width of the plot (pixels).
+
+          - margin      The extra time range to supply, on either side, as a fraction of that shown.
+
+        Outputs:
+
+          - window      A (level, first block, last block + 1) tuple, for 'data()'.
+                        (Equal windows yield equal data; so, this may be used to skip redundant updates.)
+
+        """
+
+        t = self.t
+        n = len(t)
+        if(t_lo is None or t_hi is None or t_hi <= t_lo):
+            (i_lo, i_hi) = (0, n)
+            margin       = 0.
+        else:
+            span         = t_hi - t_lo
+            i_lo         = max(0, int(np.searchsorted(t, t_lo - margin * span)) - 1)
+            i_hi         = min(n, int(np.searchsorted(t, t_hi + margin * span)) + 1)
+        n_samps = i_hi - i_lo
+        width   = max(1, int(width))
+
+        # The finest level that puts no more than about one block in each pixel.
+        level   = 0
+        if(n_samps > gPointsPerPixel * width * (1. + 2. * margin)):
+            level = 1
+            while(level < self.n_levels - 1 and self.block_size(level) * width * (1. + 2. * margin) < n_samps):
+                level += 1
+        if(level == 0):
+            return (0, i_lo, i_hi)
+
+        block   = self.block_size(level)
+        n_blks  = len(self.levels.values()[0][level - 1][0])
+        return (level, i_lo // block, min(n_blks, -(-i_hi // block)))
+
+    def data(self, window, names):
+        """
+        Return the plot data for a window. (See 'window()'.)
+
+        Inputs:
+
+          - window      The window, as returned by 'window()'.
+
+          - names       The names of the waveforms wanted.
+
+        Outputs:
+
+          - t           The time vector.
+
+          - ys          A dictionary, keyed by name, of the waveforms.
+
+        At the decimated levels, each block contributes two points: its minimum and maximum,
+        in the order in which they occurred, placed at the start and middle of the block.
+        """
+
+        (level, first, last) = window
+        if(level == 0):
+            return (self.t[first : last], dict([(name, self.waves[name][first : last]) for name in names]))
+
+        block  = self.block_size(level)
+        starts = np.arange(first, last) * block
+        t      = np.empty(2 * len(starts))
+        t[0::2] = self.t[starts]
+        t[1::2] = self.t[starts + block // 2]
+        ys     = {}
+        for name in names:
+            (mins, maxs, min_first) = self.levels[name][level - 1]
+            (mins, maxs, min_first) = (mins[first : last], maxs[first : last], min_first[first : last])
+            y       = np.empty(2 * len(starts), dtype=np.float32)
+            y[0::2] = np.where(min_first, mins, maxs)
+            y[1::2] = np.where(min_first, maxs, mins)
+            ys[name] = y
+        return (t, ys)
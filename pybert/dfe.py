@@ -12,8 +12,8 @@ Copyright (c) 2014 by David Banas; All rights reserved World wide.
 """
 
 from numpy        import zeros, sign, array, prod
-from scipy.signal import lfilter, iirfilter
 from cdr          import CDR
+from instrument   import timed
 
 gNch_taps       = 3           # Number of taps used in summing node filter.
 
@@ -106,6 +106,7 @@ class DFE(object):
         """
 
         # Design summing node filter.
+        from scipy.signal import iirfilter # (Imported here, to keep 'import dfe' cheap.)
         fs     = n_spb / ui
         (b, a) = iirfilter(gNch_taps - 1, bandwidth/(fs/2), btype='lowpass')
         self.summing_filter = LfilterSS(b, a)
@@ -121,6 +122,7 @@ class DFE(object):
         self.n_ave             = n_ave
         self.corrections       = zeros(n_taps)
         self.ideal             = ideal
+        self.run_state         = None # The state of 'run()', carried over to its next call.
 
         thresholds = []
         if  (mod_type == 0): # NRZ
@@ -220,8 +222,26 @@ class DFE(object):
 
         return decision, bits
 
-    def run(self, sample_times, signal):
-        """Run the DFE on the input signal."""
+    @timed('DFE.run')
+    def run(self, sample_times, signal, progress=None):
+        """
+        Run the DFE on the input signal.
+
+        Inputs:
+
+          - sample_times     The sample times of the input signal.
+
+          - signal           The input signal.
+
+          - progress         (optional) A function, taking the fraction of the signal processed so far,
+                             which is called every 1% of the way through. It may raise an exception,
+                             to abort the run.
+
+        The DFE (and its CDR) carries its state from one call to the next. So, a long signal
+        may be run in chunks, w/ the sample times of each chunk continuing on from those of
+        the last. (Only the first call includes the initial tap weights and clock time in its
+        outputs; the clock indicators, 'clocks', are indexed relative to the start of the chunk.)
+        """
 
         ui                = self.ui
         decision_scaler   = self.decision_scaler
@@ -231,23 +251,34 @@ class DFE(object):
         mod_type          = self.mod_type
         thresholds        = self.thresholds
 
-        clk_cntr           = 0
+        if(self.run_state is None):
+            clk_cntr           = 0
+            filter_out         = 0
+            nxt_filter_out     = 0
+            last_clock_sample  = 0
+            boundary_sample    = 0
+            next_boundary_time = 0
+            next_clock_time    = ui / 2.
+            locked             = False
+            tap_weights        = [self.tap_weights]
+            clock_times        = [next_clock_time]
+        else:
+            (clk_cntr, filter_out, nxt_filter_out, last_clock_sample, boundary_sample,
+             next_boundary_time, next_clock_time, locked) = self.run_state
+            tap_weights        = []
+            clock_times        = []
         smpl_cntr          = 0
-        filter_out         = 0
-        nxt_filter_out     = 0
-        last_clock_sample  = 0
-        next_boundary_time = 0
-        next_clock_time    = ui / 2.
-        locked             = False
 
         res         = []
-        tap_weights = [self.tap_weights]
         ui_ests     = []
         lockeds     = []
         clocks      = zeros(len(sample_times))
-        clock_times = [next_clock_time]
         bits        = []
+        n_samps     = len(sample_times)
+        report_intv = max(1, n_samps // 100)
         for (t, x) in zip(sample_times, signal):
+            if(progress and not smpl_cntr % report_intv):
+                progress(float(smpl_cntr) / n_samps)
             if(not ideal):
                 sum_out = summing_filter.step(x - filter_out)
             else:
@@ -294,6 +325,8 @@ class DFE(object):
             smpl_cntr += 1
 
         self.ui                = ui               
+        self.run_state         = (clk_cntr, filter_out, nxt_filter_out, last_clock_sample, boundary_sample,
+                                  next_boundary_time, next_clock_time, locked)
 
         return (res, tap_weights, ui_ests, clocks, lockeds, clock_times, bits)
 
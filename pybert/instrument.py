@@ -0,0 +1,302 @@
+# Run time instrumentation for PyBERT.
+#
+# Original author: agent <agent@local>
+# Original date:   October 19, 2026
+#
+# Copyright (c) 2026 agent; all rights reserved World wide.
+
+"""
+Run time instrumentation for PyBERT.
+
+This Python script provides a light weight profiler, which records the
+wall clock time, CPU time, and peak memory usage of each named section
+of a run (i.e. - each simulation stage, and certain sub-steps of them,
+such as the convolutions, 'DFE.run()', and each call to 'calc_jitter()'
+or 'calc_eye()').
+
+Sections nest; a section opened while another is open is recorded under
+the path of its parent (e.g. - 'simulation/dfe/DFE.run'). Each section
+costs only a few system calls, upon entry and exit; so, the profiler may
+be left on, always. When no profile is active, in the calling thread,
+the sections and 'timed()' functions do nothing.
+
+Notes:
+
+  - CPU time is that of the whole process (user + system), during the
+    section. (Python 2 offers no per-thread CPU clock.)
+
+  - Peak memory is the high water mark of the resident set size of the
+    process in which the section ran, as of the end of the section.
+    (It is not available on Windows.) The amount by which the section
+    raised that mark is recorded, as well.
+
+Typical usage:
+
+    profile = Profile()
+    with profile.section('simulation'):
+        ...
+        with section('convolve'):
+            y = convolve(x, h)
+        ...
+    profile.save('profile.json')
+
+    @timed()
+    def calc_something(...):
+        ...
+"""
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+try:
+    import resource
+except ImportError:                              # (Windows)
+    resource = None
+
+_local = threading.local()
+
+def _peak_rss():
+    """Return the peak resident set size of this process (bytes), or None, if it's unavailable."""
+
+    if(resource is None):
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if(sys.platform != 'darwin'):                # (Linux reports kilobytes; Mac OS X, bytes.)
+        peak *= 1024
+    return peak
+
+def _cpu_time():
+    """Return the CPU time (user + system) consumed by this process, so far (s)."""
+
+    (user, system) = os.times()[:2]
+    return user + system
+
+def _stack():
+    """Return the calling thread's stack of active profiles."""
+
+    try:
+        return _local.stack
+    except AttributeError:
+        _local.stack = []
+        return _local.stack
+
+def active_profile():
+    """Return the profile receiving the calling thread's sections, or None."""
+
+    stack = _stack()
+    if(stack):
+        return stack[-1]
+    return None
+
+class _Section(object):
+    """A section of a 'Profile', recorded upon exit."""
+
+    def __init__(self, profile, name):
+        self.profile = profile
+        self.name    = name
+
+    def __enter__(self):
+        _stack().append(self.profile)
+        self.profile._path.append(self.name)
+        self.peak_rss   = _peak_rss()
+        self.start_cpu  = _cpu_time()
+        self.start_time = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        wall     = time.time() - self.start_time
+        cpu      = _cpu_time() - self.start_cpu
+        peak_rss = _peak_rss()
+        if(peak_rss is None):
+            rss_growth = None
+        else:
+            rss_growth = peak_rss - self.peak_rss
+        profile  = self.profile
+        profile._add({
+            'path':       '/'.join(profile._path),
+            'calls':      1,
+            'start':      self.start_time,
+            'wall':       wall,
+            'cpu':        cpu,
+            'peak_rss':   peak_rss,
+            'rss_growth': rss_growth,
+            'pid':        os.getpid(),
+            'error':      exc_type is not None,
+        })
+        profile._path.pop()
+        _stack().pop()
+        return False
+
+class _NullSection(object):
+    """Stands in for a section, when no profile is active."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        return False
+
+_null_section = _NullSection()
+
+def section(name):
+    """Return a context manager recording the named section in the active profile, if there is one."""
+
+    profile = active_profile()
+    if(profile is None):
+        return _null_section
+    return _Section(profile, name)
+
+def timed(name=None):
+    """
+    Decorator recording each call of the function as a section of the active profile, if there is one.
+
+    The section is named after the function, unless 'name' is given.
+    """
+
+    def decorator(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profile = active_profile()
+            if(profile is None):
+                return func(*args, **kwargs)
+            with _Section(profile, label):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+class Profile(object):
+    """
+    The record of one run.
+
+    Each record is a dictionary containing:
+
+      - path        The '/' separated names of the section and its parents.
+
+      - calls       The number of times the section was run. (Always 1, unless aggregating.)
+
+      - start       The time at which the section was entered (s since the epoch).
+
+      - wall        The elapsed (wall clock) time (s).
+
+      - cpu         The CPU time consumed by the process (s).
+
+      - peak_rss    The peak resident set size of the process, as of the end of the section (bytes).
+
+      - rss_growth  The amount by which the section raised 'peak_rss' (bytes).
+
+      - pid         The process in which the section ran.
+
+      - error       True, if the section was exited by an exception.
+
+    The records are in the order in which the sections finished.
+
+    A profile created w/ 'aggregate=True' keeps just one record per path, summing the
+    times of all runs of the section, so that its size doesn't grow w/ the number of runs.
+    (Useful for sections run once per chunk of a long, streaming, simulation.)
+    """
+
+    def __init__(self, aggregate=False):
+        self.records    = []
+        self.aggregate  = aggregate
+        self.start_time = time.time()
+        self._path      = []
+        self._by_path   = {}
+
+    def _add(self, record):
+        if(self.aggregate and record['path'] in self._by_path):
+            total = self._by_path[record['path']]
+            total['calls'] += record.get('calls', 1)
+            total['wall']  += record['wall']
+            total['cpu']   += record['cpu']
+            for key in ('peak_rss', 'rss_growth'):
+                if(record[key] is not None):
+                    total[key] = max(total[key], record[key])
+            total['error'] = total['error'] or record['error']
+            return
+        self._by_path[record['path']] = record
+        self.records.append(record)
+
+    def section(self, name):
+        """Return a context manager recording the named section, and making this the active profile, for its duration."""
+
+        return _Section(self, name)
+
+    def merge(self, records):
+        """
+        Add records made elsewhere (e.g. - by a worker process) to this profile.
+
+        If a section of this profile is open, in the calling thread, the records are placed under it.
+        """
+
+        prefix = '/'.join(self._path)
+        for record in records:
+            record = dict(record)
+            if(prefix):
+                record['path'] = prefix + '/' + record['path']
+            self._add(record)
+
+    def totals(self):
+        """
+        Return the records, summed by path, in the order in which the paths were first entered.
+
+        Each total is a dictionary containing: 'path', 'calls', 'wall', 'cpu', 'peak_rss', and 'rss_growth'.
+        ('peak_rss' and 'rss_growth' are maxima, rather than sums.)
+        """
+
+        totals = {}
+        firsts = {}
+        for record in self.records:
+            path = record['path']
+            if(path not in totals):
+                totals[path] = {'path': path, 'calls': 0, 'wall': 0., 'cpu': 0., 'peak_rss': None, 'rss_growth': None}
+                firsts[path] = record['start']
+            total = totals[path]
+            total['calls'] += record.get('calls', 1)
+            total['wall']  += record['wall']
+            total['cpu']   += record['cpu']
+            for key in ('peak_rss', 'rss_growth'):
+                if(record[key] is not None):
+                    total[key] = max(total[key], record[key])
+            firsts[path] = min(firsts[path], record['start'])
+        return [totals[path] for path in sorted(totals, key=lambda path: (firsts[path], path.count('/')))]
+
+    def total(self, path):
+        """Return the total (See 'totals()'.) for the given path, or None, if it wasn't recorded."""
+
+        for total in self.totals():
+            if(total['path'] == path):
+                return total
+        return None
+
+    def as_dict(self):
+        """Return the profile, as a JSON friendly dictionary, w/ the record start times made relative to that of the profile."""
+
+        records = []
+        for record in sorted(self.records, key=lambda record: record['start']):
+            record          = dict(record)
+            record['start'] = record['start'] - self.start_time
+            records.append(record)
+        return {
+            'start':   time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.start_time)),
+            'records': records,
+            'totals':  self.totals(),
+        }
+
+    def to_json(self):
+        """Return the profile, as a JSON string."""
+
+        return json.dumps(self.as_dict(), indent=1, sort_keys=True)
+
+    def save(self, filename):
+        """Write the profile, as JSON, to the named file."""
+
+        with open(filename, 'w') as f:
+            f.write(self.to_json())
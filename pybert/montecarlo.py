@@ -0,0 +1,281 @@
+# Monte Carlo BER estimation for PyBERT.
+#
+# Original author: agent <agent@local>
+# Original date:   October 19, 2026
+#
+# Copyright (c) 2026 agent; all rights reserved World wide.
+
+"""
+Monte Carlo BER estimation for PyBERT.
+
+This Python script estimates the bit error rate of a link by running
+many independent replicas of the simulation, each w/ its own random
+noise, and pooling their bit error counts, until the BER is known
+well enough.
+
+The noiseless front end (i.e. - the signal generation, channel, Tx, and
+CTLE) is run only once, up front, and its output placed in shared
+memory. Since the CTLE is linear, each replica need only filter its
+own noise through the CTLE, add it to that output, and run the DFE/CDR.
+The replicas are farmed out to a pool of worker processes.
+
+Each replica draws its noise from its own substream of the run seed
+(See rng.py.); so, the estimate is reproducible, given the seed. The
+replica results are pooled in index order, regardless of the order in
+which they finish; so, the stopping point is reproducible, as well,
+and doesn't depend upon the number of worker processes.
+
+After each replica, an exact (Clopper-Pearson) confidence interval is
+found for the BER, and the run stops, as soon as:
+
+  - the interval is narrower than 'rel_tol' times the BER estimate,
+  - the interval lies wholly above, or below, 'ber_target' (if given), or
+  - 'max_bits' bits have been checked.
+
+Typical usage:
+
+    from pybert.simulation import Params
+    from pybert.montecarlo import run_ber
+
+    results = run_ber(Params(l_ch=2., rn=0.03, seed=1), max_bits=1e7)
+    print results.ber, results.ber_lower, results.ber_upper, results.stop_reason
+"""
+
+import multiprocessing as mp
+
+from numpy        import array, convolve
+from parallel     import share_array, shared_to_array
+from pipeline     import Pipeline
+from simulation   import Params, Results, make_pipeline, make_dfe, count_bit_errs
+from rng          import rng_stream
+from instrument   import Profile, section, active_profile
+
+gMaxBits    = 10000000 # default bit budget (bits checked, summed over all replicas)
+gRelTol     = 0.5      # default confidence interval width, relative to the BER estimate, at which to stop
+gConfidence = 0.95     # default confidence level of the interval
+
+def ber_interval(bit_errs, bits_checked, confidence=gConfidence):
+    """
+    Return the exact (Clopper-Pearson) confidence interval for a BER.
+
+    Inputs:
+
+      Required:
+
+      - bit_errs      The number of bit errors observed.
+
+      - bits_checked  The number of bits checked.
+
+      Optional:
+
+      - confidence    The confidence level of the interval.
+
+    Outputs:
+
+      - lower         The lower bound of the interval.
+
+      - upper         The upper bound of the interval.
+
+    """
+
+    from scipy.stats import beta
+
+    assert bits_checked > 0, "ber_interval(): No bits checked!"
+
+    alpha = 1. - confidence
+    if(bit_errs == 0):
+        lower = 0.
+    else:
+        lower = beta.ppf(alpha / 2., bit_errs, bits_checked - bit_errs + 1)
+    if(bit_errs == bits_checked):
+        upper = 1.
+    else:
+        upper = beta.ppf(1. - alpha / 2., bit_errs + 1, bits_checked - bit_errs)
+    return (float(lower), float(upper))
+
+class BerResults(object):
+    """
+    The results of a Monte Carlo BER run.
+
+    Attributes:
+
+      - bit_errs      The total number of bit errors, over all replicas.
+
+      - bits_checked  The total number of bits checked, over all replicas.
+                      (The last 'eye_bits' bits of each replica are checked; the rest are warm up.)
+
+      - ber           The BER estimate.
+
+      - ber_lower     The lower bound of the confidence interval.
+
+      - ber_upper     The upper bound of the confidence interval.
+
+      - confidence    The confidence level of the interval.
+
+      - n_replicas    The number of replicas run.
+
+      - replica_errs  The number of bit errors in each replica, in index order.
+
+      - stop_reason   Why the run stopped: 'tolerance', 'target', or 'budget'. (See the module documentation.)
+
+      - seed          The run seed. (See rng.py.)
+
+      - profile       The timing and memory usage of the run. (See instrument.py.)
+    """
+
+    pass
+
+# The noiseless front end output, handed to each worker, at pool creation time.
+_params = None
+_front  = {}
+
+def _init_worker(params, front):
+    """Pool initializer; stashes the parameters and the noiseless front end output, for use by the jobs."""
+
+    global _params, _front
+    _params = params
+    _front  = front
+
+def _get_front(key):
+    """Fetch one of the items handed to '_init_worker()', converting shared arrays to NumPy arrays."""
+
+    val = _front[key]
+    if(isinstance(val, tuple)):
+        return shared_to_array(val)
+    return val
+
+def _replica_job(index):
+    """
+    Run one replica, returning its index, bit error count, number of bits checked, and the
+    records of its own profile (See instrument.py.), since a worker can't reach the profile of the caller.
+    """
+
+    p       = _params
+    profile = Profile()
+    with profile.section('replica'):
+        ctle_out = _get_front('ctle_out')
+        ctle_h   = _get_front('ctle_h')
+        noise    = rng_stream(_get_front('seed'), 'noise', index).normal(scale=p.rn, size=(len(ctle_out),))
+        with section('convolve'):
+            ctle_out = ctle_out + convolve(noise, ctle_h)[:len(ctle_out)]
+        dfe      = make_dfe(p, _get_front('ui'), _get_front('nspui'))
+        bits_out = dfe.run(_get_front('t'), ctle_out)[-1]
+        (bit_errs, bits_checked, bit_dly, auto_corr) = count_bit_errs(_get_front('bits'), bits_out, p.nbits - p.eye_bits)
+
+    return (index, bit_errs, bits_checked, profile.records)
+
+def run_ber(params, max_bits=gMaxBits, rel_tol=gRelTol, confidence=gConfidence, ber_target=None, n_procs=None, progress=None):
+    """
+    Estimate the BER, by Monte Carlo simulation.
+
+    Inputs:
+
+      Required:
+
+      - params      The simulation parameters, as a 'Params' instance.
+                    (Each replica runs 'nbits' bits, and checks the last 'eye_bits' of them.)
+
+      Optional:
+
+      - max_bits    The bit budget: the run stops once this many bits have been checked.
+
+      - rel_tol     The run stops once the confidence interval is narrower than this, relative to the BER estimate.
+
+      - confidence  The confidence level of the interval.
+
+      - ber_target  If given, the run stops once the interval lies wholly above, or below, this BER.
+
+      - n_procs     The number of worker processes to use. Default = # of CPUs.
+                    A value of 1 runs the replicas serially, in this process.
+
+      - progress    A function, taking a status string and the fraction of the bit budget used,
+                    called after each replica. It may raise an exception, to abort the run.
+
+    Outputs:
+
+      - results     The Monte Carlo results, as a 'BerResults' instance.
+
+    """
+
+    assert params.rn > 0., "run_ber(): There's no random noise ('rn') to run a Monte Carlo estimation over!"
+    assert 0 < params.eye_bits < params.nbits, "run_ber(): 'eye_bits' must leave some bits for warm up!"
+
+    if(n_procs is None):
+        n_procs = mp.cpu_count()
+    if(mp.current_process().daemon):             # Pool workers (e.g. - of a sweep) can't have children of their own.
+        n_procs = 1
+
+    r         = BerResults()
+    r.profile = Profile(aggregate=True)          # (One record per path, however many replicas are run.)
+    with r.profile.section('ber'):
+        # Run the noiseless front end, once.
+        with section('front_end'):
+            kwargs       = dict([(name, getattr(params, name)) for name in Params.names()])
+            kwargs['rn'] = 0.
+            front_end    = Pipeline([stage for stage in make_pipeline().stages if stage.name in ('signal', 'channel', 'tx', 'ctle')])
+            front_end.run(Params(**kwargs), Results())
+            ctx          = front_end.outputs
+            front        = {
+                'ctle_h': ctx['ctle_h'],
+                'bits':   array(ctx['bits']),
+                'seed':   ctx['seed'],
+                'ui':     ctx['ui'],
+                'nspui':  ctx['nspui'],
+            }
+            if(n_procs <= 1):
+                front['t']        = array(ctx['t'])
+                front['ctle_out'] = ctx['ctle_out']
+            else:
+                front['t']        = share_array(ctx['t'])
+                front['ctle_out'] = share_array(ctx['ctle_out'])
+            del ctx, front_end
+
+        r.seed         = front['seed']
+        r.confidence   = confidence
+        r.replica_errs = []
+        r.bit_errs     = 0
+        r.bits_checked = 0
+        r.stop_reason  = None
+        max_replicas   = int(max_bits // params.eye_bits) + 1 # (an upper bound; the bit_dly varies a bit)
+        if(n_procs <= 1):
+            _init_worker(params, front)
+            pool    = None
+            replicas = (_replica_job(index) for index in xrange(max_replicas))
+        else:
+            pool     = mp.Pool(n_procs, _init_worker, (params, front))
+            replicas = pool.imap(_replica_job, xrange(max_replicas), chunksize=1) # (in index order)
+
+        try:
+            with section('replicas'):
+                profile = active_profile()
+                for (index, bit_errs, bits_checked, records) in replicas:
+                    profile.merge(records)
+                    r.replica_errs.append(bit_errs)
+                    r.bit_errs     += bit_errs
+                    r.bits_checked += bits_checked
+                    (lower, upper)  = ber_interval(r.bit_errs, r.bits_checked, confidence)
+                    ber             = float(r.bit_errs) / r.bits_checked
+                    if(r.bit_errs and (upper - lower) <= rel_tol * ber):
+                        r.stop_reason = 'tolerance'
+                    elif(ber_target is not None and (upper < ber_target or lower > ber_target)):
+                        r.stop_reason = 'target'
+                    elif(r.bits_checked >= max_bits):
+                        r.stop_reason = 'budget'
+                    if(progress):
+                        progress('Monte Carlo BER: %d errors in %d bits...' % (r.bit_errs, r.bits_checked),
+                                 min(1., float(r.bits_checked) / max_bits))
+                    if(r.stop_reason):
+                        break
+        finally:
+            if(pool is not None):
+                pool.terminate()
+                pool.join()
+
+        if(r.stop_reason is None):                 # (Ran out of replicas, just short of the budget.)
+            r.stop_reason = 'budget'
+        r.n_replicas = len(r.replica_errs)
+        r.ber        = ber
+        r.ber_lower  = lower
+        r.ber_upper  = upper
+
+    return r
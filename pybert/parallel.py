@@ -0,0 +1,171 @@
+# Parallel execution helpers for PyBERT.
+#
+# Original author: agent <agent@local>
+# Original date:   October 19, 2026
+#
+# Copyright (c) 2026 agent; all rights reserved World wide.
+
+"""
+Parallel execution helpers for PyBERT.
+
+This Python script provides the machinery used to farm independent
+pieces of PyBERT analysis out to a pool of worker processes.
+
+Large input vectors (i.e. - waveforms) are placed in shared memory,
+before the pool is created, and are inherited by the workers, instead
+of being pickled and piped to them, along with each job.
+"""
+
+import multiprocessing as mp
+from multiprocessing.pool import ThreadPool
+
+from numpy       import array, frombuffer, prod, float32, float64
+from pybert_util import find_crossings, calc_jitter
+from instrument  import Profile, active_profile
+
+gTypeCodes = {float64: 'd', float32: 'f'} # shared memory type codes of the supported element types
+
+# Shared arrays handed to each worker, at pool creation time.
+_shared = {}
+
+def share_array(x):
+    """
+    Copy a vector of floats into shared memory.
+
+    Inputs:
+
+      - x      : The vector (or array) to be shared.
+                 (Single precision vectors stay single precision; all others are shared as double.)
+
+    Outputs:
+
+      - shared : A (raw array, shape, type code) tuple, suitable for inheritance by
+                 worker processes. (See 'shared_to_array()'.)
+
+    """
+
+    x = array(x)
+    if(x.dtype != float32):
+        x = x.astype(float)
+    typecode = gTypeCodes[x.dtype.type]
+    raw      = mp.RawArray(typecode, int(x.size))
+    frombuffer(raw, dtype=x.dtype)[:] = x.ravel()
+    return (raw, x.shape, typecode)
+
+def shared_to_array(shared):
+    """Return a NumPy view of the memory allocated by 'share_array()'. (No copy is made.)"""
+
+    raw, shape, typecode = shared
+    dtype = [dtype for (dtype, code) in gTypeCodes.items() if code == typecode][0]
+    return frombuffer(raw, dtype=dtype)[:int(prod(shape))].reshape(shape)
+
+def _init_worker(shared):
+    """Pool initializer; stashes the inherited shared arrays for use by the jobs."""
+
+    global _shared
+    _shared = shared
+
+def _get_shared(key):
+    """Fetch one of the arrays handed to '_init_worker()', as a NumPy array."""
+
+    val = _shared[key]
+    if(isinstance(val, tuple)):
+        return shared_to_array(val)
+    return val
+
+def _jitter_job(job):
+    """
+    Find the crossings in, and analyze the jitter of, one probe point.
+
+    The job is a tuple containing:
+
+      - name          : The probe point name. (Returned, untouched.)
+
+      - wave_key      : The key, into the shared arrays, of the waveform to analyze.
+
+      - xings_key     : The key, into the shared arrays, of the ideal crossing times.
+
+      - amplitude     : Passed to 'find_crossings()'.
+
+      - xing_kwargs   : A dictionary of optional arguments to 'find_crossings()'.
+
+      - jitter_args   : A tuple of the (ui, nbits, pattern_len) arguments to 'calc_jitter()'.
+
+      - jitter_kwargs : A dictionary of optional arguments to 'calc_jitter()'.
+
+    Returns the probe point name, the tuple returned by 'calc_jitter()', and the
+    records of the job's own profile (See instrument.py.), since a worker can't
+    reach the profile of the caller.
+
+    """
+
+    (name, wave_key, xings_key, amplitude, xing_kwargs, jitter_args, jitter_kwargs) = job
+
+    profile = Profile()
+    with profile.section(name):
+        t            = _get_shared('t')
+        x            = _get_shared(wave_key)
+        ideal_xings  = _get_shared(xings_key)
+        actual_xings = find_crossings(t, x, amplitude, **xing_kwargs)
+        (ui, nbits, pattern_len) = jitter_args
+        result       = calc_jitter(ui, nbits, pattern_len, ideal_xings, actual_xings, **jitter_kwargs)
+
+    return (name, result, profile.records)
+
+def run_jitter_jobs(arrays, jobs, n_procs=None, use_threads=False):
+    """
+    Run several independent jitter analyses concurrently.
+
+    Inputs:
+
+      - arrays       : A dictionary of the vectors needed by the jobs.
+                       Must contain the sample times, under key 't'.
+                       Everything in here is placed in shared memory.
+
+      - jobs         : A list of job tuples. (See '_jitter_job()'.)
+
+      - n_procs      : (optional) The number of workers to use.
+                       Default = min(len(jobs), # of CPUs).
+                       A value of 1 runs the jobs serially, in this process.
+
+      - use_threads  : (optional) Use a pool of threads, instead of processes.
+                       Only helpful, when the analysis is dominated by
+                       NumPy calls that release the GIL.
+
+    Outputs:
+
+      - results      : A dictionary, keyed by probe point name, of the tuples returned by 'calc_jitter()'.
+
+    """
+
+    if(n_procs is None):
+        n_procs = min(len(jobs), mp.cpu_count())
+    if(mp.current_process().daemon):             # Pool workers (e.g. - of a sweep) can't have children of their own.
+        n_procs = 1
+
+    # Threads (and the serial case) see our memory directly; only processes need the shared copies.
+    if(n_procs <= 1 or use_threads):
+        _init_worker(dict([(key, array(val, dtype=float)) for (key, val) in arrays.items()]))
+        if(n_procs <= 1):
+            pool = None
+        else:
+            pool = ThreadPool(n_procs)
+    else:
+        shared = dict([(key, share_array(val)) for (key, val) in arrays.items()])
+        pool   = mp.Pool(n_procs, _init_worker, (shared,))
+    if(pool is None):
+        results = map(_jitter_job, jobs)
+    else:
+        try:
+            results = pool.map(_jitter_job, jobs, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+
+    # Fold the jobs' timings into the caller's profile.
+    profile = active_profile()
+    if(profile is not None):
+        for (name, result, records) in results:
+            profile.merge(records)
+
+    return dict([(name, result) for (name, result, records) in results])
@@ -0,0 +1,172 @@
+# Incremental simulation pipeline for PyBERT.
+#
+# Original author: agent <agent@local>
+# Original date:   October 19, 2026
+#
+# Copyright (c) 2026 agent; all rights reserved World wide.
+
+"""
+Incremental simulation pipeline for PyBERT.
+
+This Python script provides the machinery used to break the PyBERT
+simulation into a graph of stages, each of which declares the parameters
+(i.e. - traits) it depends upon, as well as the upstream stages whose
+outputs it consumes.
+
+A stage is rerun only when one of its own parameters has changed value,
+since its last run, or when one of its upstream stages has been rerun.
+So, changing an analysis parameter, for instance, doesn't force the
+channel, Tx, CTLE, and DFE to be simulated again.
+"""
+
+from instrument import section
+
+class Stage(object):
+    """
+    One step of the simulation.
+
+    The stage function is called as 'func(params, results, outputs, report)', where 'params'
+    is the object carrying the simulation parameters, 'results' is the object into which
+    the stage should place those of its results intended for the user, 'outputs' is a
+    dictionary of the outputs of all stages, so far, and 'report' is a function, taking the
+    fraction of the stage completed, which long running stages may call, as they go.
+    It must return a dictionary of its own outputs, which are merged into 'outputs' for use
+    by later stages.
+    """
+
+    def __init__(self, name, func, inputs=(), upstream=(), status=None):
+        """
+        Inputs:
+
+          Required:
+
+          - name      The stage name.
+
+          - func      The stage function. (See above.)
+
+          Optional:
+
+          - inputs    The names of the parameters that the stage reads.
+
+          - upstream  The names of the stages whose outputs this stage consumes.
+
+          - status    A message announcing that the stage is running.
+        """
+
+        self.name     = name
+        self.func     = func
+        self.inputs   = tuple(inputs)
+        self.upstream = tuple(upstream)
+        self.status   = status
+
+    def snapshot(self, params):
+        """Return the current values of this stage's inputs. (Copying lists, so that in-place edits are noticed.)"""
+
+        vals = []
+        for name in self.inputs:
+            val = getattr(params, name)
+            if(isinstance(val, list)):
+                val = list(val)
+            vals.append(val)
+        return tuple(vals)
+
+class Pipeline(object):
+    """
+    A set of stages, run in dependency order, w/ their outputs cached between runs.
+    """
+
+    def __init__(self, stages):
+        """
+        Inputs:
+
+          - stages    A list of 'Stage's, in dependency order.
+                      (i.e. - Every stage must follow all of its upstream stages.)
+        """
+
+        names = []
+        for stage in stages:
+            for up in stage.upstream:
+                assert up in names, "Pipeline: Stage '%s' must follow its upstream stage, '%s'!" % (stage.name, up)
+            assert stage.name not in names, "Pipeline: Duplicate stage name, '%s'!" % stage.name
+            names.append(stage.name)
+
+        self.stages    = stages
+        self.outputs   = {}
+        self.snapshots = {}
+
+    def downstream(self, name):
+        """Return the names of all the stages depending, directly or indirectly, upon the named stage (including itself)."""
+
+        names = set([name])
+        for stage in self.stages:
+            if(names.intersection(stage.upstream)):
+                names.add(stage.name)
+        return [stage.name for stage in self.stages if stage.name in names]
+
+    def invalidate(self, name=None):
+        """Force the named stage (and everything downstream of it), or all stages, to rerun next time."""
+
+        if(name is None):
+            self.snapshots = {}
+        else:
+            for down in self.downstream(name):
+                self.snapshots.pop(down, None)
+
+    def stale(self, params):
+        """Return the names of the stages that would be rerun, were 'run(params, ...)' called now."""
+
+        rerun = []
+        for stage in self.stages:
+            if(stage.name not in self.snapshots or self.snapshots[stage.name] != stage.snapshot(params)
+               or [up for up in stage.upstream if up in rerun]):
+                rerun.append(stage.name)
+        return rerun
+
+    def run(self, params, results, force=False, progress=None):
+        """
+        Run all stages whose inputs have changed, along with everything downstream of them.
+
+        Each stage run is recorded, as a section, in the active profile, if any. (See instrument.py.)
+
+        Inputs:
+
+          Required:
+
+          - params    The object carrying the simulation parameters.
+
+          - results   The object receiving the simulation results.
+
+          Optional:
+
+          - force     Rerun every stage, regardless.
+
+          - progress  A function, taking a status string and the fraction of the current
+                      stage completed, called as each stage begins, and whenever the stage
+                      reports its progress. It may raise an exception, to abort the run.
+
+        Outputs:
+
+          - rerun     The names of the stages actually run.
+        """
+
+        if(force):
+            self.invalidate()
+
+        rerun = []
+        for stage in self.stages:
+            snapshot = stage.snapshot(params)
+            if(stage.name in self.snapshots and self.snapshots[stage.name] == snapshot
+               and not [up for up in stage.upstream if up in rerun]):
+                continue
+            self.invalidate(stage.name)          # (Should the run stop here, nothing downstream may look current, next time.)
+            if(progress):
+                report = lambda fraction, status=stage.status or stage.name: progress(status, fraction)
+                report(0.)
+            else:
+                report = lambda fraction: None
+            with section(stage.name):
+                self.outputs.update(stage.func(params, results, self.outputs, report))
+            self.snapshots[stage.name] = snapshot
+            rerun.append(stage.name)
+
+        return rerun
@@ -0,0 +1,142 @@
+# Reduced precision checking for PyBERT.
+#
+# Original author: agent <agent@local>
+# Original date:   October 19, 2026
+#
+# Copyright (c) 2026 agent; all rights reserved World wide.
+
+"""
+Reduced precision checking for PyBERT.
+
+This Python script checks how far the results of a reduced precision
+(e.g. - single precision) run deviate from those of a double precision
+run of the same parameters and seed. (See 'PRECISIONS', in simulation.py.)
+
+Single precision halves the memory taken by the waveforms and spectra,
+which dominate that of a run; so, roughly twice as many bits may be run,
+in the same memory. Its relative rounding error (about 1e-7) is far below
+the random noise of any realistic link; but, it should be checked, for a
+new kind of channel, or an extreme setting, before relying upon it.
+
+The following are compared:
+
+  - the bit errors,
+  - the jitter components (ISI, DCD, Pj, Rj, and Tj), at each probe point, and
+  - the channel, Tx, and CTLE output waveforms (RMS difference, relative to the RMS of the waveform).
+
+(The DFE output isn't compared, sample by sample, since a single decision
+flipped by rounding changes all that follows; its effect shows up in the
+bit errors and DFE jitter, instead.)
+
+Typical usage:
+
+    from pybert.simulation import Params
+    from pybert.precision  import check_precision
+
+    check = check_precision(Params(l_ch=2., nbits=40000, eye_bits=8000))
+    print check.passed, check.failures, check.bytes
+"""
+
+from numpy        import asarray, ndarray, sqrt, mean
+from simulation   import Params, simulate
+
+gTimeTol   = 0.01  # allowed deviation of the jitter components, as a fraction of the unit interval
+gWaveTol   = 1.e-4 # allowed RMS deviation of the waveforms, relative to their RMS value
+gBitErrTol = 0.1   # allowed deviation of the bit error count, relative to that of the double precision run (min. 1 error)
+
+gJitterComps = ['isi', 'dcd', 'pj', 'rj', 'tj']
+gProbes      = ['chnl', 'tx', 'ctle', 'dfe']
+gWaveforms   = ['chnl_out', 'tx_out', 'ctle_out']
+
+class PrecisionCheck(object):
+    """
+    The results of a precision check.
+
+    Attributes:
+
+      - precision     The precision checked. (The reference is always 'double'.)
+
+      - metrics       A dictionary, keyed by metric name, of (reference, checked) value pairs.
+                      (The waveform entries hold the RMS value of the reference, and of the difference.)
+
+      - deviations    A dictionary, keyed by metric name, of the deviations, in the units of the tolerances.
+                      (i.e. - A deviation greater than one exceeds the tolerance.)
+
+      - failures      The names of the metrics whose deviations exceed their tolerances.
+
+      - passed        True, if there are no failures.
+
+      - bytes         The (reference, checked) number of bytes taken by the array results of the two runs.
+
+      - seed          The random number seed shared by the two runs. (See rng.py.)
+
+      - results       The (reference, checked) 'Results' of the two runs.
+    """
+
+    pass
+
+def results_bytes(results):
+    """Return the number of bytes taken by the array attributes of a 'Results' instance."""
+
+    return sum([val.nbytes for val in vars(results).values() if isinstance(val, ndarray)])
+
+def check_precision(params, precision='single'):
+    """
+    Compare the results of a reduced precision run, to those of a double precision run.
+
+    Inputs:
+
+      Required:
+
+      - params      The simulation parameters, as a 'Params' instance. (Its 'precision' is ignored.)
+                    If it has no seed, a fresh one is drawn, and used for both runs.
+
+      Optional:
+
+      - precision   The precision to check. (See 'PRECISIONS', in simulation.py.)
+
+    Outputs:
+
+      - check       The comparison, as a 'PrecisionCheck' instance.
+
+    """
+
+    kwargs              = dict([(name, getattr(params, name)) for name in Params.names()])
+    kwargs['precision'] = 'double'
+    reference           = simulate(Params(**kwargs))
+    kwargs['precision'] = precision
+    kwargs['seed']      = reference.seed
+    checked             = simulate(Params(**kwargs))
+
+    ui = params.ui * 1.e-12
+    if(params.mod_type == 2):                    # PAM-4 uses 2 UI per transmitted symbol.
+        ui *= 2.
+
+    check            = PrecisionCheck()
+    check.precision  = precision
+    check.seed       = reference.seed
+    check.results    = (reference, checked)
+    check.bytes      = (results_bytes(reference), results_bytes(checked))
+    check.metrics    = {}
+    check.deviations = {}
+
+    check.metrics['bit_errs']    = (reference.bit_errs, checked.bit_errs)
+    check.deviations['bit_errs'] = abs(checked.bit_errs - reference.bit_errs) / max(1., gBitErrTol * reference.bit_errs)
+    for probe in gProbes:
+        for comp in gJitterComps:
+            name = comp + '_' + probe
+            (ref_val, val)          = (getattr(reference, name), getattr(checked, name))
+            check.metrics[name]     = (ref_val, val)
+            check.deviations[name]  = abs(val - ref_val) / (gTimeTol * ui)
+    for name in gWaveforms:
+        ref_wave = asarray(getattr(reference, name), dtype=float)
+        wave     = asarray(getattr(checked, name),   dtype=float)
+        ref_rms  = sqrt(mean(ref_wave ** 2))
+        err_rms  = sqrt(mean((wave - ref_wave) ** 2))
+        check.metrics[name]    = (ref_rms, err_rms)
+        check.deviations[name] = err_rms / (gWaveTol * ref_rms)
+
+    check.failures = sorted([name for (name, dev) in check.deviations.items() if dev > 1.])
+    check.passed   = not check.failures
+
+    return check
@@ -33,10 +33,38 @@ The application source is divided among several files, as follows:
 
     cdr.py          - Contains the clock data recovery unit model.
 
+    parallel.py     - Contains the machinery for running independent analyses concurrently.
+
+    stat_eye.py     - Contains the statistical eye diagram (and BER contour) calculation.
+
+    pipeline.py     - Contains the machinery for incrementally rerunning the simulation stages.
+
+    simulation.py   - Contains the simulation proper, free of any GUI machinery.
+
+    sweep.py        - Contains the runner for sweeping the simulation over a grid of parameter values.
+
+    worker.py       - Contains the machinery for running the simulation on a background thread.
+
+    store.py        - Contains the on-disk store of simulation results.
+
+    instrument.py   - Contains the profiler recording the time and memory taken by each part of a run.
+
+    stream.py       - Contains the chunked, streaming, simulation, for very long runs.
+
+    rng.py          - Contains the seeded random number streams used by the simulation.
+
+    montecarlo.py   - Contains the Monte Carlo BER estimator.
+
+    decimate.py     - Contains the level of detail decimation used to plot long waveforms.
+
+    precision.py    - Contains the check of single, against double, precision results.
+
+    bit_errs.py     - Contains the bit error counter, which also locates the errors and their bursts.
+
 Copyright (c) 2014 by David Banas; All rights reserved World wide.
 """
 
-from traits.api      import HasTraits, Array, Range, Float, Int, Property, String, cached_property, Instance, HTML, List, Bool
+from traits.api      import HasTraits, Array, Range, Float, Int, Property, String, cached_property, Instance, HTML, List, Bool, Any, Dict
 from chaco.api       import Plot, ArrayPlotData, VPlotContainer, GridPlotContainer, ColorMapper, Legend, OverlayPlotContainer, PlotAxis
 from chaco.tools.api import PanTool, ZoomTool, LegendTool, TraitsTool, DragZoom
 from numpy           import array, linspace, zeros, histogram, mean, diff, log10, transpose, shape
@@ -56,6 +84,8 @@ gUI             = 100     # (ps)
 gNbits          = 8000    # number of bits to run
 gPatLen         = 127     # repeating bit pattern length
 gNspb           = 32      # samples per bit
+gSeed           = 0       # random number seed (0 = a fresh seed, each run)
+gPrecision      = 'double' # floating point precision of the waveforms and spectra (See 'PRECISIONS' in simulation.py.)
 # - Channel Control
 #     - parameters for Howard Johnson's "Metallic Transmission Model"
 #     - (See "High Speed Signal Propagation", Sec. 3.1.)
@@ -98,6 +128,24 @@ gRelLockTol     = .1      # relative lock tolerance of CDR.
 gLockSustain    = 500
 # - Analysis
 gThresh         = 6       # threshold for identifying periodic jitter spectral elements (sigma)
+gSegLen         = 0       # jitter spectrum segment length (0 = single FFT of entire TIE record)
+gStatRj         = 0.      # random jitter folded into statistical eye (ps)
+gEyeRows        = 100     # eye diagram image height (pixels)
+gEyeCols        = 0       # eye diagram image width (pixels) (0 = one column per sample)
+gResultsDir     = ''      # directory into which each run's results are saved ('' = don't save) (See 'store.py'.)
+
+class TabPlotContainer(GridPlotContainer):
+    """
+    The plot container of a tab, which brings the tab's plot data up to date just before it's drawn.
+    (Hidden tabs aren't drawn; so, a tab's plot data are only derived when it's shown. See 'update_tab()'.)
+    """
+
+    refresh = Any()                                                         # called, w/o arguments, before each draw
+
+    def draw(self, gc, view_bounds=None, mode="default"):
+        if(self.refresh is not None):
+            self.refresh()
+        super(TabPlotContainer, self).draw(gc, view_bounds=view_bounds, mode=mode)
 
 class PyBERT(HasTraits):
     """
@@ -114,6 +162,8 @@ class PyBERT(HasTraits):
     nspb            = Int(gNspb)
     eye_bits        = Int(gNbits // 5)
     mod_type        = List([0])
+    seed            = Int(gSeed)
+    precision       = List([gPrecision])
     # - Channel Control
     Rdc             = Float(gRdc)
     w0              = Float(gw0)
@@ -154,6 +204,11 @@ class PyBERT(HasTraits):
     lock_sustain    = Int(gLockSustain)
     # - Analysis
     thresh          = Int(gThresh)
+    seg_len         = Int(gSegLen)
+    stat_rj         = Float(gStatRj)                                        # (ps)
+    eye_rows        = Int(gEyeRows)
+    eye_cols        = Int(gEyeCols)
+    results_dir     = String(gResultsDir)
     # - Plots (plot containers, actually)
     plotdata          = ArrayPlotData()
     plots_h           = Instance(GridPlotContainer)
@@ -161,12 +216,20 @@ class PyBERT(HasTraits):
     plots_H           = Instance(GridPlotContainer)
     plots_dfe         = Instance(GridPlotContainer)
     plots_eye         = Instance(GridPlotContainer)
+    plots_stat_eye    = Instance(GridPlotContainer)
     plots_jitter_dist = Instance(GridPlotContainer)
     plots_jitter_spec = Instance(GridPlotContainer)
     plots_bathtub     = Instance(GridPlotContainer)
+    plots_out         = Instance(GridPlotContainer)
+    stale_tabs        = List([])                                            # the tabs whose plot data predate the last run (See 'update_tab()'.)
+    lod               = Any()                                               # decimation pyramid of the waveforms (See decimate.py.)
+    lod_plots         = Dict()                                              # the plot governing each level of detail view (See 'update_lod()'.)
+    lod_windows       = Dict()                                              # the data window last supplied to each view
     # - Status
     status          = String("Ready.")
-    jitter_perf     = Float(0.)
+    results         = Any()                                                 # (See 'simulate()' in simulation.py.)
+    stages_run      = List([])                                              # names of the stages actually run, last time
+    profile         = Any()                                                 # timing and memory usage of the last run (See instrument.py.)
     total_perf      = Float(0.)
     # - About
     ident  = String('PyBERT v1.2 - a serial communication link design tool, written in Python\n\n \
@@ -179,8 +242,9 @@ class PyBERT(HasTraits):
 
     # Dependent variables
     # - Handled by the Traits/UI machinery. (Should only contain "low overhead" variables, which don't freeze the GUI noticeably.)
-    jitter_info     = Property(HTML,    depends_on=['jitter_perf'])
+    jitter_info     = Property(HTML,    depends_on=['total_perf'])
     perf_info       = Property(HTML,    depends_on=['total_perf'])
+    eye_info        = Property(HTML,    depends_on=['total_perf'])
     status_str      = Property(String,  depends_on=['status'])
     # - Handled by pybert_cntrl.py, upon user button clicks. (May contain "large overhead" variables.)
     #   - These are dependencies. So, they must be Array()s.
@@ -204,9 +268,9 @@ class PyBERT(HasTraits):
         # Now, create all the various plots we need for our GUI.
         # - DFE tab
         plot1 = Plot(plotdata)
-        plot1.plot(("t_ns", "dfe_out"), type="line", color="blue")
-        plot1.plot(("t_ns", "clocks"), type="line", color="green")
-        plot1.plot(("t_ns", "lockeds"), type="line", color="red")
+        plot1.plot(("t_ns_dfe", "dfe_out_dfe"), type="line", color="blue")
+        plot1.plot(("t_ns_dfe", "clocks"), type="line", color="green")
+        plot1.plot(("t_ns_dfe", "lockeds"), type="line", color="red")
         plot1.title  = "DFE Output, Recovered Clocks, & Locked"
         plot1.index_axis.title = "Time (ns)"
         plot1.tools.append(PanTool(plot1, constrain=True, constrain_key=None, constrain_direction='x'))
@@ -214,7 +278,7 @@ class PyBERT(HasTraits):
         plot1.overlays.append(zoom1)
 
         plot2        = Plot(plotdata)
-        plot2.plot(("t_ns", "ui_ests"), type="line", color="blue")
+        plot2.plot(("t_ns_dfe", "ui_ests"), type="line", color="blue")
         plot2.title  = "CDR Adaptation"
         plot2.index_axis.title = "Time (ns)"
         plot2.value_axis.title = "UI (ps)"
@@ -248,7 +312,7 @@ class PyBERT(HasTraits):
         plot9.legend.visible = True
         plot9.legend.align = 'ul'
 
-        container_dfe = GridPlotContainer(shape=(2,2))
+        container_dfe = TabPlotContainer(shape=(2,2), refresh=lambda: update_tab(self, 'dfe'))
         container_dfe.add(plot2)
         container_dfe.add(plot9)
         container_dfe.add(plot1)
@@ -280,7 +344,7 @@ class PyBERT(HasTraits):
         plot_h_dfe.index_axis.title = "Time (ns)"
         plot_h_dfe.y_axis.title     = "Impulse Response (V/ns)"
 
-        container_h = GridPlotContainer(shape=(2,2))
+        container_h = TabPlotContainer(shape=(2,2), refresh=lambda: update_tab(self, 'h'))
         container_h.add(plot_h_chnl)
         container_h.add(plot_h_tx)
         container_h.add(plot_h_ctle)
@@ -321,7 +385,7 @@ class PyBERT(HasTraits):
         plot_s_dfe.legend.visible   = True
         plot_s_dfe.legend.align     = 'lr'
 
-        container_s = GridPlotContainer(shape=(2,2))
+        container_s = TabPlotContainer(shape=(2,2), refresh=lambda: update_tab(self, 's'))
         container_s.add(plot_s_chnl)
         container_s.add(plot_s_tx)
         container_s.add(plot_s_ctle)
@@ -374,7 +438,7 @@ class PyBERT(HasTraits):
         plot_H_dfe.legend.visible   = True
         plot_H_dfe.legend.align     = 'll'
 
-        container_H = GridPlotContainer(shape=(2,2))
+        container_H = TabPlotContainer(shape=(2,2), refresh=lambda: update_tab(self, 'H'))
         container_H.add(plot_H_chnl)
         container_H.add(plot_H_tx)
         container_H.add(plot_H_ctle)
@@ -383,8 +447,8 @@ class PyBERT(HasTraits):
 
         # - Outputs tab
         plot_out_chnl = Plot(plotdata)
-        plot_out_chnl.plot(("t_ns", "ideal_signal"), type="line", color="lightgrey")
-        plot_out_chnl.plot(("t_ns", "chnl_out"),     type="line", color="blue")
+        plot_out_chnl.plot(("t_ns_out", "ideal_signal"), type="line", color="lightgrey")
+        plot_out_chnl.plot(("t_ns_out", "chnl_out"),     type="line", color="blue")
         plot_out_chnl.title            = "Channel"
         plot_out_chnl.index_axis.title = "Time (ns)"
         plot_out_chnl.y_axis.title     = "Output (V)"
@@ -392,33 +456,39 @@ class PyBERT(HasTraits):
         plot_out_chnl.overlays.append(zoom_out_chnl)
 
         plot_out_tx = Plot(plotdata)
-        plot_out_tx.plot(("t_ns", "tx_out"), type="line", color="blue")
+        plot_out_tx.plot(("t_ns_out", "tx_out"), type="line", color="blue")
         plot_out_tx.title            = "Channel + Tx Preemphasis (Noise added here.)"
         plot_out_tx.index_axis.title = "Time (ns)"
         plot_out_tx.y_axis.title     = "Output (V)"
         plot_out_tx.index_range = plot_out_chnl.index_range # Zoom x-axes in tandem.
 
         plot_out_ctle = Plot(plotdata)
-        plot_out_ctle.plot(("t_ns", "ctle_out"), type="line", color="blue")
+        plot_out_ctle.plot(("t_ns_out", "ctle_out"), type="line", color="blue")
         plot_out_ctle.title            = "Channel + Tx Preemphasis + CTLE"
         plot_out_ctle.index_axis.title = "Time (ns)"
         plot_out_ctle.y_axis.title     = "Output (V)"
         plot_out_ctle.index_range = plot_out_chnl.index_range # Zoom x-axes in tandem.
 
         plot_out_dfe = Plot(plotdata)
-        plot_out_dfe.plot(("t_ns", "dfe_out"), type="line", color="blue")
+        plot_out_dfe.plot(("t_ns_out", "dfe_out"), type="line", color="blue")
         plot_out_dfe.title            = "Channel + Tx Preemphasis + CTLE + DFE"
         plot_out_dfe.index_axis.title = "Time (ns)"
         plot_out_dfe.y_axis.title     = "Output (V)"
         plot_out_dfe.index_range = plot_out_chnl.index_range # Zoom x-axes in tandem.
 
-        container_out = GridPlotContainer(shape=(2,2))
+        container_out = TabPlotContainer(shape=(2,2), refresh=lambda: update_tab(self, 'out'))
         container_out.add(plot_out_chnl)
         container_out.add(plot_out_tx)
         container_out.add(plot_out_ctle)
         container_out.add(plot_out_dfe)
         self.plots_out  = container_out
 
+        # - Feed the waveform plots w/ the level of detail matching their zoom. (See 'update_lod()' in pybert_cntrl.py.)
+        self.lod_plots = {'dfe': plot1, 'out': plot_out_chnl}
+        for (view, plot) in self.lod_plots.items():
+            plot.index_range.on_trait_change(lambda view=view: update_lod(self, view), 'updated')
+            plot.on_trait_change(lambda view=view: update_lod(self, view), 'bounds')
+
         # - Eye Diagrams tab
         seg_map = dict(
             red = [
@@ -510,13 +580,46 @@ class PyBERT(HasTraits):
         plot_eye_dfe.x_grid.line_color = 'gray'
         plot_eye_dfe.y_grid.line_color = 'gray'
 
-        container_eye = GridPlotContainer(shape=(2,2))
+        container_eye = TabPlotContainer(shape=(2,2), refresh=lambda: update_tab(self, 'eye'))
         container_eye.add(plot_eye_chnl)
         container_eye.add(plot_eye_tx)
         container_eye.add(plot_eye_ctle)
         container_eye.add(plot_eye_dfe)
         self.plots_eye  = container_eye
 
+        # - Statistical Eye tab
+        plot_stat_eye = Plot(plotdata)
+        plot_stat_eye.img_plot("stat_eye", colormap=clr_map,)
+        plot_stat_eye.y_direction = 'normal'
+        plot_stat_eye.components[0].y_direction = 'normal'
+        plot_stat_eye.title  = "Statistical Eye (Channel + Tx Preemphasis + CTLE + Ideal DFE)"
+        plot_stat_eye.x_axis.title = "Time (ps)"
+        plot_stat_eye.x_axis.orientation = "bottom"
+        plot_stat_eye.y_axis.title = "Signal Level (V)"
+        plot_stat_eye.x_grid.visible = True
+        plot_stat_eye.y_grid.visible = True
+        plot_stat_eye.x_grid.line_color = 'gray'
+        plot_stat_eye.y_grid.line_color = 'gray'
+
+        plot_stat_ber = Plot(plotdata)
+        plot_stat_ber.img_plot("stat_ber", colormap=clr_map,)
+        plot_stat_ber.contour_plot("stat_ber", type="line", levels=[-15, -12, -9, -6, -3], colors="white")
+        plot_stat_ber.y_direction = 'normal'
+        plot_stat_ber.components[0].y_direction = 'normal'
+        plot_stat_ber.title  = "BER Contours (Log10(BER) = -3, -6, -9, -12, -15)"
+        plot_stat_ber.x_axis.title = "Time (ps)"
+        plot_stat_ber.x_axis.orientation = "bottom"
+        plot_stat_ber.y_axis.title = "Decision Threshold (V)"
+        plot_stat_ber.x_grid.visible = True
+        plot_stat_ber.y_grid.visible = True
+        plot_stat_ber.x_grid.line_color = 'gray'
+        plot_stat_ber.y_grid.line_color = 'gray'
+
+        container_stat_eye = TabPlotContainer(shape=(1,2), refresh=lambda: update_tab(self, 'stat_eye'))
+        container_stat_eye.add(plot_stat_eye)
+        container_stat_eye.add(plot_stat_ber)
+        self.plots_stat_eye = container_stat_eye
+
         # - Jitter Distributions tab
         plot_jitter_dist_chnl        = Plot(plotdata)
         plot_jitter_dist_chnl.plot(('jitter_bins', 'jitter_chnl'),     type="line", color="blue", name="Measured")
@@ -554,7 +657,7 @@ class PyBERT(HasTraits):
         plot_jitter_dist_dfe.legend.visible   = True
         plot_jitter_dist_dfe.legend.align     = 'ur'
 
-        container_jitter_dist = GridPlotContainer(shape=(2,2))
+        container_jitter_dist = TabPlotContainer(shape=(2,2), refresh=lambda: update_tab(self, 'jitter_dist'))
         container_jitter_dist.add(plot_jitter_dist_chnl)
         container_jitter_dist.add(plot_jitter_dist_tx)
         container_jitter_dist.add(plot_jitter_dist_ctle)
@@ -619,7 +722,7 @@ class PyBERT(HasTraits):
         plot_jitter_spec_dfe.legend.align = 'lr'
         plot_jitter_spec_dfe.value_range = plot_jitter_spec_tx.value_range 
 
-        container_jitter_spec = GridPlotContainer(shape=(2,2))
+        container_jitter_spec = TabPlotContainer(shape=(2,2), refresh=lambda: update_tab(self, 'jitter_spec'))
         container_jitter_spec.add(plot_jitter_spec_chnl)
         container_jitter_spec.add(plot_jitter_spec_tx)
         container_jitter_spec.add(plot_jitter_spec_ctle)
@@ -628,7 +731,7 @@ class PyBERT(HasTraits):
 
         # - Bathtub Curves tab
         plot_bathtub_chnl = Plot(plotdata)
-        plot_bathtub_chnl.plot(("jitter_bins", "bathtub_chnl"), type="line", color="blue")
+        plot_bathtub_chnl.plot(("bathtub_bins", "bathtub_chnl"), type="line", color="blue")
         plot_bathtub_chnl.value_range.high_setting =   0
         plot_bathtub_chnl.value_range.low_setting  = -18
         plot_bathtub_chnl.value_axis.tick_interval =   3
@@ -637,7 +740,7 @@ class PyBERT(HasTraits):
         plot_bathtub_chnl.value_axis.title  = "Log10(P(Transition occurs inside.))"
 
         plot_bathtub_tx = Plot(plotdata)
-        plot_bathtub_tx.plot(("jitter_bins", "bathtub_tx"), type="line", color="blue")
+        plot_bathtub_tx.plot(("bathtub_bins", "bathtub_tx"), type="line", color="blue")
         plot_bathtub_tx.value_range.high_setting =   0
         plot_bathtub_tx.value_range.low_setting  = -18
         plot_bathtub_tx.value_axis.tick_interval =   3
@@ -646,7 +749,7 @@ class PyBERT(HasTraits):
         plot_bathtub_tx.value_axis.title  = "Log10(P(Transition occurs inside.))"
 
         plot_bathtub_ctle = Plot(plotdata)
-        plot_bathtub_ctle.plot(("jitter_bins", "bathtub_ctle"), type="line", color="blue")
+        plot_bathtub_ctle.plot(("bathtub_bins", "bathtub_ctle"), type="line", color="blue")
         plot_bathtub_ctle.value_range.high_setting =   0
         plot_bathtub_ctle.value_range.low_setting  = -18
         plot_bathtub_ctle.value_axis.tick_interval =   3
@@ -655,7 +758,7 @@ class PyBERT(HasTraits):
         plot_bathtub_ctle.value_axis.title  = "Log10(P(Transition occurs inside.))"
 
         plot_bathtub_dfe = Plot(plotdata)
-        plot_bathtub_dfe.plot(("jitter_bins", "bathtub_dfe"), type="line", color="blue")
+        plot_bathtub_dfe.plot(("bathtub_bins", "bathtub_dfe"), type="line", color="blue")
         plot_bathtub_dfe.value_range.high_setting =   0
         plot_bathtub_dfe.value_range.low_setting  = -18
         plot_bathtub_dfe.value_axis.tick_interval =   3
@@ -663,7 +766,7 @@ class PyBERT(HasTraits):
         plot_bathtub_dfe.index_axis.title  = "Time (ps)"
         plot_bathtub_dfe.value_axis.title  = "Log10(P(Transition occurs inside.))"
 
-        container_bathtub = GridPlotContainer(shape=(2,2))
+        container_bathtub = TabPlotContainer(shape=(2,2), refresh=lambda: update_tab(self, 'bathtub'))
         container_bathtub.add(plot_bathtub_chnl)
         container_bathtub.add(plot_bathtub_tx)
         container_bathtub.add(plot_bathtub_ctle)
@@ -674,6 +777,7 @@ class PyBERT(HasTraits):
         # plot19.index_range = plot5.index_range # Zoom x-axes in tandem.
 
         update_eyes(self)
+        update_stat_eye(self)
 
     # Dependent variable definitions
     @cached_property
@@ -839,35 +943,84 @@ class PyBERT(HasTraits):
         info_str += "</TR>\n"
         info_str += "</TABLE>\n"
 
+        info_str += '<H1>Dual-Dirac Jitter Extrapolation</H1>\n'
+        info_str += '<TABLE border="1">\n'
+        info_str += '<TR align="center">\n'
+        info_str += "<TH>Probe Point</TH><TH>DJ(dd) (ps)</TH><TH>RJ(dd) (ps)</TH><TH>TJ@%.0e (ps)</TH>\n" % TJ_BER
+        info_str += "</TR>\n"
+        for (name, (mu_l, mu_r, sigma_l, sigma_r), tj) in [
+                ('Channel',        self.dual_dirac_chnl, self.tj_chnl),
+                ('Tx Preemphasis', self.dual_dirac_tx,   self.tj_tx),
+                ('CTLE',           self.dual_dirac_ctle, self.tj_ctle),
+                ('DFE',            self.dual_dirac_dfe,  self.tj_dfe),
+            ]:
+            info_str += '<TR align="right">\n'
+            info_str += '<TD align="center">%s</TD><TD>%6.3f</TD><TD>%6.3f</TD><TD>%6.3f</TD>\n' % \
+                          (name, (mu_r - mu_l) * 1.e12, (sigma_l + sigma_r) / 2. * 1.e12, tj * 1.e12)
+            info_str += "</TR>\n"
+        info_str += "</TABLE>\n"
+
+        info_str += '<H1>Statistical Eye</H1>\n'
+        info_str += '<TABLE border="1">\n'
+        info_str += '<TR align="center">\n'
+        info_str += "<TH>Eye Height@%.0e (mV)</TH><TH>Eye Width@%.0e (ps)</TH>\n" % (TJ_BER, TJ_BER)
+        info_str += "</TR>\n"
+        info_str += '<TR align="right">\n'
+        info_str += '<TD>%6.1f</TD><TD>%6.3f</TD>\n' % (self.stat_eye_height * 1.e3, self.stat_eye_width * 1.e12)
+        info_str += "</TR>\n"
+        info_str += "</TABLE>\n"
+
         return info_str
     
+    @cached_property
+    def _get_eye_info(self):
+        info_str  = '<H1>Eye Metrics</H1>\n'
+        info_str += '<TABLE border="1">\n'
+        info_str += '<TR align="center">\n'
+        info_str += "<TH>Probe Point</TH><TH>Height (mV)</TH><TH>Width (ps)</TH><TH>Area (mV*ps)</TH><TH>Mask Hits</TH>\n"
+        info_str += "</TR>\n"
+        for (probe, name) in [('chnl', 'Channel'), ('tx', 'Tx Preemphasis'), ('ctle', 'CTLE'), ('dfe', 'DFE')]:
+            info_str += '<TR align="right">\n'
+            info_str += '<TD align="center">%s</TD><TD>%6.1f</TD><TD>%6.3f</TD><TD>%8.1f</TD><TD>%d</TD>\n' % \
+                          (name, getattr(self, 'eye_height_' + probe) * 1.e3, getattr(self, 'eye_width_' + probe) * 1.e12,
+                           getattr(self, 'eye_area_' + probe) * 1.e15, getattr(self, 'eye_mask_hits_' + probe))
+            info_str += "</TR>\n"
+        info_str += "</TABLE>\n"
+
+        return info_str
+
     @cached_property
     def _get_perf_info(self):
         info_str  = '<H2>Performance by Component</H2>\n'
+        if(self.profile is None):
+            return info_str
+        n_samps   = self.nbits * self.nspb
         info_str += '  <TABLE border="1">\n'
         info_str += '    <TR align="center">\n'
-        info_str += '      <TH>Component</TH><TH>Performance (Msmpls./min.)</TH>\n'
-        info_str += '    </TR>\n'
-        info_str += '    <TR align="right">\n'
-        info_str += '      <TD align="center">Channel</TD><TD>%6.3f</TD>\n'         % (self.channel_perf * 60.e-6)
-        info_str += '    </TR>\n'
-        info_str += '    <TR align="right">\n'
-        info_str += '      <TD align="center">Tx Preemphasis</TD><TD>%6.3f</TD>\n'  % (self.tx_perf * 60.e-6)
-        info_str += '    </TR>\n'
-        info_str += '    <TR align="right">\n'
-        info_str += '      <TD align="center">CTLE</TD><TD>%6.3f</TD>\n'            % (self.ctle_perf * 60.e-6)
-        info_str += '    </TR>\n'
-        info_str += '    <TR align="right">\n'
-        info_str += '      <TD align="center">DFE</TD><TD>%6.3f</TD>\n'             % (self.dfe_perf * 60.e-6)
-        info_str += '    </TR>\n'
-        info_str += '    <TR align="right">\n'
-        info_str += '      <TD align="center">Jitter Analysis</TD><TD>%6.3f</TD>\n' % (self.jitter_perf * 60.e-6)
-        info_str += '    </TR>\n'
-        info_str += '    <TR align="right">\n'
-        info_str += '      <TD align="center">Plotting</TD><TD>%6.3f</TD>\n'        % (self.plotting_perf * 60.e-6)
+        info_str += '      <TH>Component</TH><TH>Calls</TH><TH>Wall Time (s)</TH><TH>CPU Time (s)</TH>'
+        info_str += '<TH>Peak Memory (MB)</TH><TH>Performance (Msmpls./min.)</TH>\n'
         info_str += '    </TR>\n'
+        for total in self.profile.totals():
+            names = total['path'].split('/')
+            if(total['path'] == 'simulation'):
+                names = ['Simulation (stages run: %s)' % ', '.join(self.stages_run)]
+            elif(names[0] == 'simulation'):
+                names = names[1:]
+            if(total['peak_rss'] is None):
+                peak_rss = 'n/a'
+            else:
+                peak_rss = '%6.1f' % (total['peak_rss'] * 1.e-6)
+            if(total['wall']):
+                perf = '%6.3f' % (n_samps / total['wall'] * 60.e-6)
+            else:
+                perf = 'n/a'
+            info_str += '    <TR align="right">\n'
+            info_str += '      <TD align="left">%s%s</TD><TD>%d</TD><TD>%6.3f</TD><TD>%6.3f</TD><TD>%s</TD><TD>%s</TD>\n' % \
+                          ('&nbsp;&nbsp;&nbsp;&nbsp;' * (len(names) - 1), names[-1], total['calls'],
+                           total['wall'], total['cpu'], peak_rss, perf)
+            info_str += '    </TR>\n'
         info_str += '    <TR align="right">\n'
-        info_str += '      <TD align="center">TOTAL</TD><TD>%6.3f</TD>\n'           % (self.total_perf * 60.e-6)
+        info_str += '      <TD align="left">TOTAL</TD><TD></TD><TD></TD><TD></TD><TD></TD><TD>%6.3f</TD>\n' % (self.total_perf * 60.e-6)
         info_str += '    </TR>\n'
         info_str += '  </TABLE>\n'
 
@@ -880,6 +1033,8 @@ class PyBERT(HasTraits):
                      (self.isi_dfe * 1.e12, self.dcd_dfe * 1.e12, self.pj_dfe * 1.e12, self.rj_dfe * 1.e12)
         dly_str  = "         | Channel Delay (ns):    %5.3f" % (self.chnl_dly * 1.e9)
         err_str  = "         | Bit errors detected: %d" % self.bit_errs
+        if(self.bit_errs):
+            err_str += " (in %d bursts; longest: %d)" % (len(self.bit_err_bursts), max(self.bit_err_bursts))
         return perf_str + dly_str + jit_str + err_str
 
     @cached_property
@@ -6,18 +6,21 @@
 # Copyright (c) 2014 David Banas; all rights reserved World wide.
 
 from numpy        import sign, sin, pi, array, linspace, float, zeros, ones, repeat, where, diff, log10, sqrt, power, exp, cumsum
+from numpy        import arange, bincount, ceil, floor, concatenate, convolve, mean, minimum, real, reshape, resize, sum
 from numpy.random import normal
-from numpy.fft    import fft
-from scipy.signal import lfilter, iirfilter, invres, freqs, medfilt
-from dfe          import DFE
-from cdr          import CDR
+from numpy.fft    import fft, ifft
+from scipy.special import erfc, ndtri
+from instrument    import timed
 import time
-from pylab import *
 import numpy as np
-import scipy.stats as ss
+
+# Note: 'scipy.signal' is imported lazily, by those few functions needing it,
+#       so that importing this module costs only NumPy and 'scipy.special'.
 
 debug = False
 
+MIN_SIGMA = 1.e-6 # Smallest Gaussian tail width allowed in dual-Dirac models. (UI)
+
 def moving_average(a, n=3) :
     """Calculates a sliding average over the input vector."""
 
@@ -163,7 +166,343 @@ def find_crossings(t, x, amplitude, min_delay = 0., rising_first = True, min_ini
 
     return array(xings)
 
-def calc_jitter(ui, nbits, pattern_len, ideal_xings, actual_xings, rel_thresh=6, num_bins=99, zero_mean=True):
+class HistBins(object):
+    """
+    Precomputed binning for jitter histograms.
+
+    The bins span [-UI/2, +UI/2] uniformly, except for the first and last,
+    which sweep everything in [-UI, -UI/2) and [+UI/2, +UI], respectively.
+    (Samples outside [-UI, +UI] are ignored.)
+
+    Bin indices are computed arithmetically, rather than by searching the
+    bin edges, and counts are accumulated with 'bincount()'. Instances are
+    immutable; use 'HistBins.get()', to share them between callers.
+    """
+
+    _cache = {}
+
+    @classmethod
+    def get(cls, ui, num_bins=99):
+        """Return the (shared) binning for the given unit interval and number of bins."""
+
+        key = (ui, num_bins)
+        if(key not in cls._cache):
+            cls._cache[key] = cls(ui, num_bins)
+        return cls._cache[key]
+
+    def __init__(self, ui, num_bins=99):
+        """
+        Inputs:
+
+          Required:
+
+          - ui        The nominal unit interval.
+
+          Optional:
+
+          - num_bins  The total number of bins, including the two "sweeping" end bins.
+        """
+
+        assert num_bins > 2, "HistBins: At least 3 bins are required!"
+
+        bin_width = ui / (num_bins - 2)
+
+        self.ui          = ui
+        self.num_bins    = num_bins
+        self.bin_width   = bin_width
+        self.bin_centers = np.concatenate(([-ui / 2.], -ui / 2. + (np.arange(num_bins - 2) + 0.5) * bin_width, [ui / 2.]))
+
+    def indices(self, x):
+        """Return the bin index of each sample in 'x', along with a mask of those lying within [-UI, +UI]."""
+
+        x     = np.asarray(x, dtype=float)
+        ui    = self.ui
+        ixs   = np.floor((x + ui / 2.) / self.bin_width).astype(int) + 1
+        ixs   = np.clip(ixs, 0, self.num_bins - 1)
+        valid = (x >= -ui) & (x <= ui)
+        return (ixs, valid)
+
+    def count(self, x):
+        """Return the number of samples in 'x' falling into each bin."""
+
+        ixs, valid = self.indices(x)
+        return np.bincount(ixs[valid], minlength=self.num_bins)
+
+    def pmf(self, x):
+        """Return the probability mass function of the samples in 'x'."""
+
+        counts = self.count(x)
+        return counts / float(max(1, sum(counts)))
+
+class JitterHist(object):
+    """
+    A jitter histogram, which may be accumulated incrementally.
+    (i.e. - chunk by chunk, during long or streaming runs)
+    """
+
+    def __init__(self, ui, num_bins=99):
+        """
+        Inputs:
+
+          Required:
+
+          - ui        The nominal unit interval.
+
+          Optional:
+
+          - num_bins  The total number of bins. (See 'HistBins'.)
+        """
+
+        self.bins   = HistBins.get(ui, num_bins)
+        self.counts = zeros(num_bins, dtype=int)
+
+    def add(self, x):
+        """Add the jitter samples in 'x' to the histogram."""
+
+        self.counts += self.bins.count(x)
+
+    @property
+    def bin_centers(self):
+        """The bin center values."""
+
+        return self.bins.bin_centers
+
+    @property
+    def pmf(self):
+        """The probability mass function of all samples added, so far."""
+
+        return self.counts / float(max(1, sum(self.counts)))
+
+class JitterAccumulator(object):
+    """
+    The jitter at one probe point, accumulated incrementally, from successive waveform chunks.
+    (The streaming counterpart of 'calc_jitter()'.)
+
+    The ideal signal must repeat, w/ a known period. Each actual crossing is matched to the
+    nearest ideal crossing, modulo that period, once the probe point's delay has been found,
+    from the first chunk. Only the following are kept, between chunks:
+
+      - the running sum and count of the TIE in each unit interval of the period
+        (from which the data dependent jitter, ISI and DCD, is found),
+
+      - the histogram of the TIE (See 'JitterHist'.), and
+
+      - the segmented spectra (See 'SegmentedSpectrum'.) of the total, and data independent, TIE
+        (from which the periodic and random jitter are found, as 'calc_jitter()' does, when
+        'seg_len' is non-zero).
+
+    So, the memory required is independent of the length of the run.
+    (Until enough patterns have been averaged, the data independent jitter is slightly overestimated.)
+    """
+
+    def __init__(self, ui, ideal_xings, period, thresholds=(0.,), num_bins=99, seg_len=1024, rel_thresh=6):
+        """
+        Inputs:
+
+          Required:
+
+          - ui            The nominal unit interval.
+
+          - ideal_xings   The ideal crossing times, within one period of the ideal signal, relative to its start.
+
+          - period        The period of the ideal signal.
+
+          Optional:
+
+          - thresholds    The crossing thresholds (V). (e.g. - two, for duo-binary)
+
+          - num_bins      The number of histogram bins. (See 'HistBins'.)
+
+          - seg_len       The segment length used in estimating the jitter spectra. Must be a power of two.
+
+          - rel_thresh    The threshold for determining periodic jitter spectral components (sigma).
+        """
+
+        self.ui          = ui
+        self.period      = period
+        self.ideal_xings = np.sort(array(ideal_xings, dtype=float) % period)
+        self.thresholds  = thresholds
+        self.seg_len     = seg_len
+        self.rel_thresh  = rel_thresh
+        self.hist        = JitterHist(ui, num_bins)
+        # The TIE is averaged by unit interval, threshold, and direction, rather than by ideal crossing,
+        # since a heavily distorted signal may cross more than once, or not at all, near a given ideal crossing.
+        self.n_kinds     = 2 * len(thresholds)
+        self.n_slots     = int(round(period / ui)) * self.n_kinds
+        self.tie_sums    = zeros(self.n_slots)
+        self.tie_counts  = zeros(self.n_slots, dtype=int)
+        self.spec        = SegmentedSpectrum(seg_len)
+        self.spec_ind    = SegmentedSpectrum(seg_len)
+        self.dly         = None                  # The delay of the probe point, relative to the ideal signal.
+        self.last        = None                  # The last (time, value) sample of the previous chunk.
+        self.next_ui     = None                  # The index of the next unit interval to be fed to the spectra.
+        self.n_ties      = 0
+        self.n_uis       = 0
+
+        # The ideal crossings all lie at the same phase, within the unit interval.
+        self.ideal_phase = self._phase(self.ideal_xings)
+
+    def _phase(self, ts):
+        """Return the (circular) mean phase of the times in 'ts', within the unit interval."""
+
+        angles = 2. * pi * (array(ts) % self.ui) / self.ui
+        return (np.angle(mean(np.exp(1j * angles))) % (2. * pi)) * self.ui / (2. * pi)
+
+    def _crossings(self, t, x):
+        """
+        Return the threshold crossing times in this chunk (including any straddling the previous one),
+        along w/ the kind of each crossing: twice the index of its threshold, plus one, if it's rising.
+        """
+
+        t = array(t, dtype=float)
+        x = array(x, dtype=float)
+        if(self.last is not None):
+            t = np.concatenate(([self.last[0]], t))
+            x = np.concatenate(([self.last[1]], x))
+        self.last = (t[-1], x[-1])
+
+        xings = []
+        kinds = []
+        for (thresh_ix, thresh) in enumerate(self.thresholds):
+            y       = x - thresh
+            sign_y  = sign(y)
+            sign_y  = where(sign_y, sign_y, ones(len(sign_y))) # "0"s can produce duplicate xings.
+            xing_ix = where(diff(sign_y))[0]
+            xings.append(t[xing_ix] + (t[xing_ix + 1] - t[xing_ix]) * y[xing_ix] / (y[xing_ix] - y[xing_ix + 1]))
+            kinds.append(2 * thresh_ix + (sign_y[xing_ix] < 0))
+        xings = np.concatenate(xings)
+        kinds = np.concatenate(kinds).astype(int)
+        order = np.argsort(xings)
+        return (xings[order], kinds[order])
+
+    def _calibrate(self, xings):
+        """Find the delay of the probe point, by aligning the crossing pattern to the ideal one."""
+
+        ui       = self.ui
+        n_uis    = int(round(self.period / ui))
+        ideal    = np.round((self.ideal_xings - self.ideal_phase) / ui).astype(int) % n_uis
+        phase    = self._phase(xings)
+        actual   = np.round((xings % self.period - phase) / ui).astype(int) % n_uis
+        occ_i    = zeros(n_uis)
+        occ_i[ideal] = 1.
+        occ_a    = bincount(actual, minlength=n_uis)
+        score    = real(ifft(fft(occ_a) * np.conj(fft(occ_i)))) # (circular cross-correlation)
+        self.dly = phase - self.ideal_phase + score.argmax() * ui
+
+        # Refine, so that the mean TIE is zero.
+        (ties, ixs, valid) = self._ties(xings)
+        if(valid.any()):
+            self.dly += mean(ties[valid])
+
+    def _ties(self, xings):
+        """Return the TIE of each crossing, the index of its ideal crossing, and whether it lies within a UI of that crossing."""
+
+        ideal  = self.ideal_xings
+        n      = len(ideal)
+        ext    = np.concatenate(([ideal[-1] - self.period], ideal, [ideal[0] + self.period]))
+        phases = (xings - self.dly) % self.period
+        ixs    = np.searchsorted(ext, phases)
+        ixs    = where(phases - ext[ixs - 1] < ext[ixs] - phases, ixs - 1, ixs)
+        ties   = phases - ext[ixs]
+        return (ties, (ixs - 1) % n, abs(ties) <= self.ui)
+
+    def feed(self, t, x):
+        """
+        Add the next chunk of the waveform to the jitter analysis.
+
+        Inputs:
+
+          - t     The sample times of the chunk (absolute, in seconds).
+
+          - x     The signal values of the chunk.
+        """
+
+        (xings, kinds) = self._crossings(t, x)
+        if(not len(xings)):
+            return
+        if(self.dly is None):
+            self._calibrate(xings)
+        (ties, ixs, valid) = self._ties(xings)
+        ties  = ties[valid]
+        kinds = kinds[valid]
+        xings = xings[valid]
+
+        ui_ixs  = np.round((xings - self.dly - self.ideal_phase) / self.ui).astype(int)
+        slots   = (ui_ixs * self.n_kinds + kinds) % self.n_slots
+        self.tie_sums   += bincount(slots, weights=ties, minlength=self.n_slots)
+        self.tie_counts += bincount(slots, minlength=self.n_slots)
+        self.hist.add(ties)
+        tie_ind = ties - self.tie_ave[slots]
+
+        # Feed the spectra w/ the TIE tracks, uniformly sampled (i.e. - one sample per unit interval; zero filled).
+        if(self.next_ui is None):
+            self.next_ui = ui_ixs[0]
+        keep    = ui_ixs >= self.next_ui
+        ui_ixs  = ui_ixs[keep] - self.next_ui
+        if(not len(ui_ixs)):
+            return
+        uniform = zeros(ui_ixs[-1] + 1)
+        uniform[ui_ixs] = ties[keep]
+        self.spec.feed(uniform)
+        uniform[ui_ixs] = tie_ind[keep]
+        self.spec_ind.feed(uniform)
+        self.next_ui += len(uniform)
+        self.n_uis   += len(uniform)
+        self.n_ties  += len(ui_ixs)
+
+    @property
+    def tie_ave(self):
+        """The average TIE, by unit interval of the period, threshold, and direction (i.e. - the data dependent jitter)."""
+
+        return self.tie_sums / np.maximum(1, self.tie_counts)
+
+    def results(self, max_pj_uis=2**16):
+        """
+        Return the jitter analysis of all chunks fed, so far.
+
+        Inputs:
+
+          - max_pj_uis  (optional) The number of unit intervals over which the peak to peak periodic jitter is measured.
+
+        Outputs:
+
+          - A dictionary containing: 'isi', 'dcd', 'pj', 'rj', 'thresh', 'jitter_spectrum',
+            'tie_ind_spectrum', 'spectrum_freqs', 'hist', 'bin_centers', and 'dual_dirac'.
+            (See 'calc_jitter()' and 'fit_dual_dirac()'.)
+
+        """
+
+        assert self.spec_ind.n_segs, "JitterAccumulator: Not enough jitter samples, yet, to form a single spectral segment!"
+
+        ui         = self.ui
+        seen       = self.tie_counts > 0
+        tie_ave    = self.tie_ave
+        rising     = (arange(self.n_slots) % 2).astype(bool)
+        risings    = tie_ave[seen & rising]
+        fallings   = tie_ave[seen & ~rising]
+        isi        = 0.
+        dcd        = 0.
+        if(len(risings) and len(fallings)):
+            isi    = min(ui, max(risings.ptp(), fallings.ptp())) # (Capped at the unit interval, as in 'calc_jitter()'.)
+            dcd    = abs(mean(risings) - mean(fallings))
+
+        fill       = float(self.n_ties) / self.n_uis
+        jitter_spectrum  = self.spec.spectrum / sqrt(fill)
+        tie_ind_spectrum = self.spec_ind.spectrum / sqrt(fill)
+        spectrum_freqs   = self.spec_ind.freqs(ui)
+        t_valid    = arange(min(self.n_uis, max_pj_uis)) * ui
+        (thresh, rj, tie_per) = periodic_jitter(tie_ind_spectrum, spectrum_freqs, self.seg_len, fill, self.rel_thresh, t_valid)
+
+        hist       = self.hist
+        dual_dirac = fit_dual_dirac(hist.bin_centers[1:-1], ui, weights=hist.counts[1:-1])
+
+        return {'isi': isi, 'dcd': dcd, 'pj': tie_per.ptp(), 'rj': rj, 'thresh': thresh,
+                'jitter_spectrum': jitter_spectrum, 'tie_ind_spectrum': tie_ind_spectrum, 'spectrum_freqs': spectrum_freqs,
+                'hist': hist.pmf, 'bin_centers': hist.bin_centers, 'dual_dirac': dual_dirac}
+
+@timed()
+def calc_jitter(ui, nbits, pattern_len, ideal_xings, actual_xings, rel_thresh=6, num_bins=99, zero_mean=True,
+                seg_len=0, seg_overlap=0.5):
     """
     Calculate the jitter in a set of actual zero crossings, given the ideal crossings and unit interval.
 
@@ -185,6 +524,12 @@ def calc_jitter(ui, nbits, pattern_len, ideal_xings, actual_xings, rel_thresh=6,
 
       - zero_mean        : (optional) Force the mean jitter to zero, when True.
 
+      - seg_len          : (optional) When non-zero, estimate the jitter spectra by averaging
+                           the spectra of segments of this length (a power of two), instead
+                           of taking a single FFT of the entire TIE record. (See 'SegmentedSpectrum'.)
+
+      - seg_overlap      : (optional) The fractional overlap of adjacent segments, when 'seg_len' is non-zero.
+
     Outputs:
 
       - jitter   : The total jitter.
@@ -217,16 +562,6 @@ def calc_jitter(ui, nbits, pattern_len, ideal_xings, actual_xings, rel_thresh=6,
 
     """
 
-    def my_hist(x):
-        """
-        Calculates the probability mass function (PMF) of the input vector,
-        enforcing an output range of [-UI/2, +UI/2], sweeping everything in [-UI, -UI/2] into the first bin,
-        and everything in [UI/2, UI] into the last bin.
-        """
-        hist, bin_edges      = histogram(x, [-ui] + [-ui / 2. + i * ui / (num_bins - 2) for i in range(num_bins - 1)] + [ui])
-        bin_centers          = [-ui / 2.] + [mean([bin_edges[i + 1], bin_edges[i + 2]]) for i in range(len(bin_edges) - 3)] + [ui / 2.]
-        return (array(map(float, hist)) / sum(hist), bin_centers)
-
     # Assemble the TIE track.
     jitter   = []
     t_jitter = []
@@ -332,32 +667,50 @@ def calc_jitter(ui, nbits, pattern_len, ideal_xings, actual_xings, rel_thresh=6,
     # --- Make vector uniformly sampled in time, via zero padding where necessary.
     # --- (It's necessary to keep track of those elements in the resultant vector, which aren't paddings; hence, 'valid_ix'.)
     x, valid_ix     = make_uniform(t_jitter, jitter, ui, nbits)
-    y               = fft(x)
-    jitter_spectrum = abs(y[:len(y) / 2]) / sqrt(len(jitter)) # Normalized, in order to make power correct.
-    f0              = 1. / (ui * nbits)
-    spectrum_freqs  = [i * f0 for i in range(len(y) / 2)]
 
     # -- Use the data independent jitter spectrum for our calculations.
     tie_ind_uniform, valid_ix = make_uniform(t_jitter, tie_ind, ui, nbits)
 
-    # --- Normalized, in order to make power correct, since we grab Rj from the freq. domain.
-    # --- (I'm using the length of the vector before zero padding, because zero padding doesn't add energy.)
-    # --- (This has the effect of making our final Rj estimate more conservative.)
-    y        = fft(tie_ind_uniform) / sqrt(len(tie_ind))
-    y_mag    = abs(y)
-    y_mean   = moving_average(y_mag, n = len(y_mag) / 10)
-    y_var    = moving_average((y_mag - y_mean) ** 2, n = len(y_mag) / 10)
-    y_sigma  = sqrt(y_var)
-    thresh   = y_mean + rel_thresh * y_sigma
-    y_per    = where(y_mag > thresh, y,             zeros(len(y)))   # Periodic components are those lying above the threshold.
-    y_rnd    = where(y_mag > thresh, zeros(len(y)), y)               # Random components are those lying below.
-    y_rnd    = abs(y_rnd)
-    rj       = sqrt(mean((y_rnd - mean(y_rnd)) ** 2))
-    tie_per  = real(ifft(y_per)).take(valid_ix) * sqrt(len(tie_ind)) # Restoring shape of vector to its original, non-uniformly sampled state.
-    pj       = tie_per.ptp()
-
-    # --- Save the spectrum, for display purposes.
-    tie_ind_spectrum = y_mag[:len(y_mag) / 2]
+    if(seg_len):
+        # -- Segmented/averaged estimation, whose cost and memory are bounded by the segment length.
+        # --- (The TIE only exists at the transitions; so, we normalize to the fraction of UIs having one,
+        # ---  just as we normalize to the number of jitter samples, above.)
+        fill            = float(len(tie_ind)) / len(tie_ind_uniform)
+        seg_len         = min(seg_len, 2 ** int(np.log2(len(tie_ind_uniform))))
+        spec            = SegmentedSpectrum(seg_len, seg_overlap)
+        spec.feed(x)
+        jitter_spectrum = spec.spectrum / sqrt(fill)
+        spec            = SegmentedSpectrum(seg_len, seg_overlap)
+        spec.feed(tie_ind_uniform)
+        y_mag           = spec.spectrum / sqrt(fill)
+        spectrum_freqs  = list(spec.freqs(ui))
+        (thresh, rj, tie_per) = periodic_jitter(y_mag, spectrum_freqs, seg_len, fill, rel_thresh, array(valid_ix) * ui)
+        pj              = tie_per.ptp()
+        tie_ind_spectrum = y_mag
+    else:
+        y               = fft(x)
+        jitter_spectrum = abs(y[:len(y) / 2]) / sqrt(len(jitter)) # Normalized, in order to make power correct.
+        f0              = 1. / (ui * nbits)
+        spectrum_freqs  = [i * f0 for i in range(len(y) / 2)]
+
+        # --- Normalized, in order to make power correct, since we grab Rj from the freq. domain.
+        # --- (I'm using the length of the vector before zero padding, because zero padding doesn't add energy.)
+        # --- (This has the effect of making our final Rj estimate more conservative.)
+        y        = fft(tie_ind_uniform) / sqrt(len(tie_ind))
+        y_mag    = abs(y)
+        y_mean   = moving_average(y_mag, n = len(y_mag) / 10)
+        y_var    = moving_average((y_mag - y_mean) ** 2, n = len(y_mag) / 10)
+        y_sigma  = sqrt(y_var)
+        thresh   = y_mean + rel_thresh * y_sigma
+        y_per    = where(y_mag > thresh, y,             zeros(len(y)))   # Periodic components are those lying above the threshold.
+        y_rnd    = where(y_mag > thresh, zeros(len(y)), y)               # Random components are those lying below.
+        y_rnd    = abs(y_rnd)
+        rj       = sqrt(mean((y_rnd - mean(y_rnd)) ** 2))
+        tie_per  = real(ifft(y_per)).take(valid_ix) * sqrt(len(tie_ind)) # Restoring shape of vector to its original, non-uniformly sampled state.
+        pj       = tie_per.ptp()
+
+        # --- Save the spectrum, for display purposes.
+        tie_ind_spectrum = y_mag[:len(y_mag) / 2]
 
     # - Reassemble the jitter, excluding the Rj.
     # -- Here, we see why it was necessary to keep track of the non-padded elements with 'valid_ix':
@@ -365,23 +718,212 @@ def calc_jitter(ui, nbits, pattern_len, ideal_xings, actual_xings, rel_thresh=6,
     jitter_synth = tie_ave + tie_per
 
     # - Calculate the histogram of original, for comparison.
-    hist,       bin_centers = my_hist(jitter)
+    hist_bins   = HistBins.get(ui, num_bins)
+    bin_centers = hist_bins.bin_centers
+    hist        = hist_bins.pmf(jitter)
 
     # - Calculate the histogram of everything, except Rj.
-    hist_synth, bin_centers = my_hist(jitter_synth)
+    hist_synth  = hist_bins.pmf(jitter_synth)
 
     # - Extrapolate the tails by convolving w/ complete Gaussian.
-    rv         = ss.norm(loc = 0., scale = rj)
-    rj_pdf     = rv.pdf(bin_centers)
+    rj_pdf     = exp(-0.5 * (bin_centers / rj) ** 2) # (Normalized, below.)
     rj_pmf     = (rj_pdf / sum(rj_pdf))
     hist_synth = convolve(hist_synth, rj_pmf)
     tail_len   = (len(bin_centers) - 1) / 2
     hist_synth = [sum(hist_synth[: tail_len + 1])] + list(hist_synth[tail_len + 1 : len(hist_synth) - tail_len - 1]) + [sum(hist_synth[len(hist_synth) - tail_len - 1 :])]
 
     return (jitter, t_jitter, isi, dcd, pj, rj, tie_ind,
-            thresh[:len(thresh) / 2], jitter_spectrum, tie_ind_spectrum, spectrum_freqs,
+            thresh[:len(tie_ind_spectrum)], jitter_spectrum, tie_ind_spectrum, spectrum_freqs,
             hist, hist_synth, bin_centers)
 
+def periodic_jitter(y_mag, spectrum_freqs, seg_len, fill, rel_thresh, t_valid):
+    """
+    Separate the periodic, and random, components of a segmented data independent jitter spectrum.
+
+    Inputs:
+
+      - y_mag          : The spectral magnitude, as estimated by 'SegmentedSpectrum', and normalized
+                         to the fraction of unit intervals having a jitter sample. (See 'fill'.)
+
+      - spectrum_freqs : The frequencies corresponding to the elements of 'y_mag'.
+
+      - seg_len        : The segment length used in estimating 'y_mag'.
+
+      - fill           : The fraction of unit intervals having a jitter sample (i.e. - a transition).
+
+      - rel_thresh     : The threshold for determining periodic components (sigma).
+
+      - t_valid        : The times at which the periodic jitter is to be synthesized.
+
+    Outputs:
+
+      - thresh         : The threshold used for determining periodic components.
+
+      - rj             : The standard deviation of the random jitter.
+
+      - tie_per        : The periodic jitter, at each time in 't_valid'.
+
+    """
+
+    # (With so few bins, a moving mean/variance gets pulled up by the very tones we're looking for;
+    #  so, we use a running median for the floor and the median absolute deviation for the spread.)
+    from scipy.signal import medfilt
+    half_win = max(1, len(y_mag) / 20)
+    y_mean   = medfilt(np.pad(y_mag, half_win, mode='reflect'), 2 * half_win + 1)[half_win : -half_win]
+    y_dev    = medfilt(np.pad(abs(y_mag - y_mean), half_win, mode='reflect'), 2 * half_win + 1)[half_win : -half_win]
+    y_sigma  = 1.4826 * y_dev # (MAD to sigma, for Gaussian data)
+    thresh   = y_mean + rel_thresh * y_sigma
+
+    # Periodic components are the runs of bins lying above the threshold (excluding d.c.).
+    # Their power, in excess of the local noise floor, gives each tone's amplitude;
+    # the rest of the power (w/ the floor filled in under the tones) gives Rj.
+    # (Segment power sums to 'seg_len' times the variance, over the two sided spectrum.)
+    y_pwr      = y_mag ** 2
+    floor_pwr  = y_mean ** 2
+    is_per     = y_mag > thresh
+    is_per[0]  = False
+    rj         = sqrt(2. * sum(where(is_per, floor_pwr, y_pwr)[1:]) / seg_len)
+    run_edges  = diff(np.concatenate(([0], is_per.astype(int), [0])))
+    tie_per    = zeros(len(t_valid))
+    for (start, stop) in zip(where(run_edges == 1)[0], where(run_edges == -1)[0]):
+        tone_pwr = np.maximum(y_pwr[start : stop] - floor_pwr[start : stop], 0.)
+        if(not tone_pwr.any()):
+            continue
+        f_tone   = sum(tone_pwr * spectrum_freqs[start : stop]) / sum(tone_pwr)
+        tie_per += sqrt(4. * sum(tone_pwr) / (seg_len * fill)) * sin(2. * pi * f_tone * t_valid) # (See 'fill'.)
+
+    return (thresh, rj, tie_per)
+
+def fit_dual_dirac(jitter, ui, max_tail_prob=0.1, min_tail_pts=5, weights=None):
+    """
+    Fit a dual-Dirac model to the tails of a measured time interval error (TIE) distribution.
+
+    Each tail of the empirical cumulative distribution is mapped onto the Q scale,
+    where a Gaussian tail becomes a straight line, and a least squares line is fit
+    to it. The slope and intercept of each line give the standard deviation and mean,
+    respectively, of the Gaussian tail (of weight 1/2) on that side of the distribution.
+
+    Inputs:
+
+      - jitter        : The measured TIE samples. (Values outside [-UI/2, +UI/2],
+                        such as the paddings 'calc_jitter()' uses to mark missing
+                        crossings, are excluded from the fit.)
+
+      - ui            : The nominal unit interval.
+
+      - max_tail_prob : (optional) Only samples whose cumulative probability (or, its complement)
+                        is less than this are considered part of a tail.
+
+      - min_tail_pts  : (optional) The minimum number of samples required, in order to fit a tail.
+                        With fewer, the tail is modeled as a single Dirac at the extreme sample.
+
+      - weights       : (optional) The number of occurrences of each value in 'jitter'.
+                        (e.g. - histogram counts, w/ 'jitter' holding the bin centers)
+                        Default = one apiece.
+
+    Outputs:
+
+      - dual_dirac    : A tuple, (mu_l, mu_r, sigma_l, sigma_r), containing the means and
+                        standard deviations of the left and right Gaussian tails.
+                        (DJ(dd) = mu_r - mu_l; RJ(dd) = (sigma_l + sigma_r) / 2.)
+
+    """
+
+    jitter = array(jitter, dtype=float)
+    if(weights is None):
+        weights = ones(len(jitter))
+    weights = array(weights, dtype=float)
+    keep    = (abs(jitter) <= ui / 2.) & (weights > 0.)
+    order   = np.argsort(jitter[keep])
+    x       = jitter[keep][order]
+    w       = weights[keep][order]
+    n       = len(x)
+    assert n, "fit_dual_dirac(): No jitter samples lie within [-UI/2, +UI/2]!"
+
+    cum = np.cumsum(w)
+    p   = (cum - 0.5 * w) / cum[-1]
+
+    def fit_tail(x_tail, q_tail, x_extreme):
+        "Least squares fit of x = mu + sigma * q, guarding against too few points and nonsensical slopes."
+        if(len(x_tail) < min_tail_pts or q_tail.ptp() == 0.):
+            return (x_extreme, 0.)
+        sigma, mu = np.polyfit(q_tail, x_tail, 1)
+        if(sigma <= 0.):
+            return (x_extreme, 0.)
+        return (mu, sigma)
+
+    # On the Q scale, each tail (of weight 1/2) is linear: Q_l = (x - mu_l) / sigma_l; Q_r = (mu_r - x) / sigma_r.
+    left           = p < max_tail_prob
+    mu_l, sigma_l  = fit_tail(x[left],  ndtri(2. * p[left]),         x[0])
+    right          = (1. - p) < max_tail_prob
+    mu_r, sigma_r  = fit_tail(x[right], -ndtri(2. * (1. - p[right])), x[-1])
+
+    return (mu_l, mu_r, sigma_l, sigma_r)
+
+def calc_bathtub(x, ui, dual_dirac, rho_t=1.):
+    """
+    Calculate a bathtub curve analytically, from a dual-Dirac jitter model.
+
+    Because the tails are evaluated with 'erfc()', the curve is accurate far below
+    the probabilities any practical simulation length can resolve directly.
+
+    Inputs:
+
+      - x          : The sampling instants, relative to the center of the eye.
+
+      - ui         : The nominal unit interval.
+
+      - dual_dirac : The (mu_l, mu_r, sigma_l, sigma_r) jitter model. (See 'fit_dual_dirac()'.)
+
+      - rho_t      : (optional) The transition density.
+                     The default of 1 yields the probability that a transition occurs
+                     inside the sampling instant; use 0.5 (random data) to get the BER.
+
+    Outputs:
+
+      - bathtub    : The probability of a transition occurring on the wrong side of each sampling instant.
+
+    """
+
+    (mu_l, mu_r, sigma_l, sigma_r) = dual_dirac
+    sigma_l = max(sigma_l, MIN_SIGMA * ui) # Avoid dividing by zero, for pure Dirac tails.
+    sigma_r = max(sigma_r, MIN_SIGMA * ui)
+    x       = array(x)
+
+    def tail_above(y):
+        "Probability that a crossing, nominally at zero, occurs later than 'y'."
+        return 0.25 * (erfc((y - mu_l) / (sqrt(2.) * sigma_l)) + erfc((y - mu_r) / (sqrt(2.) * sigma_r)))
+
+    def tail_below(y):
+        "Probability that a crossing, nominally at zero, occurs earlier than 'y'."
+        return 0.25 * (erfc((mu_l - y) / (sqrt(2.) * sigma_l)) + erfc((mu_r - y) / (sqrt(2.) * sigma_r)))
+
+    # The left edge of the eye is nominally at -UI/2; the right, at +UI/2.
+    return rho_t * (tail_above(x + ui / 2.) + tail_below(x - ui / 2.))
+
+def calc_tj(ber, dual_dirac, rho_t=0.5):
+    """
+    Calculate the total jitter, at the given bit error rate, from a dual-Dirac jitter model.
+
+    Inputs:
+
+      - ber        : The bit error rate of interest (e.g. - 1.e-12).
+
+      - dual_dirac : The (mu_l, mu_r, sigma_l, sigma_r) jitter model. (See 'fit_dual_dirac()'.)
+
+      - rho_t      : (optional) The transition density. Default = 0.5 (random data).
+
+    Outputs:
+
+      - tj         : The total (peak to peak) jitter, DJ(dd) + Q(BER) * (sigma_l + sigma_r).
+
+    """
+
+    (mu_l, mu_r, sigma_l, sigma_r) = dual_dirac
+    q = -ndtri(ber / rho_t)
+
+    return (mu_r - mu_l) + q * (sigma_l + sigma_r)
+
 def make_uniform(t, jitter, ui, nbits):
     """
     Make the jitter vector uniformly sampled in time, by zero-filling where necessary.
@@ -429,6 +971,87 @@ def make_uniform(t, jitter, ui, nbits):
 
     return jitter, valid_ix
 
+class SegmentedSpectrum(object):
+    """
+    A Welch style (i.e. - segmented and averaged) spectral magnitude estimator,
+    which may be fed its input incrementally.
+
+    Each segment is windowed and transformed independently, and only the
+    running sum of the segment power spectra is kept. So, the cost and memory
+    of the estimate are bounded by the segment length, rather than by the
+    length of the input record, and the estimate gets smoother, as more
+    segments are averaged.
+
+    The returned magnitudes are normalized the same way as those produced
+    by 'calc_jitter()', when it takes a single FFT of the entire record.
+    (i.e. - |FFT(x)| / sqrt(len(x)), for a rectangular window)
+    """
+
+    def __init__(self, seg_len=1024, overlap=0.5, window=True, max_batch_len=2**20):
+        """
+        Inputs:
+
+          Optional:
+
+          - seg_len        The segment length. Must be a power of two.
+
+          - overlap        The fraction of each segment shared with the previous one. Must lie in [0, 1).
+
+          - window         When True, apply a Hann window to each segment, before transforming it.
+
+          - max_batch_len  The maximum number of samples transformed at once.
+                           (Several segments are transformed together, for efficiency.)
+        """
+
+        assert seg_len > 1 and not (seg_len & (seg_len - 1)), "Segment length (%d) must be a power of two!" % seg_len
+        assert 0. <= overlap < 1., "Segment overlap (%f) must lie in [0, 1)!" % overlap
+
+        if(window):
+            win = np.hanning(seg_len)
+        else:
+            win = ones(seg_len)
+
+        self.seg_len     = seg_len
+        self.step        = max(1, int(seg_len * (1. - overlap)))
+        self.win         = win
+        self.win_pwr     = sum(win ** 2)
+        self.max_batch   = max(1, max_batch_len // seg_len)
+        self.n_segs      = 0
+        self.pwr_sum     = zeros(seg_len)
+        self.leftover    = zeros(0)
+
+    def feed(self, x):
+        """Add the next chunk of the input record to the estimate."""
+
+        seg_len = self.seg_len
+        step    = self.step
+
+        x = np.concatenate((self.leftover, np.asarray(x, dtype=float)))
+        if(len(x) < seg_len):
+            self.leftover = x
+            return
+        n_segs  = (len(x) - seg_len) // step + 1
+        offsets = np.arange(seg_len)
+        for first_seg in range(0, n_segs, self.max_batch):
+            starts  = np.arange(first_seg, min(first_seg + self.max_batch, n_segs)) * step
+            segs    = x[starts[:, np.newaxis] + offsets] * self.win
+            self.pwr_sum += (abs(fft(segs, axis=1)) ** 2).sum(axis=0)
+        self.n_segs  += n_segs
+        self.leftover = x[n_segs * step:]
+
+    @property
+    def spectrum(self):
+        """The current (one sided) spectral magnitude estimate, having 'seg_len / 2' elements."""
+
+        assert self.n_segs, "SegmentedSpectrum: Not enough input to form a single segment!"
+
+        return sqrt(self.pwr_sum[:self.seg_len // 2] / (self.n_segs * self.win_pwr))
+
+    def freqs(self, ui):
+        """The frequencies corresponding to the elements of 'spectrum', given the sample interval, 'ui'."""
+
+        return np.arange(self.seg_len // 2) / (ui * self.seg_len)
+
 def calc_gamma(R0, w0, Rdc, Z0, v0, Theta0, ws):
     """
     Calculates propagation constant from cross-sectional parameters.
@@ -508,7 +1131,8 @@ def calc_G(H, Rs, Cs, Zc, RL, Cp, CL, ws):
                                                            # (i.e. - We're interested in what appears across RL.)
     return G
 
-def calc_eye(ui, samps_per_ui, height, ys, clock_times=None):
+@timed()
+def calc_eye(ui, samps_per_ui, height, ys, clock_times=None, width=None, max_batch_len=2**16):
     """
     Calculates the "eye" diagram of the input signal vector.
 
@@ -524,6 +1148,14 @@ def calc_eye(ui, samps_per_ui, height, ys, clock_times=None):
                        (This allows the same function to be used for
                        eye diagram creation,
                        for both pre and post-CDR signals.)
+      - width          (optional)
+                       width of output image data array
+                       If not provided, use one column per sample.
+                       Otherwise, the signal is linearly interpolated
+                       onto 'width' evenly spaced columns, spanning 2 UI.
+      - max_batch_len  (optional)
+                       maximum number of pixel values formed at once
+                       (Bounds the memory used, for long signal vectors.)
 
     Outputs:
       - img_array      The "heat map" representing the eye diagram.
@@ -540,47 +1172,398 @@ def calc_eye(ui, samps_per_ui, height, ys, clock_times=None):
     tsamp = ui / samps_per_ui
 
     # Adjust the scaling.
-    width    = 2 * samps_per_ui
+    if(width is None):
+        width = 2 * samps_per_ui
     y_max    = 1.1 * max(abs(ys))
     y_scale  = height / (2 * y_max)          # (pixels/V)
     y_offset = height / 2                    # (pixels)
+    col_pos  = arange(int(width)) * (2. * samps_per_ui / int(width)) # (samples, from window start)
 
-    # Generate the "heat" picture array.
-    img_array = zeros([height, width])
+    # Find the start of every 2 UI window, along w/ each window's interpolation factor.
     if(clock_times):
-        for clock_time in clock_times:
-            start_time = clock_time - ui
-            stop_time  = clock_time + ui
-            start_ix   = int(start_time / tsamp)
-            if(start_ix + 2 * samps_per_ui > len(ys)):
-                break
-            interp_fac = (start_time - start_ix * tsamp) / tsamp
-            last_y     = ys[start_ix]
-            i = 0
-            for (samp1, samp2) in zip(ys[start_ix : start_ix + 2 * samps_per_ui],
-                                      ys[start_ix + 1 : start_ix + 1 + 2 * samps_per_ui]):
-                y = samp1 + (samp2 - samp1) * interp_fac
-                img_array[int(y * y_scale + 0.5) + y_offset, i] += 1
-#                if(sign(y) != sign(last_y)): # Trap zero crossings.
-#                    img_array[y_offset, int(i - 1 + y / (y - last_y) + 0.5)] += 1
-                last_y = y
-                i += 1
+        (start_ixs, start_fracs) = clock_aligned_starts(clock_times, ui, samps_per_ui, len(ys))
     else:
         start_ix      = (where(diff(sign(ys)))[0] % samps_per_ui).mean() + samps_per_ui // 2 
         last_start_ix = len(ys) - 2 * samps_per_ui
-        while(start_ix < last_start_ix):
-            last_y = ys[start_ix]
-            i      = 0
-            for y in ys[start_ix : start_ix + 2 * samps_per_ui]:
-                img_array[int(y * y_scale + 0.5) + y_offset, i] += 1
-#                if(sign(y) != sign(last_y)): # Trap zero crossings.
-#                    img_array[y_offset, int(i - 1 + y / (y - last_y) + 0.5)] += 1
-                last_y = y
-                i += 1
-            start_ix += samps_per_ui
+        start_ixs     = arange(start_ix, last_start_ix, samps_per_ui).astype(int)
+        start_fracs   = zeros(len(start_ixs))
+
+    # Generate the "heat" picture array, binning the windows a batch at a time.
+    counts = zeros(int(height * width), dtype=int)
+    for (y_vals, valid) in iter_eye_windows(ys, start_ixs, start_fracs, col_pos, max_batch_len):
+        counts += bin_eye(y_vals[valid], where(valid)[1], y_scale, y_offset, height, width) # (The last window may be a sample short.)
+    img_array = counts.reshape((height, int(width))) * 1.
 
     return img_array
 
+def clock_aligned_starts(clock_times, ui, samps_per_ui, n_ys):
+    """
+    Locates the 2 UI eye diagram windows centered on a set of clock times.
+
+    Inputs:
+      - clock_times    vector of clock times (s)
+      - ui             unit interval (s)
+      - samps_per_ui   # of samples per unit interval
+      - n_ys           length of the signal vector
+
+    Outputs:
+      - start_ixs      sample index of the start of each window
+      - start_fracs    fractional sample offset, in [0, 1), of the start of each window
+
+    Clock times whose windows would run off the end of the signal vector are
+    dropped, along w/ all those following them.
+
+    """
+
+    tsamp       = ui / samps_per_ui
+    start_times = array(clock_times, dtype=float) - ui
+    start_ixs   = (start_times / tsamp).astype(int)
+    too_late    = where(start_ixs + 2 * samps_per_ui > n_ys)[0]
+    if(len(too_late)):
+        start_times = start_times[:too_late[0]]
+        start_ixs   = start_ixs[:too_late[0]]
+
+    return (start_ixs, (start_times - start_ixs * tsamp) / tsamp)
+
+def iter_eye_windows(ys, start_ixs, start_fracs, col_pos, max_batch_len=2**16):
+    """
+    Generates the interpolated eye diagram windows (See 'interp_eye_windows()'.), in batches.
+
+    Each batch contains no more than 'max_batch_len' values (but, at least one window).
+    """
+
+    batch_size = max(1, max_batch_len // len(col_pos))
+    for first in range(0, len(start_ixs), batch_size):
+        yield interp_eye_windows(ys, start_ixs[first : first + batch_size], start_fracs[first : first + batch_size], col_pos)
+
+def interp_eye_windows(ys, start_ixs, start_fracs, col_pos):
+    """
+    Gathers, and linearly interpolates, a set of eye diagram windows.
+
+    Inputs:
+      - ys             signal vector
+      - start_ixs      sample index of the start of each window
+      - start_fracs    fractional sample offset, in [0, 1), of the start of each window
+      - col_pos        offset (in samples, from the window start) of each image column
+
+    Outputs:
+      - y_vals         interpolated signal levels, one row per window
+      - valid          False, wherever the interpolation ran off the end of 'ys'
+
+    """
+
+    n_ys     = len(ys)
+    col_base = floor(col_pos)
+    fracs    = start_fracs[:, None] + (col_pos - col_base)[None, :]
+    carry    = fracs >= 1.
+    fracs    = where(carry, fracs - 1., fracs)
+    samp_ixs = start_ixs[:, None] + col_base.astype(int)[None, :] + carry
+    valid    = samp_ixs + 1 < n_ys
+    samps1   = ys[minimum(samp_ixs, n_ys - 1)]
+    samps2   = ys[minimum(samp_ixs + 1, n_ys - 1)]
+
+    return (samps1 + (samps2 - samps1) * fracs, valid)
+
+def calc_eye_metrics(img_arrays, ys, samps_per_ui, ui, thresh=0., y_ref=0., mask=None):
+    """
+    Measures the inner eye opening of several eye diagrams at once.
+
+    Inputs:
+      - img_arrays     stack of (height x width) eye images (i.e. - the outputs of 'calc_eye()')
+      - ys             signal level of each image row (V)
+                       (either one vector, for all images, or one row per image)
+      - samps_per_ui   # of samples (i.e. - image columns) per unit interval
+      - ui             unit interval (s)
+      - thresh         (optional)
+                       Pixels having values no greater than this are considered open.
+                       (Use the default for hit counts, or the target BER, for the
+                       BER array produced by 'calc_stat_eye()'.)
+      - y_ref          (optional)
+                       decision threshold, through which the opening is measured (V)
+      - mask           (optional)
+                       (x1, x2, y1) hexagonal eye mask, having its points at (+/-x1, 0)
+                       and its flat top/bottom at +/-y1, between +/-x2.
+                       ('x1' and 'x2' are in UI, and 'y1' is in volts.)
+
+    Outputs:
+      - heights        vertical opening, at the eye center, of each image (V)
+      - widths         horizontal opening, along 'y_ref', of each image (s)
+      - areas          area of the inner eye (i.e. - the vertical openings of
+                       all the columns in the horizontal opening) of each image (V*s)
+      - mask_hits      sum of the pixel values inside the mask, for each image
+                       (zero, if no mask was given)
+      - center_cols    column of the eye center, in each image
+
+    The eye center is taken to be the middle of the widest horizontal opening
+    through the row nearest 'y_ref'. (The free-running
+    eyes produced by 'calc_eye()' aren't necessarily centered in their images.)
+    See 'find_eye_center()'.
+
+    """
+
+    img_arrays      = array(img_arrays, dtype=float)
+    (n_imgs, height, width) = img_arrays.shape
+    ys              = array(ys, dtype=float) * ones((n_imgs, 1))
+    dvs             = ys[:, 1] - ys[:, 0]
+    dt              = ui / samps_per_ui
+    is_open         = img_arrays <= thresh
+    rows            = arange(height)
+    cols            = arange(width)
+    center_rows     = abs(ys - y_ref).argmin(axis=1)
+    img_ixs         = arange(n_imgs)
+
+    # Vertical opening of every column, through the center row.
+    below           = (rows[None, :] <= center_rows[:, None])[:, :, None]
+    first_closed_up = where(~is_open & ~below, rows[None, :, None], height).min(axis=1)
+    last_closed_dn  = where(~is_open & below,   rows[None, :, None], -1).max(axis=1)
+    col_openings    = first_closed_up - last_closed_dn - 1
+    col_openings    = where(is_open[img_ixs, center_rows, :], col_openings, 0)
+
+    # Eye center. (The opening is found along the whole 2 UI image, rather than just its middle UI,
+    # since that of a free-running eye may straddle either end of the middle UI.)
+    center_line     = is_open[img_ixs, center_rows, :]
+    first_col       = int(samps_per_ui // 2)
+    center_cols     = []
+    for (line, openings) in zip(center_line, col_openings):
+        center_col = find_eye_center(line)
+        if(center_col is None):                  # (No opening to center on; take the tallest column, in the middle UI.)
+            center_col = openings[first_col : first_col + int(samps_per_ui)].argmax() + first_col
+        center_cols.append(center_col)
+    center_cols     = array(center_cols, dtype=int)
+
+    # Horizontal opening, along the center row.
+    left            = cols[None, :] <= center_cols[:, None]
+    first_closed_rt = where(~center_line & ~left, cols[None, :], width).min(axis=1)
+    last_closed_lt  = where(~center_line & left,  cols[None, :], -1).max(axis=1)
+    in_opening      = (cols[None, :] > last_closed_lt[:, None]) & (cols[None, :] < first_closed_rt[:, None])
+
+    heights         = col_openings[img_ixs, center_cols] * dvs
+    widths          = in_opening.sum(axis=1) * dt
+    areas           = (col_openings * in_opening).sum(axis=1) * dvs * dt
+
+    if(mask is None):
+        mask_hits   = zeros(n_imgs)
+    else:
+        (x1, x2, y1) = mask
+        xs_ui        = abs(cols[None, :] - center_cols[:, None]) / float(samps_per_ui)
+        dys          = abs(ys - y_ref)[:, :, None]
+        in_mask      = (dys <= y1) & (xs_ui[:, None, :] <= x1 - (x1 - x2) * dys / y1)
+        mask_hits    = (img_arrays * in_mask).sum(axis=2).sum(axis=1)
+
+    return (heights, widths, areas, mask_hits, center_cols)
+
+def find_eye_center(is_open):
+    """
+    Locates the middle of the widest horizontal eye opening.
+
+    Inputs:
+      - is_open        boolean vector, having one element per image column,
+                       True wherever the eye is open
+
+    Outputs:
+      - center         the column nearest the middle of the widest run of open columns
+                       (None, if the eye is either entirely open, or entirely closed.)
+
+    Every column across the flat top of an open eye has the same vertical opening;
+    so, the center is found from the horizontal opening, rather than the vertical.
+    (An opening cut short by either end of the image is narrower than its complete
+    copy, one UI away; so, it's passed over.)
+
+    """
+
+    is_open = array(is_open, dtype=bool)
+    if(is_open.all() or not is_open.any()):
+        return None
+    edges  = diff(concatenate(([0], is_open.astype(int), [0])))
+    starts = where(edges == 1)[0]
+    lens   = where(edges == -1)[0] - starts
+    widest = lens.argmax()
+    return int(starts[widest] + (lens[widest] - 1) // 2)
+
+def bin_eye(y_vals, x_ixs, y_scale, y_offset, height, width):
+    """
+    Count the eye diagram pixel hits of a set of (signal level, window column) pairs.
+
+    Inputs:
+      - y_vals     signal levels (V)
+      - x_ixs      window column indices, corresponding to 'y_vals'
+      - y_scale    vertical scaling (pixels/V)
+      - y_offset   vertical offset (pixels)
+      - height     height of eye image
+      - width      width of eye image
+
+    Outputs:
+      - counts     The pixel hit counts, as a flattened (height x width) array.
+                   (Hits falling outside the image are dropped.)
+
+    """
+
+    y_ixs = (y_vals * y_scale + 0.5).astype(int) + y_offset
+    valid = (y_ixs >= 0) & (y_ixs < height)
+
+    return bincount(y_ixs[valid] * int(width) + x_ixs[valid], minlength=int(height * width))
+
+class EyeAccumulator(object):
+    """
+    An eye diagram, which may be accumulated incrementally, from successive waveform chunks.
+
+    Unlike 'calc_eye()', the vertical range is fixed at construction time,
+    so that only the pixel counts, and a small amount of leftover waveform,
+    need be kept between chunks. Pixel hits outside the range are dropped.
+    The pixel mapping is otherwise identical to that of 'calc_eye()'.
+
+    The eye may be free-running (i.e. - windows spaced by exactly one unit interval),
+    or clocked (i.e. - centered on clock times accompanying each waveform chunk).
+    Each clock time is held over, until a chunk arrives completing its window.
+    """
+
+    def __init__(self, ui, samps_per_ui, height, y_max, phase=None, width=None, start_ix=0):
+        """
+        Inputs:
+
+          Required:
+
+          - ui            The unit interval (s).
+
+          - samps_per_ui  The number of samples per unit interval.
+
+          - height        The height of the eye image.
+
+          - y_max         The signal level at the top of the eye image. (The bottom is at '-y_max'.)
+
+          Optional:
+
+          - phase         The (free-running) index of the first window start.
+                          If not provided, it is found from the zero crossings of the first chunk,
+                          the same way 'calc_eye()' does it.
+
+          - width         The width of the eye image. (See 'calc_eye()'.)
+
+          - start_ix      The index, within the whole signal, of the first sample to be fed.
+                          (For eyes begun part way through a run. Clock times, and 'phase',
+                          are always relative to the start of the whole signal.)
+        """
+
+        assert y_max > 0., "EyeAccumulator: 'y_max' must be positive!"
+
+        self.ui           = ui
+        self.samps_per_ui = samps_per_ui
+        self.height       = height
+        if(width is None):
+            width = 2 * samps_per_ui
+        self.width        = int(width)
+        self.col_pos      = arange(self.width) * (2. * samps_per_ui / self.width)
+        self.span         = int(ceil(self.col_pos[-1])) + 1 # The last sample needed by a window, relative to its start.
+        self.tsamp        = ui / samps_per_ui
+        self.y_scale      = height / (2. * y_max)  # (pixels/V)
+        self.y_offset     = height / 2             # (pixels)
+        self.phase        = phase
+        self.counts       = zeros(height * self.width, dtype=int)
+        self.n_windows    = 0
+        self.leftover     = zeros(0)               # Samples still needed by future windows.
+        self.leftover_ix  = start_ix               # The absolute index of the first leftover sample.
+        self.next_start   = None                   # The absolute index of the next free-running window start.
+        self.pending      = zeros(0)               # Clock times awaiting completion of their windows.
+
+    def feed(self, ys, clock_times=None):
+        """
+        Add the next chunk of the waveform to the eye.
+
+        Inputs:
+
+          Required:
+
+          - ys           The next chunk of the signal vector.
+
+          Optional:
+
+          - clock_times  The clock times (absolute, in seconds) to use for eye centers, which arrived w/ this chunk.
+                         (Use either always, or never, for a given accumulator.)
+        """
+
+        width  = self.width
+        span   = self.span
+        ys     = np.concatenate((self.leftover, np.asarray(ys, dtype=float)))
+        buf_ix = self.leftover_ix
+        end_ix = buf_ix + len(ys)
+
+        if(clock_times is not None):
+            pending     = np.concatenate((self.pending, np.asarray(clock_times, dtype=float)))
+            start_times = pending - self.ui
+            all_ixs     = (start_times / self.tsamp).astype(int)
+            ready       = all_ixs + span < end_ix
+            usable      = ready & (all_ixs >= buf_ix)      # (Windows starting before our leftover are lost.)
+            start_fracs = (start_times[usable] - all_ixs[usable] * self.tsamp) / self.tsamp
+            start_ixs   = all_ixs[usable] - buf_ix
+            self.pending = pending[~ready]
+            keep_ix      = end_ix - 2 * span            # (Windows of clock times yet to arrive start no earlier.)
+            if(len(self.pending)):
+                keep_ix = min(keep_ix, all_ixs[~ready].min())
+        else:
+            if(self.next_start is None):
+                if(self.phase is None):
+                    xings = where(diff(sign(ys)))[0]
+                    if(not len(xings)):                 # Wait for a chunk w/ some crossings in it.
+                        self.leftover = ys
+                        return
+                    self.phase = buf_ix + (xings % self.samps_per_ui).mean() + self.samps_per_ui // 2
+                self.next_start = self.phase
+            starts = np.arange(self.next_start, end_ix - span, self.samps_per_ui)
+            if(len(starts)):
+                self.next_start = starts[-1] + self.samps_per_ui
+            start_ixs   = starts.astype(int) - buf_ix
+            start_fracs = zeros(len(starts))
+            keep_ix     = int(self.next_start)
+
+        for (y_vals, valid) in iter_eye_windows(ys, start_ixs, start_fracs, self.col_pos):
+            self.counts += bin_eye(y_vals.flatten(), resize(np.arange(width), y_vals.size),
+                                   self.y_scale, self.y_offset, self.height, width)
+        self.n_windows  += len(start_ixs)
+        keep_ix          = max(buf_ix, min(keep_ix, end_ix))
+        self.leftover    = ys[keep_ix - buf_ix:]
+        self.leftover_ix = keep_ix
+
+    @property
+    def img_array(self):
+        """The current "heat map" representing the eye diagram. (See 'calc_eye()'.)"""
+
+        return self.counts.reshape((self.height, self.width)) * 1.
+
+class OverlapSaveFilter(object):
+    """
+    A FIR filter, which may be run incrementally, over successive chunks of its input,
+    using the overlap-save method of fast convolution.
+
+    The last 'len(h) - 1' input samples are carried over, between chunks; so, the
+    concatenated outputs are identical to 'convolve(x, h)[:len(x)]', for the
+    concatenated inputs. (i.e. - The filter starts from rest.)
+    """
+
+    def __init__(self, h):
+        """
+        Inputs:
+
+          - h     The impulse response of the filter.
+        """
+
+        self.h    = array(h, dtype=float)
+        self.tail = zeros(len(self.h) - 1)
+        self._Hs  = {}                           # Frequency responses, by FFT length.
+
+    def feed(self, x):
+        """Filter the next chunk of the input, returning the corresponding chunk of the output."""
+
+        x    = np.asarray(x, dtype=float)
+        n_h  = len(self.h)
+        buf  = np.concatenate((self.tail, x))
+        n    = 2 ** int(ceil(np.log2(len(buf))))
+        if(n not in self._Hs):
+            self._Hs = {n: np.fft.rfft(self.h, n)} # (Only the most recent length is kept.)
+        y    = np.fft.irfft(np.fft.rfft(buf, n) * self._Hs[n], n)[n_h - 1 : len(buf)]
+        self.tail = buf[len(buf) - (n_h - 1):]
+
+        return y
+
 def make_ctle(rx_bw, peak_freq, peak_mag, w):
     """
     Generate the frequency response of a continuous time linear
@@ -631,6 +1614,7 @@ def make_ctle(rx_bw, peak_freq, peak_mag, w):
     else:
         r1   = -1.
         r2   = z - p1
+    from scipy.signal import invres, freqs
     b, a = invres([r1, r2], [p1, p2], [])
 
     return freqs(b, a, w)
@@ -5,21 +5,40 @@
 #
 # Copyright (c) 2014 David Banas; all rights reserved World wide.
 
+from traits.api              import Any
 from traitsui.api            import View, Item, Group, VGroup, HGroup, Action, Handler, DefaultOverride, CheckListEditor
 from enable.component_editor import ComponentEditor
+from pyface.timer.api        import Timer
 import time
 
 from pybert_cntrl import *
 
+gPollIntv = 100 # interval at which a running simulation is checked on (ms)
+
 class MyHandler(Handler):
     """This handler is instantiated by the View and handles user button clicks."""
 
+    worker = Any() # the running simulation, if any (See 'start_simulation()'.)
+    timer  = Any() # polls the running simulation
+
     def do_run_simulation(self, info):
-        info.object.status = 'Running channel...'
-        my_run_simulation(info.object)
-        info.object.status = 'Ready.'
+        if(self.worker and self.worker.is_alive()):
+            return
+        info.object.status = 'Starting simulation...'
+        self.worker = start_simulation(info.object)
+        self.timer  = Timer(gPollIntv, self._poll, info.object)
+
+    def do_abort_simulation(self, info):
+        if(self.worker):
+            self.worker.cancel()
 
-run_simulation = Action(name="Run", action="do_run_simulation")
+    def _poll(self, the_pybert):
+        if(not poll_simulation(the_pybert, self.worker)):
+            self.timer.Stop()
+            self.worker = None
+
+run_simulation   = Action(name="Run",   action="do_run_simulation")
+abort_simulation = Action(name="Abort", action="do_abort_simulation")
     
 # Main window layout definition.
 traits_view = View(
@@ -32,8 +51,11 @@ traits_view = View(
                 Item(name='nspb',        label='Nspb',     tooltip="# of samples per bit", ),
                 Item(name='pattern_len', label='PatLen',   tooltip="length of random pattern to use to construct bit stream", ),
                 Item(name='eye_bits',    label='EyeBits',  tooltip="# of bits to use to form eye diagrams", ),
+                Item(name='seed',        label='Seed',     tooltip="random number seed; reproduces a run exactly (0 = a fresh seed, each run)", ),
                 Item(name='mod_type',    label='Modulation', tooltip="line signalling/modulation scheme",
                                                              editor=CheckListEditor(values=[(0, 'NRZ'), (1, 'Duo-binary'), (2, 'PAM-4'),])),
+                Item(name='precision',   label='Precision',  tooltip="floating point precision of the waveforms and spectra; single halves their memory",
+                                                             editor=CheckListEditor(values=[('double', 'Double'), ('single', 'Single'),])),
                 label='Simulation Control', show_border=True,
             ),
             VGroup(
@@ -89,6 +111,11 @@ traits_view = View(
             ),
             VGroup(
                 Item(name='thresh',          label='Pj Thresh.',   tooltip="Threshold for identifying periodic jitter spectral elements. (sigma)", ),
+                Item(name='seg_len',         label='Seg. Len.',    tooltip="Jitter spectrum segment length; a power of 2. (0 = single FFT of entire record)", ),
+                Item(name='stat_rj',         label='Stat. Rj (ps)', tooltip="Random jitter (rms) folded into the statistical eye", ),
+                Item(name='eye_rows',        label='Eye Rows',     tooltip="eye diagram image height (pixels)", ),
+                Item(name='eye_cols',        label='Eye Cols',     tooltip="eye diagram image width (pixels); 0 = one column per sample", ),
+                Item(name='results_dir',     label='Results Dir.', tooltip="directory into which each run's results are saved; blank = don't save", ),
                 label='Analysis Parameters', show_border=True,
             ),
             label = 'Config.', id = 'config',
@@ -118,6 +145,10 @@ traits_view = View(
             Item('plots_eye', editor=ComponentEditor(), show_label=False,),
             label = 'Eye Diagrams', id = 'plots_eye'
         ),
+        Group(
+            Item('plots_stat_eye', editor=ComponentEditor(), show_label=False,),
+            label = 'Statistical Eye', id = 'plots_stat_eye'
+        ),
         Group(
             Item('plots_jitter_dist', editor=ComponentEditor(), show_label=False,),
             label = 'Jitter Distributions', id = 'plots_jitter_dist'
@@ -132,6 +163,7 @@ traits_view = View(
         ),
         Group(
             Item('jitter_info', style='readonly', show_label=False),
+            Item('eye_info', style='readonly', show_label=False),
             label = 'Jitter Info'
         ),
         Group(
@@ -147,7 +179,7 @@ traits_view = View(
     ),
     resizable = True,
     handler = MyHandler(),
-    buttons = [run_simulation, "OK"],
+    buttons = [run_simulation, abort_simulation, "OK"],
     statusbar = "status_str",
     title='PyBERT',
     width=1200, height=800
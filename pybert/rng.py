@@ -0,0 +1,74 @@
+# Random number streams for PyBERT.
+#
+# Original author: agent <agent@local>
+# Original date:   October 19, 2026
+#
+# Copyright (c) 2026 agent; all rights reserved World wide.
+
+"""
+Random number streams for PyBERT.
+
+This Python script provides the random number generators used by the
+simulation. Each source of randomness (the bit pattern, the random
+noise, etc.) draws from its own, named, stream, derived from a single
+run seed; so:
+
+  - a run is exactly reproducible, given its seed,
+
+  - changing how many numbers one source draws (e.g. - a longer run, or
+    a future jitter source) doesn't disturb any other, and
+
+  - independent substreams may be handed out, by index, to parallel
+    workers (e.g. - the trials of a Monte Carlo run).
+
+No source draws from the global NumPy generator.
+
+Each stream is a 'numpy.random.RandomState' (Mersenne Twister), seeded
+w/ a SHA-256 digest of the run seed, stream name, and substream index.
+Streams so derived are statistically independent, and the chance of any
+two of them overlapping, over the lengths drawn here, is negligible.
+
+Typical usage:
+
+    seed  = new_seed()
+    noise = rng_stream(seed, 'noise')
+    x    += noise.normal(scale=rn, size=len(x))
+
+    trial_rng = rng_stream(seed, 'noise', trial_index)
+"""
+
+import hashlib
+import os
+
+from numpy        import frombuffer
+from numpy.random import RandomState
+
+gSeedBits = 32 # size of the seeds returned by 'new_seed()'
+
+def new_seed():
+    """Return a fresh, random, run seed (drawn from the operating system's entropy source)."""
+
+    return int(os.urandom(gSeedBits // 8).encode('hex'), 16)
+
+def derive_seed(seed, name, *index):
+    """
+    Return the key used to seed the named stream, as an array of 32-bit words.
+
+    Inputs:
+
+      - seed      The run seed (a non-negative integer).
+
+      - name      The name of the stream (e.g. - 'pattern', or 'noise').
+
+      - index     (optional) The index(es) of the substream (e.g. - a trial, or worker, number).
+    """
+
+    assert int(seed) >= 0, "derive_seed(): The seed must be a non-negative integer!"
+
+    key = repr((int(seed), str(name)) + tuple([int(i) for i in index]))
+    return frombuffer(hashlib.sha256(key).digest(), dtype='<u4')
+
+def rng_stream(seed, name, *index):
+    """Return the named (sub)stream of the given run seed, as a 'numpy.random.RandomState'. (See 'derive_seed()'.)"""
+
+    return RandomState(derive_seed(seed, name, *index))
@@ -0,0 +1,746 @@
+# Headless simulation engine for PyBERT.
+#
+# Original author: agent <agent@local>
+# Original date:   October 19, 2026 (Split out of `pybert_cntrl.py', to run free of the GUI.)
+#
+# Copyright (c) 2026 agent; all rights reserved World wide.
+
+"""
+Headless simulation engine for PyBERT.
+
+This Python script contains the simulation proper, free of any GUI
+machinery. It needs only NumPy and SciPy; so, it may be used for batch
+runs, without paying the cost of importing Traits and Chaco, or of
+building the plots.
+
+Typical usage:
+
+    from pybert.simulation import Params, simulate
+
+    results = simulate(Params(nbits=16000, l_ch=2.))
+    print results.bit_errs, results.tj_dfe
+"""
+
+from numpy        import array, arange, pi, zeros, ones, repeat, where, resize, exp, real, convolve, concatenate, sqrt, sum
+from numpy        import float32, float64, complex64, complex128
+from numpy.fft    import fft, ifft
+from dfe          import DFE
+from parallel     import run_jitter_jobs
+from stat_eye     import calc_stat_eye
+from pipeline     import Stage, Pipeline
+from pybert_util  import find_crossings, calc_gamma, calc_G, trim_impulse, make_ctle, fit_dual_dirac, calc_tj, moving_average
+from pybert_util  import calc_eye, calc_eye_metrics
+from instrument   import Profile, section
+from rng          import new_seed, rng_stream
+from bit_errs     import check_bits
+
+TJ_BER          = 1.e-12 # BER at which extrapolated total jitter is reported.
+STAT_EYE_HEIGHT = 256    # number of vertical bins in statistical eye
+EYE_MASK        = (0.25, 0.15, 0.025) # hexagonal eye mask: (x1 (UI), x2 (UI), y1 (V)) (See 'calc_eye_metrics()'.)
+PROBES          = ['chnl', 'tx', 'ctle', 'dfe'] # probe points, in signal path order
+
+# The (real, complex) types of the waveforms and spectra, for each setting of 'Params.precision'.
+# Only the full length waveforms (and the convolutions producing them) and the spectra are affected;
+# the time/frequency vectors, the impulse/step responses, and the jitter and statistical eye
+# calculations remain in double precision. (See precision.py, for a check of the difference made.)
+PRECISIONS = {
+    'double': (float64, complex128),
+    'single': (float32, complex64),
+}
+
+gFc = 1.e6 # corner frequency of high-pass filter used to model capacitive coupling of periodic noise.
+
+class Params(object):
+    """
+    The simulation parameters.
+
+    The defaults match those of the GUI. (See 'pybert.py'.) Any of them may be overridden
+    by keyword, when constructing an instance:
+
+        params = Params(ui=50., mod_type=2)
+
+    Note: Unlike the GUI traits, 'mod_type' and 'precision' are plain values, here:
+          0 = NRZ; 1 = Duo-binary; 2 = PAM-4; and 'double' or 'single'.
+    """
+
+    # - Simulation Control
+    ui              = 100.    # (ps)
+    nbits           = 8000    # number of bits to run
+    pattern_len     = 127     # repeating bit pattern length
+    nspb            = 32      # samples per bit
+    eye_bits        = 1600    # number of bits used to form eye, jitter, and bit error statistics
+    mod_type        = 0       # modulation type
+    seed            = None    # random number seed (None = a fresh seed, each time the signal is generated) (See rng.py.)
+    precision       = 'double' # floating point precision of the waveforms and spectra: 'double' or 'single' (See 'PRECISIONS'.)
+    # - Channel Control
+    Rdc             = 0.1876  # Ohms/m
+    w0              = 10.e6   # (rads./s)
+    R0              = 1.452   # skin-effect resistance (Ohms/m)
+    Theta0          = .02     # loss tangent
+    Z0              = 100.    # characteristic impedance in LC region (Ohms)
+    v0              = 0.67    # relative propagation velocity (c)
+    l_ch            = 1.0     # cable length (m)
+    # - Tx
+    vod             = 1.0     # output drive strength (Vp)
+    rs              = 100.    # differential source impedance (Ohms)
+    cout            = 0.50    # parasitic output capacitance (pF)
+    pn_mag          = 0.1     # magnitude of periodic noise (V)
+    pn_freq         = 0.437   # frequency of periodic noise (MHz)
+    rn              = 0.01    # standard deviation of Gaussian random noise (V)
+    pretap          = -0.05
+    posttap         = -0.10
+    # - Rx
+    rin             = 100.    # differential input resistance (Ohms)
+    cin             = 0.50    # parasitic input capacitance (pF)
+    cac             = 1.      # a.c. coupling capacitance (uF)
+    rx_bw           = 12.     # Rx signal path bandwidth, assuming no CTLE action. (GHz)
+    use_dfe         = True    # Include DFE when running simulation.
+    sum_ideal       = True    # DFE ideal summing node selector
+    peak_freq       = 5.      # CTLE peaking frequency (GHz)
+    peak_mag        = 10.     # CTLE peaking magnitude (dB)
+    # - DFE
+    decision_scaler = 0.5
+    gain            = 0.1
+    n_ave           = 100.
+    n_taps          = 5
+    sum_bw          = 12.     # DFE summing node bandwidth (GHz)
+    # - CDR
+    delta_t         = 0.1     # (ps)
+    alpha           = 0.01
+    n_lock_ave      = 500     # number of UI used to average CDR locked status.
+    rel_lock_tol    = .1      # relative lock tolerance of CDR.
+    lock_sustain    = 500
+    # - Analysis
+    thresh          = 6       # threshold for identifying periodic jitter spectral elements (sigma)
+    seg_len         = 0       # jitter spectrum segment length (0 = single FFT of entire TIE record)
+    stat_rj         = 0.      # random jitter folded into statistical eye (ps)
+    eye_rows        = 100     # eye diagram image height (pixels)
+    eye_cols        = 0       # eye diagram image width (pixels) (0 = one column per sample)
+
+    def __init__(self, **kwargs):
+        names = self.names()
+        for (name, val) in kwargs.items():
+            if(name not in names):
+                raise Exception("ERROR: Params(): Unrecognized simulation parameter, '%s'!" % name)
+            setattr(self, name, val)
+
+    @classmethod
+    def names(cls):
+        """Return the names of all the simulation parameters."""
+
+        return [name for name in dir(cls) if not name.startswith('_') and not callable(getattr(cls, name))]
+
+class Results(object):
+    """
+    The simulation results.
+
+    The attributes are filled in by the simulation stages, as they run. (See 'make_pipeline()'.)
+    A 'Results' instance may be handed back to 'simulate()', in which case only those stages
+    affected by the parameter changes, since the last run, are rerun.
+
+    The 'profile' attribute holds the timing and memory usage of the stages run last time.
+    (See instrument.py.) The 'seed' attribute holds the random number seed used; passing it
+    back, as 'Params.seed', reproduces the run exactly. (See rng.py.)
+
+    The eye diagram of each probe point (i.e. - 'chnl', 'tx', 'ctle', and 'dfe') is in 'eye_<probe>',
+    and the signal levels of its rows in the matching row of 'eye_ys'. Its metrics are in 'eye_height_<probe>',
+    'eye_width_<probe>', 'eye_area_<probe>', and 'eye_mask_hits_<probe>'. (See 'measure_eyes()'.)
+    """
+
+    def __init__(self):
+        self.pipeline   = make_pipeline()
+        self.stages_run = []
+        self.profile    = Profile()
+
+def simulate(params, results=None, force=False, progress=None):
+    """
+    Runs the simulation.
+
+    Inputs:
+
+      Required:
+
+      - params      The simulation parameters, as a 'Params' instance.
+
+      Optional:
+
+      - results     The 'Results' of a previous run, to be updated incrementally.
+
+      - force       If True, run every stage, regardless.
+
+      - progress    A function, taking a status string and the fraction of the current stage
+                    completed, called periodically. It may raise an exception, to abort the run.
+
+    Outputs:
+
+      - results     The simulation results, as a 'Results' instance.
+
+    """
+
+    check_params(params)
+    if(results is None):
+        results = Results()
+    results.profile = Profile()
+    with results.profile.section('simulation'):
+        results.stages_run = results.pipeline.run(params, results, force=force, progress=progress)
+
+    return results
+
+def check_params(params):
+    """
+    Checks those parameters that would otherwise fail only late in a run.
+
+    Raises an exception, naming the offending parameter, before any stage is run.
+    """
+
+    seg_len = params.seg_len
+    if(seg_len and (seg_len < 2 or seg_len & (seg_len - 1))):
+        raise Exception("ERROR: check_params(): The jitter spectrum segment length (%d) must be zero, or a power of two!" % seg_len)
+
+def make_pipeline():
+    """
+    Builds the simulation pipeline.
+
+    Each stage declares the parameters it reads and the stages whose outputs it uses,
+    so that changing a parameter causes only that stage, and those downstream of it, to be rerun.
+    """
+
+    return Pipeline([
+        Stage('signal',   run_signal,
+              ['ui', 'nbits', 'nspb', 'pattern_len', 'mod_type', 'decision_scaler', 'seed', 'precision'],
+              status='Generating signal...'),
+        Stage('channel',  run_channel,
+              ['R0', 'w0', 'Rdc', 'Z0', 'v0', 'Theta0', 'l_ch', 'rs', 'cout', 'rin', 'cac', 'cin'],
+              ['signal'],
+              status='Running channel...'),
+        Stage('tx',       run_tx,
+              ['pretap', 'posttap', 'pn_mag', 'pn_freq', 'rn'],
+              ['signal', 'channel'],
+              status='Running Tx...'),
+        Stage('ctle',     run_ctle,
+              ['rx_bw', 'peak_freq', 'peak_mag'],
+              ['signal', 'channel', 'tx'],
+              status='Running CTLE...'),
+        Stage('dfe',      run_dfe,
+              ['use_dfe', 'sum_ideal', 'n_taps', 'gain', 'delta_t', 'alpha', 'n_ave', 'n_lock_ave',
+               'rel_lock_tol', 'lock_sustain', 'sum_bw', 'eye_bits'],
+              ['signal', 'ctle'],
+              status='Running DFE/CDR...'),
+        Stage('stat_eye', run_stat_eye,
+              ['stat_rj', 'use_dfe', 'n_taps', 'rn'],
+              ['signal', 'ctle'],
+              status='Calculating statistical eye...'),
+        Stage('jitter',   run_jitter,
+              ['thresh', 'seg_len', 'eye_bits'],
+              ['signal', 'channel', 'tx', 'ctle', 'dfe'],
+              status='Analyzing jitter...'),
+        Stage('eye',      run_eye,
+              ['eye_bits', 'eye_rows', 'eye_cols'],
+              ['signal', 'channel', 'tx', 'ctle', 'dfe'],
+              status='Forming eye diagrams...'),
+    ])
+
+
+def make_dfe(p, ui, nspui):
+    """
+    Return a new DFE/CDR, configured per the simulation parameters.
+
+    (If the DFE isn't in use, its gain is zeroed and its summing node made ideal; so, only the CDR and slicer remain.)
+    """
+
+    if(p.use_dfe):
+        gain  = p.gain
+        ideal = p.sum_ideal
+    else:
+        gain  = 0.
+        ideal = True
+    return DFE(p.n_taps, gain, p.delta_t * 1.e-12, p.alpha, ui, nspui, p.decision_scaler, p.mod_type,
+               n_ave=p.n_ave, n_lock_ave=p.n_lock_ave, rel_lock_tol=p.rel_lock_tol, lock_sustain=p.lock_sustain,
+               bandwidth=p.sum_bw * 1.e9, ideal=ideal)
+
+def count_bit_errs(bits, bits_out, first_bit):
+    """
+    Count the bit errors in the DFE output. (See 'check_bits()', in bit_errs.py, for their positions, as well.)
+
+    Inputs:
+
+      - bits          The transmitted bits.
+
+      - bits_out      The bits recovered by the DFE.
+
+      - first_bit     The index of the first transmitted bit to be checked. (Earlier bits are
+                      excluded, to give the DFE and CDR time to adapt and lock.)
+
+    Outputs:
+
+      - bit_errs      The number of bit errors.
+
+      - bits_checked  The number of bits checked.
+
+      - bit_dly       The delay, in bits, of the DFE output, relative to the transmitted bits.
+
+      - auto_corr     The correlation of the recovered bits w/ the transmitted bits, vs. delay,
+                      from which 'bit_dly' was found.
+
+    """
+
+    errs = check_bits(bits, bits_out, first_bit)
+    return (errs.bit_errs, errs.bits_checked, errs.bit_dly, errs.auto_corr)
+
+def run_signal(p, r, ctx, report):
+    """Generates the time/frequency vectors, and the ideal transmitted signal."""
+
+    nbits           = p.nbits
+    nspb            = p.nspb
+    ui              = p.ui * 1.e-12
+    pattern_len     = p.pattern_len
+    decision_scaler = p.decision_scaler
+    mod_type        = p.mod_type
+    if(p.precision not in PRECISIONS):
+        raise Exception("ERROR: simulate(): Unknown precision, '%s', requested!" % p.precision)
+    (dtype, cdtype) = PRECISIONS[p.precision]
+
+    # Calculate system time vector.
+    t0     = ui / nspb
+    npts   = nbits * nspb
+    t      = [i * t0 for i in range(npts)]
+    t_ns   = 1.e9 * array(t)
+    r.t_ns = t_ns
+    
+    # Calculate the frequency vector appropriate for indexing non-shifted FFT output.
+    # (i.e. - [0, f0, 2 * f0, ... , fN] + [-(fN - f0), -(fN - 2 * f0), ... , -f0]
+    f0        = 1. / (t[1] * npts)
+    half_npts = npts // 2
+    f         = array([i * f0 for i in range(half_npts + 1)] + [(half_npts - i) * -f0 for i in range(1, half_npts)])
+    r.f       = f
+    w         = 2 * pi * f
+    
+    # Calculate misc. values.
+    fs         = nspb / ui
+    Ts         = 1. / fs
+
+    # Correct unit interval for PAM-4 modulation, if necessary.
+    nui      = nbits
+    nspui    = nspb
+    if(mod_type == 2):                           # PAM-4 uses 2 UI per transmitted symbol.
+        ui      *= 2.
+        nui     /= 2
+        nspui   *= 2
+
+    # Generate the ideal over-sampled signal.
+    # - The seed used is recorded, so that the run can be reproduced. The downstream stages draw from it, as well.
+    seed = p.seed
+    if(seed is None):
+        seed = new_seed()
+    r.seed      = seed
+    bits        = resize(array([0, 1, 1] + list(rng_stream(seed, 'pattern').randint(2, size=pattern_len - 3))), nbits)
+    if  (mod_type == 0):                         # NRZ
+        symbols = 2 * bits - 1
+    elif(mod_type == 1):                         # Duo-binary
+        symbols = [0, bits[0]]                     # Extra leading zero is required, due to shifted addition, below.
+        for bit in bits[1:]:                       # XOR pre-coding prevents infinite error propagation.
+            symbols.append(bit ^ symbols[-1])
+        symbols = (2 * array(symbols) - 1) / 2.    # These 2 lines do the actual duo-binary encoding.
+        symbols = symbols[:-1] + symbols[1:]
+    elif(mod_type == 2):                        # PAM-4
+        symbols = array(map(lambda x: (x[0] << 1) + x[1], zip(bits[0::2], bits[1::2]))) * 2./3. - 1.
+        symbols = repeat(symbols, 2)
+    else:
+        raise Exception("ERROR: simulate(): Unknown modulation type requested!")
+    x                 = repeat(symbols, nspb).astype(dtype)
+    r.ideal_signal    = x
+
+    # Find the ideal crossing times.
+    ideal_xings = find_crossings(t, x, decision_scaler, min_delay = ui / 2., mod_type = mod_type)
+
+    return {'t': t, 't_ns': t_ns, 'f': f, 'w': w, 'fs': fs, 'Ts': Ts, 'ui': ui, 'nui': nui, 'nspui': nspui,
+            'bits': bits, 'symbols': symbols, 'x': x, 'ideal_xings': ideal_xings, 'seed': seed,
+            'dtype': dtype, 'cdtype': cdtype}
+
+def run_channel(p, r, ctx, report):
+    """Generates the output from, and the impulse/step/frequency responses of, the channel."""
+
+    Rs     = p.rs
+    Cs     = p.cout * 1.e-12
+    RL     = p.rin
+    CL     = p.cac * 1.e-6
+    Cp     = p.cin * 1.e-12
+    R0     = p.R0
+    w0     = p.w0
+    Rdc    = p.Rdc
+    Z0     = p.Z0
+    v0     = p.v0 * 3.e8
+    Theta0 = p.Theta0
+    l_ch   = p.l_ch
+    t_ns   = ctx['t_ns']
+    w      = ctx['w']
+    Ts     = ctx['Ts']
+    x      = ctx['x']
+    dtype  = ctx['dtype']
+
+    chnl_dly         = l_ch / v0
+    gamma, Zc        = calc_gamma(R0, w0, Rdc, Z0, v0, Theta0, w)
+    H                = exp(-l_ch * gamma)
+    chnl_H           = 2. * calc_G(H, Rs, Cs, Zc, RL, Cp, CL, w) # Compensating for nominal /2 divider action.
+    chnl_h, start_ix = trim_impulse(real(ifft(chnl_H)), Ts, chnl_dly)
+    t_ns_chnl        = t_ns[start_ix : start_ix + len(chnl_h)]
+    r.t_ns_chnl      = t_ns_chnl
+    r.chnl_s         = chnl_h.cumsum()
+    with section('convolve'):
+        chnl_out     = convolve(x, chnl_h.astype(dtype))[:len(x)]
+    r.chnl_H         = chnl_H.astype(ctx['cdtype'])
+    r.chnl_h         = chnl_h * 1.e-9 / Ts # Scaled to units of "V/ns" for later display. DON'T DO THIS TO THE LOCAL COPY!
+    r.chnl_out       = chnl_out
+    r.chnl_dly       = chnl_dly
+
+    return {'chnl_h': chnl_h, 'chnl_out': chnl_out}
+
+def run_tx(p, r, ctx, report):
+    """Generates the output from, and the incremental/cumulative impulse/step/frequency responses of, the Tx."""
+
+    nspb    = p.nspb
+    rn      = p.rn
+    pn_mag  = p.pn_mag
+    pn_freq = p.pn_freq * 1.e6
+    pretap  = p.pretap
+    posttap = p.posttap
+    w       = ctx['w']
+    fs      = ctx['fs']
+    Ts      = ctx['Ts']
+    symbols = ctx['symbols']
+    chnl_h  = ctx['chnl_h']
+    dtype   = ctx['dtype']
+    cdtype  = ctx['cdtype']
+
+    # - Generate the ideal, post-preemphasis signal.
+    ffe    = [pretap, 1.0 - abs(pretap) - abs(posttap), posttap]                    # FIR filter numerator, for fs = fbit.
+    ffe_out= convolve(symbols, ffe)[:len(symbols)]
+    tx_out = repeat(ffe_out, nspb).astype(dtype)                                       # oversampled output
+    # - Calculate the responses.
+    # - (The Tx is unique in that the calculated responses aren't used to form the output.
+    #    This is partly due to the out of order nature in which we combine the Tx and channel,
+    #    and partly due to the fact that we're adding noise to the Tx output.)
+    tx_h   = concatenate([[x] + list(zeros(nspb - 1)) for x in ffe])
+    tx_h.resize(len(chnl_h))
+    temp   = tx_h.copy()
+    temp.resize(len(w))
+    tx_H   = fft(temp)
+    # - Generate the uncorrelated periodic noise. (Assume capacitive coupling.)
+    #   - Generate the ideal rectangular aggressor waveform.
+    pn_period          = 1. / pn_freq
+    pn_samps           = int(pn_period / Ts + 0.5)
+    pn                 = zeros(pn_samps)
+    pn[pn_samps // 2:] = pn_mag
+    pn                 = resize(pn, len(tx_out))
+    #   - High pass filter it. (Simulating capacitive coupling.)
+    from scipy.signal import lfilter, iirfilter
+    (b, a) = iirfilter(2, gFc/(fs/2), btype='highpass')
+    pn     = lfilter(b, a, pn)[:len(pn)]
+    # - Add the uncorrelated periodic noise to the Tx output.
+    tx_out += pn
+    # - Convolve w/ channel.
+    tx_out_h   = convolve(tx_h, chnl_h)[:len(chnl_h)]
+    temp       = tx_out_h.copy()
+    temp.resize(len(w))
+    tx_out_H   = fft(temp)
+    with section('convolve'):
+        tx_out = convolve(tx_out, chnl_h.astype(dtype))[:len(tx_out)]
+    # - Add the random noise to the Rx input.
+    if(rn):
+        tx_out += rng_stream(ctx['seed'], 'noise').normal(scale=rn, size=(len(tx_out),))
+    r.tx_s     = tx_h.cumsum()
+    r.tx_out   = tx_out
+    r.tx_out_s = tx_out_h.cumsum()
+    r.tx_H     = tx_H.astype(cdtype)
+    r.tx_h     = tx_h * 1.e-9 / Ts
+    r.tx_out_H = tx_out_H.astype(cdtype)
+    r.tx_out_h = tx_out_h * 1.e-9 / Ts
+
+    return {'tx_out': tx_out, 'tx_out_h': tx_out_h}
+
+def run_ctle(p, r, ctx, report):
+    """Generates the output from, and the incremental/cumulative impulse/step/frequency responses of, the CTLE."""
+
+    rx_bw     = p.rx_bw * 1.e9
+    peak_freq = p.peak_freq * 1.e9
+    peak_mag  = p.peak_mag
+    t         = ctx['t']
+    w         = ctx['w']
+    Ts        = ctx['Ts']
+    chnl_h    = ctx['chnl_h']
+    tx_out    = ctx['tx_out']
+    tx_out_h  = ctx['tx_out_h']
+    cdtype    = ctx['cdtype']
+
+    w_dummy, H      = make_ctle(rx_bw, peak_freq, peak_mag, w)
+    ctle_H          = H / abs(H[0])  # Scale to force d.c. component of '1'.
+    ctle_h          = real(ifft(ctle_H))[:len(chnl_h)]
+    with section('convolve'):
+        ctle_out    = convolve(tx_out, ctle_h.astype(ctx['dtype']))[:len(tx_out)]
+    r.ctle_s        = ctle_h.cumsum()
+    ctle_out_h      = convolve(tx_out_h, ctle_h)[:len(tx_out_h)]
+    conv_dly        = t[where(ctle_out_h == max(ctle_out_h))[0][0]]
+    ctle_out_s      = ctle_out_h.cumsum()
+    temp            = ctle_out_h.copy()
+    temp.resize(len(w))
+    ctle_out_H      = fft(temp).astype(cdtype)
+    # - Store local variables to results.
+    r.ctle_out_s = ctle_out_s
+    r.ctle_H     = ctle_H.astype(cdtype)
+    r.ctle_h     = ctle_h * 1.e-9 / Ts
+    r.ctle_out_H = ctle_out_H
+    r.ctle_out_h = ctle_out_h * 1.e-9 / Ts
+    r.ctle_out   = ctle_out
+    r.conv_dly   = conv_dly
+
+    return {'ctle_h': ctle_h, 'ctle_out': ctle_out, 'ctle_out_h': ctle_out_h, 'ctle_out_H': ctle_out_H, 'conv_dly': conv_dly}
+
+def run_dfe(p, r, ctx, report):
+    """Generates the output from, and the incremental/cumulative impulse/step/frequency responses of, the DFE."""
+
+    nbits           = p.nbits
+    eye_bits        = p.eye_bits
+    nspb            = p.nspb
+    t               = ctx['t']
+    w               = ctx['w']
+    Ts              = ctx['Ts']
+    ui              = ctx['ui']
+    nspui           = ctx['nspui']
+    bits            = ctx['bits']
+    ctle_out        = ctx['ctle_out']
+    ctle_out_h      = ctx['ctle_out_h']
+    ctle_out_H      = ctx['ctle_out_H']
+
+    # - The DFE/CDR adapts sample by sample; so, it runs in double precision, regardless. (See 'PRECISIONS'.)
+    dfe = make_dfe(p, ui, nspui)
+    (dfe_out, tap_weights, ui_ests, clocks, lockeds, clock_times, bits_out) = dfe.run(t, ctle_out.astype(float64), progress=report)
+    dfe_out = array(dfe_out, dtype=ctx['dtype'])
+    # - A decision error corrupts the DFE feedback for 'n_taps' bits; so, errors that close together are counted as one burst.
+    errs = check_bits(bits, bits_out, nbits - eye_bits, burst_gap=max(1, p.n_taps * p.use_dfe))
+    r.auto_corr         = errs.auto_corr
+    r.bit_errs          = errs.bit_errs
+    r.bit_err_positions = errs.positions
+    r.bit_err_bursts    = errs.burst_lens
+
+    dfe_h          = array([1.] + list(zeros(nspb - 1)) + list(concatenate([[-x] + list(zeros(nspb - 1)) for x in tap_weights[-1]])))
+    dfe_h.resize(len(ctle_out_h))
+    temp           = dfe_h.copy()
+    temp.resize(len(w))
+    dfe_H          = fft(temp).astype(ctx['cdtype'])
+    r.dfe_s        = dfe_h.cumsum()
+    dfe_out_H      = ctle_out_H * dfe_H
+    dfe_out_h      = convolve(ctle_out_h, dfe_h)[:len(ctle_out_h)]
+    r.dfe_out_s    = dfe_out_h.cumsum()
+    r.dfe_H        = dfe_H
+    r.dfe_h        = dfe_h * 1.e-9 / Ts
+    r.dfe_out_H    = dfe_out_H
+    r.dfe_out_h    = dfe_out_h * 1.e-9 / Ts
+    r.dfe_out      = dfe_out
+
+    r.adaptation  = tap_weights
+    r.ui_ests     = array(ui_ests) * 1.e12 # (ps)
+    r.clocks      = clocks
+    r.lockeds     = lockeds
+    r.clock_times = clock_times
+
+    return {'dfe_out': dfe_out, 'clock_times': clock_times}
+
+def run_stat_eye(p, r, ctx, report):
+    """
+    Calculates the statistical eye, directly from the pulse response.
+
+    (The DFE is assumed ideal, here; the noise is referred to the CTLE output.)
+    """
+
+    rn         = p.rn
+    mod_type   = p.mod_type
+    Ts         = ctx['Ts']
+    nspui      = ctx['nspui']
+    ctle_h     = ctx['ctle_h']
+    ctle_out_h = ctx['ctle_out_h']
+
+    with section('convolve'):
+        ctle_out_p = convolve(ctle_out_h, ones(nspui))[:len(ctle_out_h)]
+    if(p.use_dfe):
+        n_dfe_taps = p.n_taps
+    else:
+        n_dfe_taps = 0
+    (stat_eye, stat_ber, stat_ys, stat_eye_height, stat_eye_width) = calc_stat_eye(ctle_out_p, nspui, Ts,
+                mod_type=mod_type, n_dfe_taps=n_dfe_taps, sigma_v=rn * sqrt(sum(ctle_h ** 2)),
+                sigma_t=p.stat_rj * 1.e-12, height=STAT_EYE_HEIGHT, ber_target=TJ_BER)
+    r.ctle_out_p      = ctle_out_p
+    r.stat_eye        = stat_eye
+    r.stat_ber        = stat_ber
+    r.stat_ys         = stat_ys
+    r.stat_eye_height = stat_eye_height
+    r.stat_eye_width  = stat_eye_width
+
+    return {}
+
+def run_jitter(p, r, ctx, report):
+    """Analyzes the jitter at each of the four probe points."""
+
+    eye_bits        = p.eye_bits
+    pattern_len     = p.pattern_len
+    decision_scaler = p.decision_scaler
+    rel_thresh      = p.thresh
+    seg_len         = p.seg_len
+    mod_type        = p.mod_type
+    t               = ctx['t']
+    ui              = ctx['ui']
+    nui             = ctx['nui']
+    ideal_xings     = ctx['ideal_xings']
+    conv_dly        = ctx['conv_dly']
+
+    eye_uis = eye_bits
+    if(mod_type == 2):                           # PAM-4 uses 2 UI per transmitted symbol.
+        eye_uis /= 2
+
+    # - The four probe points are independent of each other; so, we analyze them concurrently.
+    ignore_until     = (nui - eye_uis) * ui + ui / 2.
+    ideal_xings_dfe  = array(filter(lambda x: x > ignore_until, list(ideal_xings)))
+    min_delay        = ignore_until + conv_dly
+    jitter_kwargs    = {'rel_thresh': rel_thresh, 'seg_len': seg_len}
+    jitter_arrays    = {'t': t, 'ideal_xings': ideal_xings, 'ideal_xings_dfe': ideal_xings_dfe,
+                        'chnl_out': ctx['chnl_out'], 'tx_out': ctx['tx_out'], 'ctle_out': ctx['ctle_out'], 'dfe_out': ctx['dfe_out']}
+    jitter_jobs      = [
+        ('chnl', 'chnl_out', 'ideal_xings',     decision_scaler, {'mod_type': mod_type},
+            (ui, nui,     pattern_len), jitter_kwargs),
+        ('tx',   'tx_out',   'ideal_xings',     decision_scaler, {'mod_type': mod_type},
+            (ui, nui,     pattern_len), jitter_kwargs),
+        ('ctle', 'ctle_out', 'ideal_xings',     decision_scaler, {'mod_type': mod_type},
+            (ui, nui,     pattern_len), jitter_kwargs),
+        ('dfe',  'dfe_out',  'ideal_xings_dfe', decision_scaler, {'mod_type': mod_type, 'min_delay': min_delay, 'rising_first': False},
+            (ui, eye_uis, pattern_len), jitter_kwargs),
+    ]
+    jitter_results   = run_jitter_jobs(jitter_arrays, jitter_jobs)
+    # - channel output
+    (jitter, t_jitter, isi, dcd, pj, rj, jitter_ext, \
+        thresh, jitter_spectrum, jitter_ind_spectrum, spectrum_freqs, \
+        hist, hist_synth, bin_centers) = jitter_results['chnl']
+    r.t_jitter                 = t_jitter
+    r.isi_chnl                 = isi
+    r.dcd_chnl                 = dcd
+    r.pj_chnl                  = pj
+    r.rj_chnl                  = rj
+    r.thresh_chnl              = thresh
+    r.jitter_chnl              = hist
+    r.jitter_ext_chnl          = hist_synth
+    r.jitter_bins              = bin_centers
+    r.jitter_spectrum_chnl     = jitter_spectrum
+    r.jitter_ind_spectrum_chnl = jitter_ind_spectrum
+    r.f_MHz                    = array(spectrum_freqs) * 1.e-6
+    r.dual_dirac_chnl          = fit_dual_dirac(jitter, ui)
+    r.tj_chnl                  = calc_tj(TJ_BER, r.dual_dirac_chnl)
+    # - Tx output
+    (jitter, t_jitter, isi, dcd, pj, rj, jitter_ext, \
+        thresh, jitter_spectrum, jitter_ind_spectrum, spectrum_freqs, \
+        hist, hist_synth, bin_centers) = jitter_results['tx']
+    r.isi_tx                 = isi
+    r.dcd_tx                 = dcd
+    r.pj_tx                  = pj
+    r.rj_tx                  = rj
+    r.thresh_tx              = thresh
+    r.jitter_tx              = hist
+    r.jitter_ext_tx          = hist_synth
+    r.jitter_spectrum_tx     = jitter_spectrum
+    r.jitter_ind_spectrum_tx = jitter_ind_spectrum
+    r.dual_dirac_tx          = fit_dual_dirac(jitter, ui)
+    r.tj_tx                  = calc_tj(TJ_BER, r.dual_dirac_tx)
+    # - CTLE output
+    (jitter, t_jitter, isi, dcd, pj, rj, jitter_ext, \
+        thresh, jitter_spectrum, jitter_ind_spectrum, spectrum_freqs, \
+        hist, hist_synth, bin_centers) = jitter_results['ctle']
+    r.isi_ctle                 = isi
+    r.dcd_ctle                 = dcd
+    r.pj_ctle                  = pj
+    r.rj_ctle                  = rj
+    r.thresh_ctle              = thresh
+    r.jitter_ctle              = hist
+    r.jitter_ext_ctle          = hist_synth
+    r.jitter_spectrum_ctle     = jitter_spectrum
+    r.jitter_ind_spectrum_ctle = jitter_ind_spectrum
+    r.dual_dirac_ctle          = fit_dual_dirac(jitter, ui)
+    r.tj_ctle                  = calc_tj(TJ_BER, r.dual_dirac_ctle)
+    # - DFE output
+    ideal_xings   = ideal_xings_dfe
+    (jitter, t_jitter, isi, dcd, pj, rj, jitter_ext, \
+        thresh, jitter_spectrum, jitter_ind_spectrum, spectrum_freqs, \
+        hist, hist_synth, bin_centers) = jitter_results['dfe']
+    r.isi_dfe                    = isi
+    r.dcd_dfe                    = dcd
+    r.pj_dfe                     = pj
+    r.rj_dfe                     = rj
+    r.thresh_dfe                 = thresh
+    r.jitter_dfe                 = hist
+    r.jitter_ext_dfe             = hist_synth
+    r.jitter_spectrum_dfe        = jitter_spectrum
+    r.jitter_ind_spectrum_dfe    = jitter_ind_spectrum
+    r.f_MHz_dfe                  = array(spectrum_freqs) * 1.e-6
+    r.dual_dirac_dfe             = fit_dual_dirac(jitter, ui)
+    r.tj_dfe                     = calc_tj(TJ_BER, r.dual_dirac_dfe)
+    ctle_spec                    = r.jitter_spectrum_ctle
+    dfe_spec                     = r.jitter_spectrum_dfe
+    skip_factor                  = len(ctle_spec) / len(dfe_spec) # (Unity, when the spectra are segmented.)
+    ctle_spec_condensed          = array([ctle_spec.take(range(i, i + skip_factor)).mean() for i in range(0, len(ctle_spec), skip_factor)])
+    window_width                 = len(dfe_spec) / 10
+    r.jitter_rejection_ratio     = moving_average(ctle_spec_condensed, window_width) / moving_average(dfe_spec, window_width) 
+    #r.jitter_rejection_ratio    = zeros(len(dfe_spec))
+    r.ideal_xings                = ideal_xings
+
+    return {}
+
+def run_eye(p, r, ctx, report):
+    """
+    Forms the eye diagrams of the four probe points, and measures their openings.
+
+    (The DFE output eye is centered on the recovered clock, from the end of the adaptation period;
+    the others are free-running.)
+    """
+
+    ui           = ctx['ui']
+    nspui        = ctx['nspui']
+    clock_times  = ctx['clock_times']
+    height       = p.eye_rows
+    width        = p.eye_cols or 2 * nspui
+    ignore_until = (p.nbits - p.eye_bits) * p.ui * 1.e-12
+
+    i = 0
+    while(clock_times[i] <= ignore_until):
+        i += 1
+        assert i < len(clock_times), "ERROR: Insufficient coverage in 'clock_times' vector."
+    outs   = [ctx['chnl_out'], ctx['tx_out'], ctx['ctle_out'], ctx['dfe_out']]
+    eyes   = [calc_eye(ui, nspui, height, out, width=width) for out in outs[:3]]
+    eyes  += [calc_eye(ui, nspui, height, outs[3], clock_times[i:], width=width)]
+    eye_ys = array([(arange(height) - height // 2) * 2.2 * max(abs(out)) / height for out in outs]) # (See 'calc_eye()'.)
+    for (probe, eye) in zip(PROBES, eyes):
+        setattr(r, 'eye_' + probe, eye)
+    r.eye_ys = eye_ys
+    measure_eyes(r, eyes, eye_ys, width / 2., ui)
+
+    return {}
+
+def measure_eyes(r, eyes, eye_ys, cols_per_ui, ui):
+    """
+    Measures the eye diagrams of the four probe points, setting their metrics on the results given.
+
+    Inputs:
+
+      - r             The results, on which to set the metrics. (See 'Results'.)
+
+      - eyes          The eye diagram images, in 'PROBES' order.
+
+      - eye_ys        The signal levels of the image rows; one row per image.
+
+      - cols_per_ui   The number of image columns per unit interval.
+
+      - ui            The unit interval (s).
+
+    """
+
+    (heights, widths, areas, mask_hits, center_cols) = calc_eye_metrics(eyes, eye_ys, cols_per_ui, ui, mask=EYE_MASK)
+    for (i, probe) in enumerate(PROBES):
+        setattr(r, 'eye_height_'    + probe, heights[i])
+        setattr(r, 'eye_width_'     + probe, widths[i])
+        setattr(r, 'eye_area_'      + probe, areas[i])
+        setattr(r, 'eye_mask_hits_' + probe, mask_hits[i])
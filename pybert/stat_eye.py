@@ -0,0 +1,177 @@
+# Statistical eye diagram (and BER contour) calculation.
+#
+# Original author: agent <agent@local>
+# Original date:   October 19, 2026
+#
+# Copyright (c) 2026 agent; all rights reserved World wide.
+
+"""
+Statistical eye diagram (and BER contour) calculation.
+
+This Python script calculates the eye diagram, and the BER contours,
+of a link directly from its pulse response, rather than from a time
+domain simulation. It is intended as a fast companion to the bit by
+bit simulation performed by the larger 'PyBERT' framework, and can
+reach BER levels far lower than any practical simulation length.
+
+At each sampling phase, the probability distribution of the ISI is the
+convolution of the distributions of the individual cursors' contributions.
+We form it as the product of their characteristic functions, which makes
+the sub-bin placement of each cursor exact and lets Gaussian noise, and
+Gaussian jitter, be folded in simply by multiplication.
+"""
+
+from numpy     import array, arange, zeros, ones, where, clip, floor, exp, cos, pi, sqrt, argmax, cumsum
+from numpy.fft import fft, ifft, irfft, fftfreq, rfftfreq
+
+# Symbol levels (normalized to main cursor amplitude), by modulation type.
+# (Duo-binary symbols are treated as independent, which they aren't quite.)
+gLevels = {
+    0: [-1., 1.],                    # NRZ
+    1: [-1., 0., 1.],                # Duo-binary
+    2: [-1., -1. / 3., 1. / 3., 1.], # PAM-4
+}
+
+def _opening(mask, center):
+    """Return the length of the run of True values in 'mask' containing index 'center'."""
+
+    if(not mask[center]):
+        return 0
+    lo = center
+    while(lo > 0 and mask[lo - 1]):
+        lo -= 1
+    hi = center
+    while(hi < len(mask) - 1 and mask[hi + 1]):
+        hi += 1
+    return hi - lo + 1
+
+def calc_stat_eye(pulse, nspui, ts, mod_type=0, n_dfe_taps=0, sigma_v=0., sigma_t=0., height=256, ber_target=1.e-12, oversample=16):
+    """
+    Calculates the statistical eye diagram, BER contours, and eye opening, from a pulse response.
+
+    Inputs:
+
+      Required:
+
+      - pulse       The pulse response (i.e. - the response to a single symbol), sampled at 'nspui' samples per unit interval.
+
+      - nspui       The number of samples per unit interval.
+
+      - ts          The sample interval (s).
+
+      Optional:
+
+      - mod_type    The modulation type: 0 = NRZ; 1 = Duo-binary; 2 = PAM-4.
+
+      - n_dfe_taps  The number of post-cursors cancelled by an ideal DFE.
+                    (The DFE feedback is held for the whole unit interval, so the
+                    cancellation is only perfect at the main cursor phase.)
+
+      - sigma_v     The standard deviation of the Gaussian noise at the decision point (V).
+
+      - sigma_t     The standard deviation of the Gaussian sampling jitter (s).
+
+      - height      The number of vertical bins in the outputs.
+
+      - ber_target  The BER at which the eye height and width are measured.
+
+      - oversample  The vertical resolution of the internal calculation, relative to that of the outputs.
+
+    Outputs:
+
+      - img_array   The eye diagram, as a (height x 2*nspui) array of probabilities, centered on the main cursor.
+
+      - ber         The BER, of deciding against a threshold at each location in 'img_array'.
+
+      - ys          The voltage at the center of each row of 'img_array' and 'ber' (V).
+
+      - eye_height  The vertical opening, at 'ber_target', of the most closed eye (V).
+
+      - eye_width   The horizontal opening, at 'ber_target', of the most closed eye (s).
+
+    """
+
+    if(mod_type not in gLevels):
+        raise Exception("ERROR: calc_stat_eye(): Unrecognized modulation type requested!")
+    levels  = array(gLevels[mod_type])
+    pulse   = array(pulse, dtype=float)
+    n_pulse = len(pulse)
+    width   = 2 * nspui
+
+    # Gather the cursors seen at each sampling instant; rows are eye columns, relative to the main cursor.
+    main_ix = argmax(abs(pulse))
+    offsets = arange(width) - nspui
+    ks      = arange(-(main_ix // nspui) - 2, (n_pulse - main_ix) // nspui + 3)
+    ixs     = main_ix + offsets[:, None] + ks[None, :] * nspui
+    cursors = where((ixs >= 0) & (ixs < n_pulse), pulse[clip(ixs, 0, n_pulse - 1)], 0.)
+    main_ks = floor((offsets + nspui / 2.) / nspui).astype(int) # Main cursor UI, for each column.
+    rel_ks  = ks[None, :] - main_ks[:, None]
+    mains   = cursors[rel_ks == 0]
+
+    # Ideal DFE cancellation, using the tap weights appropriate to the main cursor phase.
+    if(n_dfe_taps):
+        taps   = zeros(n_dfe_taps)
+        tap_ix = main_ix + arange(1, n_dfe_taps + 1) * nspui
+        taps[tap_ix < n_pulse] = pulse[tap_ix[tap_ix < n_pulse]]
+        fb     = (rel_ks >= 1) & (rel_ks <= n_dfe_taps)
+        cursors[fb] -= taps[rel_ks[fb] - 1]
+    isi = where(rel_ks == 0, 0., cursors)
+
+    # Size the voltage grid to contain the entire distribution, so that the FFT doesn't wrap it.
+    # We work on a finer grid, internally, and apply just enough Gaussian smoothing to it to keep
+    # the (non-band-limited) ISI lines from leaking energy into the tails, where the low BER contours live.
+    y_max   = 1.05 * (abs(cursors).sum(axis=1).max() + 8. * sigma_v)
+    dv      = 2. * y_max / height
+    ys      = -y_max + (arange(height) + 0.5) * dv
+    n_fine  = height * oversample
+    dv_fine = dv / oversample
+    sigma   = sqrt(sigma_v ** 2 + (2.5 * dv_fine) ** 2)
+    w       = 2. * pi * rfftfreq(n_fine, dv_fine)
+
+    # The characteristic function of the ISI, plus noise. (Real, because the symbol levels are symmetric.)
+    chr_isi = ones((width, len(w)))
+    for k in range(isi.shape[1]):
+        phases   = w[None, :] * isi[:, k][:, None]
+        chr_isi *= sum([cos(phases * level) for level in levels]) / len(levels)
+    chr_isi *= exp(-0.5 * (sigma * w[None, :]) ** 2)
+
+    # The jitter is a (circular, since the 2 UI eye is periodic) Gaussian blur across the columns.
+    # (The kernel is sampled in time, rather than frequency, to keep it from going negative.)
+    if(sigma_t > 0.):
+        jit_kern = exp(-0.5 * (fftfreq(width, 1. / width) * ts / sigma_t) ** 2)
+    else:
+        jit_kern = (arange(width) == 0) * 1.
+    jit_filt = fft(jit_kern / jit_kern.sum())
+
+    # Condition on each possible main cursor symbol, measuring the result against a threshold at every grid point.
+    img_array = zeros((width, height))
+    ber       = zeros((width, height))
+    shift     = exp(1j * w[None, :] * (-y_max))
+    row_ixs   = arange(height) * oversample + oversample // 2 # The fine grid points nearest our row centers.
+    ys_fine   = -y_max + arange(n_fine) * dv_fine
+    for level in levels:
+        pmf   = irfft(chr_isi * shift * exp(-1j * w[None, :] * (mains * level)[:, None]), n_fine, axis=1)
+        pmf   = ifft(fft(pmf, axis=0) * jit_filt[:, None], axis=0).real
+        pmf   = clip(pmf, 0., 1.)
+        cdf   = cumsum(pmf, axis=1)[:, row_ixs]
+        above = (mains * level)[:, None] > ys_fine[row_ixs][None, :] # Should this symbol be decided above this row?
+        img_array += pmf.reshape((width, height, oversample)).sum(axis=2)
+        ber       += where(above, cdf, clip(1. - cdf, 0., 1.))
+    img_array /= len(levels)
+    ber       /= len(levels)
+
+    # Measure the most closed eye, at each decision threshold.
+    eye_height = eye_width = None
+    center     = nspui
+    main       = mains[center]
+    for thresh in (levels[:-1] + levels[1:]) / 2. * main:
+        thresh_ix  = argmax(ys >= thresh)
+        open_mask  = ber < ber_target
+        height_now = max([_opening(open_mask[col], thresh_ix) for col in range(nspui // 2, nspui // 2 + nspui)]) * dv
+        width_now  = _opening(open_mask[:, thresh_ix], center) * ts
+        if(eye_height is None or height_now < eye_height):
+            eye_height = height_now
+        if(eye_width is None or width_now < eye_width):
+            eye_width = width_now
+
+    return (img_array.T, ber.T, ys, eye_height, eye_width)
@@ -0,0 +1,218 @@
+# On-disk store of simulation results, for PyBERT.
+#
+# Original author: agent <agent@local>
+# Original date:   October 19, 2026
+#
+# Copyright (c) 2026 agent; all rights reserved World wide.
+
+"""
+On-disk store of simulation results, for PyBERT.
+
+This Python script provides a directory based store, into which the
+results of simulation runs may be saved, so that they can be analyzed,
+or compared, later, without re-simulating.
+
+Each run gets its own subdirectory, holding one '.npy' file per result
+array (waveforms, spectra, histograms, tap weight histories, etc.), as
+well as the run's profile (See instrument.py.), in 'profile.json'.
+These are opened memory-mapped, when read back; so, loading a run costs
+nothing until (and only for those parts of) an array actually touched.
+
+A small JSON index, at the top of the store, records the parameters,
+scalar metrics, array shapes, and time stamp of each run. (The store
+assumes a single writer.)
+
+Typical usage:
+
+    store  = ResultsStore('my_results')
+    run_id = store.save(params, results)
+    ...
+    run    = store.load(run_id)
+    print run.params.l_ch, run.metrics['tj_dfe'], run.dfe_out[-1000:].mean()
+"""
+
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+from simulation import Params
+
+gIndexFile   = 'index.json'
+gProfileFile = 'profile.json'
+
+def _to_json(val):
+    """Return 'val' as a JSON friendly scalar (or list of scalars), or None, if it isn't one."""
+
+    if(isinstance(val, (bool, np.bool_))):
+        return bool(val)
+    if(isinstance(val, (int, long, np.integer))):
+        return int(val)
+    if(isinstance(val, (float, np.floating))):
+        return float(val)
+    if(isinstance(val, tuple)):
+        vals = [_to_json(x) for x in val]
+        if(None not in vals):
+            return vals
+    return None
+
+def _to_array(val):
+    """Return 'val' as a numeric (i.e. - memory mappable) array, or None, if it can't be one."""
+
+    if(isinstance(val, (list, np.ndarray))):
+        try:
+            val = np.asarray(val)
+        except ValueError:
+            return None
+        if(val.ndim and val.dtype.kind in 'biufc'):
+            return val
+    return None
+
+class StoredRun(object):
+    """
+    One run, loaded from a 'ResultsStore'.
+
+    The result arrays are available as attributes, of the same names used by 'Results',
+    and are opened memory-mapped (read only) upon first access. The 'profile' attribute
+    holds the run's profile, as the dictionary returned by 'Profile.as_dict()', if one was saved.
+    """
+
+    def __init__(self, path, record):
+        self.path    = path
+        self.record  = record
+        self.id      = record['id']
+        self.time    = record['time']
+        self.params  = Params(**record['params'])
+        self.metrics = record['metrics']
+        self.arrays  = sorted(record['arrays'])
+
+    def __getattr__(self, name):
+        if(name in self.__dict__.get('record', {}).get('arrays', {})):
+            val = np.load(os.path.join(self.path, name + '.npy'), mmap_mode='r')
+            setattr(self, name, val)
+            return val
+        if(name == 'profile' and 'path' in self.__dict__):
+            profile_file = os.path.join(self.path, gProfileFile)
+            val          = None
+            if(os.path.exists(profile_file)):
+                with open(profile_file) as f:
+                    val = json.load(f)
+            self.profile = val
+            return val
+        raise AttributeError("'StoredRun' object has no attribute '%s'" % name)
+
+class ResultsStore(object):
+    """
+    A directory of saved simulation runs. (See the module documentation.)
+    """
+
+    def __init__(self, path):
+        """
+        Inputs:
+
+          - path      The store directory. (Created, if it doesn't exist.)
+        """
+
+        self.path = path
+        if(not os.path.isdir(path)):
+            os.makedirs(path)
+        self._index = self._read_index()
+
+    def _read_index(self):
+        index_file = os.path.join(self.path, gIndexFile)
+        if(not os.path.exists(index_file)):
+            return []
+        with open(index_file) as f:
+            return json.load(f)
+
+    def _write_index(self):
+        # (Written to a temporary file first, so that a crash can't leave a truncated index behind.)
+        index_file = os.path.join(self.path, gIndexFile)
+        with open(index_file + '.tmp', 'w') as f:
+            json.dump(self._index, f, indent=1, sort_keys=True)
+        os.rename(index_file + '.tmp', index_file)
+
+    def runs(self):
+        """Return the index records (dictionaries containing: 'id', 'time', 'name', 'params', 'metrics', and 'arrays') of all saved runs."""
+
+        return list(self._index)
+
+    def save(self, params, results, name=''):
+        """
+        Save a simulation run.
+
+        Inputs:
+
+          Required:
+
+          - params    The 'Params' used for the run.
+
+          - results   The 'Results' of the run. Its numeric arrays (and lists) are saved
+                      as '.npy' files; its scalars (and tuples of them) are saved, as
+                      metrics, in the index; its profile is saved as JSON.
+                      Anything else is skipped.
+
+          Optional:
+
+          - name      A descriptive name for the run.
+
+        Outputs:
+
+          - run_id    The identifier of the saved run.
+
+        """
+
+        run_ids = [record['id'] for record in self._index]
+        n       = len(run_ids) + 1
+        while('run%05d' % n in run_ids or os.path.exists(os.path.join(self.path, 'run%05d' % n))):
+            n += 1
+        run_id  = 'run%05d' % n
+        run_dir = os.path.join(self.path, run_id)
+        os.makedirs(run_dir)
+
+        metrics = {}
+        arrays  = {}
+        for (key, val) in sorted(vars(results).items()):
+            if(key in ('pipeline', 'stages_run', 'profile')):
+                continue
+            metric = _to_json(val)
+            if(metric is not None):
+                metrics[key] = metric
+                continue
+            arr = _to_array(val)
+            if(arr is not None):
+                np.save(os.path.join(run_dir, key + '.npy'), arr)
+                arrays[key] = [list(arr.shape), arr.dtype.str]
+        if(getattr(results, 'profile', None) is not None):
+            results.profile.save(os.path.join(run_dir, gProfileFile))
+
+        record = {
+            'id':      run_id,
+            'name':    name,
+            'time':    time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'params':  dict([(key, getattr(params, key)) for key in Params.names()]),
+            'metrics': metrics,
+            'arrays':  arrays,
+        }
+        self._index.append(record)
+        self._write_index()
+
+        return run_id
+
+    def load(self, run_id):
+        """Return the saved run, as a 'StoredRun'."""
+
+        for record in self._index:
+            if(record['id'] == run_id):
+                return StoredRun(os.path.join(self.path, run_id), record)
+        raise Exception("ERROR: ResultsStore.load(): No such run, '%s'!" % run_id)
+
+    def delete(self, run_id):
+        """Remove a saved run, and its arrays, from the store."""
+
+        self.load(run_id) # (Just checking that it exists.)
+        self._index = [record for record in self._index if record['id'] != run_id]
+        self._write_index()
+        shutil.rmtree(os.path.join(self.path, run_id))
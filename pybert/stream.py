@@ -0,0 +1,317 @@
+# Streaming (chunked) simulation for PyBERT.
+#
+# Original author: agent <agent@local>
+# Original date:   October 19, 2026
+#
+# Copyright (c) 2026 agent; all rights reserved World wide.
+
+"""
+Streaming (chunked) simulation for PyBERT.
+
+This Python script runs the simulation a chunk of bits at a time, so
+that the memory required is set by the chunk size, rather than by the
+length of the run. This makes long BER soaks (1e8 bits, and beyond)
+practical.
+
+Each chunk of bits is generated from the repeating test pattern, and
+passed through the Tx, channel, and CTLE using overlap-save filters,
+which carry their last few input samples over to the next chunk. The
+DFE/CDR carries its state over, as well. The waveforms of each chunk
+are then folded into a set of accumulators, and discarded:
+
+  - an eye diagram, at each probe point (See 'EyeAccumulator'.),
+  - the jitter, at each probe point (See 'JitterAccumulator'.), and
+  - the bit error count, at the DFE output.
+
+The impulse responses are taken from a short (one chunk) run of the
+regular simulation stages (See 'simulation.py'.); so, they're identical
+to those of a regular run of that length.
+
+The accumulation begins at the end of the warm up period (part way
+through a chunk, if need be), which allows the DFE and CDR time to
+adapt and lock.
+
+Typical usage:
+
+    from pybert.simulation import Params
+    from pybert.stream     import simulate_stream
+
+    results = simulate_stream(Params(nbits=100000000, l_ch=2.))
+    print results.bit_errs, results.ber, results.tj_dfe
+"""
+
+from numpy        import array, arange, zeros, concatenate, repeat, cumsum
+from pipeline     import Pipeline
+from simulation   import Params, Results, check_params, make_pipeline, make_dfe, measure_eyes, TJ_BER, PROBES, gFc
+from pybert_util  import OverlapSaveFilter, JitterAccumulator, EyeAccumulator, calc_tj
+from instrument   import Profile, section
+from rng          import rng_stream
+
+gChunkBits   = 8192                          # default number of bits per chunk
+gWarmupBits  = Params.nbits - Params.eye_bits # default number of bits allowed for adaptation, before accumulating
+gEyeHeadroom = 1.5                           # eye diagram vertical range, relative to the peak of the first chunk accumulated
+
+class StreamResults(object):
+    """
+    The results of a streaming simulation.
+
+    Attributes:
+
+      - nbits_run        The number of bits run.
+
+      - bits_checked     The number of bits checked for errors (i.e. - those after the warm up period).
+
+      - bit_errs         The number of bit errors detected.
+
+      - ber              The bit error rate. (Zero, if no errors were detected.)
+
+      - bit_dly          The delay, in bits, between the Tx and the DFE output (modulo the pattern length).
+
+      - eye_ys           The signal level of each eye diagram row (V); one row per probe point.
+
+      - tap_weights      The final DFE tap weights.
+
+      - ui_est           The final CDR unit interval estimate (s).
+
+      - locked_fraction  The fraction of samples, after the warm up period, during which the CDR was locked.
+
+      - jitter_bins      The jitter histogram bin centers (s).
+
+    For each probe point (i.e. - 'chnl', 'tx', 'ctle', and 'dfe') the following, as well:
+    (See 'calc_jitter()', 'fit_dual_dirac()', and 'measure_eyes()', in simulation.py.)
+
+      - isi_<probe>, dcd_<probe>, pj_<probe>, rj_<probe>, tj_<probe>,
+        dual_dirac_<probe>, jitter_<probe>, thresh_<probe>,
+        jitter_spectrum_<probe>, jitter_ind_spectrum_<probe>
+
+      - eye_<probe>, eye_height_<probe>, eye_width_<probe>, eye_area_<probe>, eye_mask_hits_<probe>
+
+    (The DFE output eye is centered on the recovered clock; the others are free-running.)
+
+    along w/ the frequencies of the jitter spectra, 'f_MHz', and the impulse responses of the
+    channel, 'chnl_h', and of the Tx/channel/CTLE combination, 'ctle_out_h'. The timing and
+    memory usage of each part of the run are in 'profile'. (See instrument.py.) The random number
+    seed used is in 'seed'. (See rng.py.)
+    """
+
+    pass
+
+def _symbols(bits, mod_type, parity):
+    """
+    Encode a chunk of bits, returning the symbols and the duo-binary pre-coder state.
+
+    (The encoding is identical to that of 'run_signal()', in simulation.py.)
+    """
+
+    if  (mod_type == 0):                         # NRZ
+        symbols = 2. * bits - 1.
+    elif(mod_type == 1):                         # Duo-binary
+        precoded = concatenate(([parity], (parity + cumsum(bits)) % 2)) # XOR pre-coding, carried across chunks
+        levels   = (2. * precoded - 1.) / 2.
+        symbols  = levels[:-1] + levels[1:]
+        parity   = precoded[-1]
+    elif(mod_type == 2):                         # PAM-4
+        symbols  = repeat(((bits[0::2] << 1) + bits[1::2]) * 2. / 3. - 1., 2)
+    else:
+        raise Exception("ERROR: simulate_stream(): Unknown modulation type requested!")
+    return (symbols, parity)
+
+def _align_bits(rx_bits, first_ix, pattern):
+    """Return the delay (in bits, modulo the pattern length) best aligning the received bits to the test pattern."""
+
+    pattern_len = len(pattern)
+    ixs         = first_ix + arange(len(rx_bits))
+    errs        = [(rx_bits != pattern[(ixs - dly) % pattern_len]).sum() for dly in range(pattern_len)]
+    return int(array(errs).argmin())
+
+def simulate_stream(params, chunk_bits=gChunkBits, warmup_bits=gWarmupBits, progress=None):
+    """
+    Runs the simulation, a chunk at a time.
+
+    Inputs:
+
+      Required:
+
+      - params        The simulation parameters, as a 'Params' instance.
+                      ('nbits' is the length of the run; 'eye_bits' is ignored.)
+                      ('eye_rows' and 'eye_cols' give the size of the eye diagram images.)
+
+      Optional:
+
+      - chunk_bits    The number of bits per chunk. Sets the memory required.
+                      (Must be even, for PAM-4, and at least four pattern lengths.)
+
+      - warmup_bits   The number of bits run before accumulation begins.
+
+      - progress      A function, taking a status string and the fraction of the run completed,
+                      called after each chunk. It may raise an exception, to abort the run.
+
+    Outputs:
+
+      - results       The simulation results, as a 'StreamResults' instance.
+
+    """
+
+    check_params(params)
+    nbits       = params.nbits
+    nspb        = params.nspb
+    eye_rows    = params.eye_rows
+    eye_cols    = params.eye_cols or None
+    pattern_len = params.pattern_len
+    mod_type    = params.mod_type
+
+    assert chunk_bits >= 4 * pattern_len, "simulate_stream(): 'chunk_bits' must be at least four pattern lengths!"
+    assert mod_type != 2 or not (chunk_bits % 2 or nbits % 2), "simulate_stream(): PAM-4 requires even 'chunk_bits' and 'nbits'!"
+    assert warmup_bits < nbits, "simulate_stream(): The run must be longer than the warm up period!"
+    seg_len = params.seg_len or 1024
+    n_uis   = nbits - warmup_bits
+    if(mod_type == 2):                           # PAM-4 uses 2 UI per transmitted symbol.
+        n_uis //= 2
+    if(n_uis < seg_len):
+        raise Exception("ERROR: simulate_stream(): Only %d UI follow the warm up period; at least %d (one jitter spectrum segment) are needed!"
+                        % (n_uis, seg_len))
+
+    r         = StreamResults()
+    r.profile = Profile(aggregate=True)
+    with r.profile.section('stream'):
+        # Find the impulse responses, the test pattern, and the ideal crossings, from a one chunk run of the regular stages.
+        with section('setup'):
+            kwargs          = dict([(name, getattr(params, name)) for name in Params.names()])
+            kwargs['nbits'] = chunk_bits
+            ref             = Pipeline([stage for stage in make_pipeline().stages if stage.name in ('signal', 'channel', 'tx', 'ctle')])
+            ref.run(Params(**kwargs), Results())
+            ctx             = ref.outputs
+            ui              = ctx['ui']          # (the symbol period, for PAM-4)
+            Ts              = ctx['Ts']
+            nspui           = ctx['nspui']
+            pattern         = array(ctx['bits'][:pattern_len])
+            r.seed          = ctx['seed']
+            r.chnl_h        = ctx['chnl_h']
+            r.ctle_out_h    = ctx['ctle_out_h']
+
+            # - The ideal signal repeats every two patterns, at most. (The duo-binary pre-coder parity may flip, from one
+            #   pattern to the next.) We take the ideal crossings from the second period, to avoid start up effects.
+            period      = 2 * pattern_len * params.ui * 1.e-12
+            ideal       = array(ctx['ideal_xings'])
+            ideal       = ideal[(ideal >= period) & (ideal < 2 * period)] - period
+            if(mod_type == 1):
+                thresholds = (-params.decision_scaler / 2., params.decision_scaler / 2.)
+            else:
+                thresholds = (0.,)
+            jitters     = dict([(probe, JitterAccumulator(ui, ideal, period, thresholds=thresholds,
+                                                          seg_len=seg_len, rel_thresh=params.thresh))
+                                for probe in PROBES])
+
+            # - The filters, noise sources, and DFE, all of which carry their state from chunk to chunk.
+            ffe         = [params.pretap, 1.0 - abs(params.pretap) - abs(params.posttap), params.posttap]
+            ffe_filter  = OverlapSaveFilter(ffe)
+            chnl_filter = OverlapSaveFilter(ctx['chnl_h'])
+            tx_filter   = OverlapSaveFilter(ctx['chnl_h'])
+            ctle_filter = OverlapSaveFilter(ctx['ctle_h'])
+            from scipy.signal import lfilter, iirfilter
+            (b, a)      = iirfilter(2, gFc / (ctx['fs'] / 2), btype='highpass')
+            pn_zi       = zeros(max(len(a), len(b)) - 1)
+            pn_samps    = int(1. / (params.pn_freq * 1.e6) / Ts + 0.5)
+            pn_period   = zeros(pn_samps)
+            pn_period[pn_samps // 2:] = params.pn_mag
+            noise       = rng_stream(ctx['seed'], 'noise') # (Drawn from in sequence; so, the noise matches that of a regular run.)
+            dfe         = make_dfe(params, ui, nspui)
+
+        eyes         = {}
+        bit_ix       = 0                         # the absolute index of the first bit of the chunk
+        samp_ix      = 0                         # the absolute index of the first sample of the chunk
+        rx_ix        = 0                         # the absolute index of the next bit out of the DFE
+        parity       = 0
+        bit_dly      = None
+        bits_checked = 0
+        bit_errs     = 0
+        n_locked     = 0
+        n_checked    = 0
+        tap_weights  = dfe.tap_weights
+        while(bit_ix < nbits):
+            n_bits = min(chunk_bits, nbits - bit_ix)
+            bits   = pattern[(bit_ix + arange(n_bits)) % pattern_len]
+            (symbols, parity) = _symbols(bits, mod_type, parity)
+            x      = repeat(symbols, nspb)
+            t      = (samp_ix + arange(len(x))) * Ts
+
+            with section('channel'):
+                chnl_out = chnl_filter.feed(x)
+            with section('tx'):
+                tx_out   = repeat(ffe_filter.feed(symbols), nspb)
+                (pn, pn_zi) = lfilter(b, a, pn_period[(samp_ix + arange(len(x))) % pn_samps], zi=pn_zi)
+                tx_out   = tx_filter.feed(tx_out + pn) + noise.normal(scale=params.rn, size=(len(x),))
+            with section('ctle'):
+                ctle_out = ctle_filter.feed(tx_out)
+            with section('dfe'):
+                (dfe_out, tap_hist, ui_ests, clocks, lockeds, clock_times, bits_out) = dfe.run(t, ctle_out)
+                dfe_out  = array(dfe_out)
+                bits_out = array(bits_out)
+                if(tap_hist):
+                    tap_weights = tap_hist[-1]
+
+            if(bit_ix + n_bits > warmup_bits):
+                # - The chunk straddling the end of the warm up period is trimmed to the part following it.
+                skip_samps = max(0, warmup_bits - bit_ix) * nspb
+                skip_bits  = min(len(bits_out), max(0, warmup_bits - rx_ix))
+                t_acc      = t[skip_samps:]
+                with section('jitter'):
+                    for (probe, y) in zip(PROBES, (chnl_out, tx_out, ctle_out, dfe_out)):
+                        jitters[probe].feed(t_acc, y[skip_samps:])
+                with section('eye'):
+                    if(not eyes):
+                        y_max  = gEyeHeadroom * max(abs(dfe_out[skip_samps:]).max(), abs(ctle_out[skip_samps:]).max())
+                        y_maxs = {'chnl': gEyeHeadroom * abs(chnl_out[skip_samps:]).max(),
+                                  'tx':   gEyeHeadroom * abs(tx_out[skip_samps:]).max(),
+                                  'ctle': y_max,
+                                  'dfe':  y_max}
+                        for probe in PROBES:
+                            eyes[probe] = EyeAccumulator(ui, nspui, eye_rows, y_maxs[probe], width=eye_cols, start_ix=samp_ix + skip_samps)
+                    eyes['chnl'].feed(chnl_out[skip_samps:])
+                    eyes['tx'].feed(tx_out[skip_samps:])
+                    eyes['ctle'].feed(ctle_out[skip_samps:])
+                    eyes['dfe'].feed(dfe_out[skip_samps:], clock_times)
+                with section('errors'):
+                    rx_bits = bits_out[skip_bits:]
+                    if(bit_dly is None):
+                        bit_dly = _align_bits(rx_bits, rx_ix + skip_bits, pattern)
+                    tx_bits       = pattern[(rx_ix + skip_bits + arange(len(rx_bits)) - bit_dly) % pattern_len]
+                    bit_errs     += int((rx_bits != tx_bits).sum())
+                    bits_checked += len(rx_bits)
+                n_locked  += sum(lockeds[skip_samps:])
+                n_checked += len(lockeds[skip_samps:])
+
+            bit_ix  += n_bits
+            samp_ix += len(x)
+            rx_ix   += len(bits_out)
+            if(progress):
+                progress('Streaming...', float(bit_ix) / nbits)
+
+        with section('results'):
+            r.nbits_run       = bit_ix
+            r.bits_checked    = bits_checked
+            r.bit_errs        = bit_errs
+            r.ber             = float(bit_errs) / max(1, bits_checked)
+            r.bit_dly         = bit_dly
+            r.eye_ys          = array([(arange(eye_rows) - eye_rows // 2) / eyes[probe].y_scale for probe in PROBES])
+            for probe in PROBES:
+                setattr(r, 'eye_' + probe, eyes[probe].img_array)
+            measure_eyes(r, [eyes[probe].img_array for probe in PROBES], r.eye_ys, eyes['dfe'].img_array.shape[1] / 2., ui)
+            r.tap_weights     = tap_weights
+            r.ui_est          = dfe.ui
+            r.locked_fraction = float(n_locked) / max(1, n_checked)
+            for probe in PROBES:
+                if(not jitters[probe].spec_ind.n_segs):
+                    raise Exception("ERROR: simulate_stream(): Too few jitter samples, at the '%s' probe, to form a spectrum segment! (Try a longer run.)"
+                                    % probe)
+                jitter = jitters[probe].results()
+                for key in ('isi', 'dcd', 'pj', 'rj', 'dual_dirac', 'thresh'):
+                    setattr(r, key + '_' + probe, jitter[key])
+                setattr(r, 'tj_' + probe,                  calc_tj(TJ_BER, jitter['dual_dirac']))
+                setattr(r, 'jitter_' + probe,              jitter['hist'])
+                setattr(r, 'jitter_spectrum_' + probe,     jitter['jitter_spectrum'])
+                setattr(r, 'jitter_ind_spectrum_' + probe, jitter['tie_ind_spectrum'])
+            r.jitter_bins     = jitter['bin_centers']
+            r.f_MHz           = array(jitter['spectrum_freqs']) * 1.e-6
+
+    return r
@@ -0,0 +1,244 @@
+# Parameter sweep runner for PyBERT.
+#
+# Original author: agent <agent@local>
+# Original date:   October 19, 2026
+#
+# Copyright (c) 2026 agent; all rights reserved World wide.
+
+"""
+Parameter sweep runner for PyBERT.
+
+This Python script runs the headless simulation (See 'simulation.py'.)
+at every point of a grid of parameter values, distributing the runs
+across a pool of worker processes.
+
+Those simulation stages unaffected by the swept parameters (typically,
+the signal generation and the channel) are run only once, up front.
+Their outputs are placed in shared memory, and every run picks up from
+there. (So, all runs see the same bit pattern, as well. Unless 'seed' is
+swept, they see the same random noise, too, which makes for a cleaner
+comparison of the points. See rng.py.)
+
+Results are returned, and optionally written to a CSV file, one row
+per run, in the order in which the runs finish.
+
+Typical usage:
+
+    from pybert.sweep import run_sweep
+
+    rows = run_sweep({'l_ch': [0.5, 1., 2.], 'peak_mag': [6., 10.], 'n_taps': [3, 5]},
+                     filename='sweep.csv')
+"""
+
+import csv
+import itertools
+import multiprocessing as mp
+
+from numpy        import ndarray, float64, float32
+from parallel     import share_array, shared_to_array
+from pipeline     import Pipeline
+from simulation   import Params, Results, simulate, make_pipeline
+
+# The metrics recorded for each run. (All in SI units: V, s. See 'measure_eyes()', in simulation.py, for the eye metrics.)
+gMetrics = [
+    'bit_errs',
+    'isi_dfe', 'dcd_dfe', 'pj_dfe', 'rj_dfe', 'tj_dfe',
+    'eye_height_chnl', 'eye_width_chnl', 'eye_area_chnl', 'eye_mask_hits_chnl',
+    'eye_height_tx',   'eye_width_tx',   'eye_area_tx',   'eye_mask_hits_tx',
+    'eye_height_ctle', 'eye_width_ctle', 'eye_area_ctle', 'eye_mask_hits_ctle',
+    'eye_height_dfe',  'eye_width_dfe',  'eye_area_dfe',  'eye_mask_hits_dfe',
+    'stat_eye_height', 'stat_eye_width',
+]
+
+# Handed to each worker, at pool creation time.
+_base   = None
+_shared = {}
+_snaps  = {}
+
+def grid_points(grid):
+    """
+    Expand a parameter grid into the list of its points.
+
+    Inputs:
+
+      - grid     Either a dictionary, or a list of (name, values) pairs,
+                 giving the values to be swept for each parameter.
+                 (When a dictionary is given, the names are taken in sorted order.)
+
+    Outputs:
+
+      - names    The names of the swept parameters.
+
+      - points   A list of tuples of parameter values; one for every combination.
+
+    """
+
+    if(isinstance(grid, dict)):
+        grid = sorted(grid.items())
+    names  = [name for (name, values) in grid]
+    points = list(itertools.product(*[values for (name, values) in grid]))
+    return (names, points)
+
+def shared_stages(pipeline, names):
+    """Return the names of those stages of 'pipeline' unaffected by any of the parameters in 'names'."""
+
+    shared = []
+    for stage in pipeline.stages:
+        if(not set(names).intersection(stage.inputs) and not [up for up in stage.upstream if up not in shared]):
+            shared.append(stage.name)
+    return shared
+
+def _init_worker(base, shared, snaps):
+    """Pool initializer; stashes the base parameters and the outputs of the shared stages."""
+
+    global _base, _shared, _snaps
+    _base   = base
+    _shared = shared
+    _snaps  = snaps
+
+def _sweep_job(job):
+    """
+    Run the simulation at one point of the grid.
+
+    The job is a tuple containing:
+
+      - index    The index of the point. (Returned, untouched.)
+
+      - names    The names of the swept parameters.
+
+      - values   Their values, at this point.
+
+    """
+
+    (index, names, values) = job
+
+    kwargs = dict([(name, getattr(_base, name)) for name in Params.names()])
+    kwargs.update(zip(names, values))
+    try:
+        params  = Params(**kwargs)
+        results = Results()
+        for (key, val) in _shared.items():
+            if(isinstance(val, tuple)):
+                val = shared_to_array(val)
+            results.pipeline.outputs[key] = val
+        results.pipeline.snapshots.update(_snaps)
+        simulate(params, results)
+        metrics = dict([(name, getattr(results, name)) for name in gMetrics if hasattr(results, name)])
+        error   = ''
+    except Exception, err:
+        metrics = {}
+        error   = str(err)
+
+    return (index, values, metrics, error)
+
+def iter_sweep(grid, base=None, n_procs=None):
+    """
+    Run the simulation at every point of a parameter grid, yielding the results as they arrive.
+
+    Inputs:
+
+      Required:
+
+      - grid      The parameter grid. (See 'grid_points()'.)
+
+      Optional:
+
+      - base      The 'Params' from which the swept values depart. Default = Params().
+
+      - n_procs   The number of worker processes to use. Default = # of CPUs.
+                  A value of 1 runs the simulations serially, in this process.
+
+    Outputs: (yielded, as each run finishes)
+
+      - index     The index of the point, into the list returned by 'grid_points()'.
+
+      - values    The values of the swept parameters, at this point.
+
+      - metrics   A dictionary of the metrics named in 'gMetrics'. (Empty, if the run failed.)
+
+      - error     The error message, if the run failed; otherwise, the empty string.
+
+    """
+
+    if(base is None):
+        base = Params()
+    if(n_procs is None):
+        n_procs = mp.cpu_count()
+    (names, points) = grid_points(grid)
+    for name in names:
+        if(name not in Params.names()):
+            raise Exception("ERROR: iter_sweep(): Unrecognized simulation parameter, '%s'!" % name)
+
+    # Run the stages common to all points, once, and share their outputs.
+    pipeline = make_pipeline()
+    common   = Pipeline([stage for stage in pipeline.stages if stage.name in shared_stages(pipeline, names)])
+    common.run(base, Results())
+    shared   = {}
+    for (key, val) in common.outputs.items():
+        if(isinstance(val, ndarray) and val.dtype in (float64, float32)):
+            val = share_array(val)
+        shared[key] = val
+
+    jobs = [(index, names, values) for (index, values) in enumerate(points)]
+    if(n_procs <= 1):
+        _init_worker(base, shared, common.snapshots)
+        for job in jobs:
+            yield _sweep_job(job)
+        return
+
+    pool = mp.Pool(n_procs, _init_worker, (base, shared, common.snapshots))
+    try:
+        for result in pool.imap_unordered(_sweep_job, jobs, chunksize=1):
+            yield result
+    finally:
+        pool.terminate()
+        pool.join()
+
+def run_sweep(grid, base=None, n_procs=None, filename=None):
+    """
+    Run the simulation at every point of a parameter grid.
+
+    Inputs:
+
+      Required:
+
+      - grid      The parameter grid. (See 'grid_points()'.)
+
+      Optional:
+
+      - base      The 'Params' from which the swept values depart. Default = Params().
+
+      - n_procs   The number of worker processes to use. Default = # of CPUs.
+
+      - filename  The name of a CSV file, to which the results are written, as they arrive.
+                  (The file is flushed after each row; so, a partial sweep isn't lost.)
+
+    Outputs:
+
+      - rows      A list of dictionaries, one per run, in the order the runs finished,
+                  containing: 'index', the swept parameter values, the metrics, and 'error'.
+
+    """
+
+    (names, points) = grid_points(grid)
+    columns = ['index'] + names + gMetrics + ['error']
+    rows    = []
+    if(filename):
+        f      = open(filename, 'wb')
+        writer = csv.DictWriter(f, columns)
+        writer.writerow(dict(zip(columns, columns)))
+    try:
+        for (index, values, metrics, error) in iter_sweep(grid, base=base, n_procs=n_procs):
+            row = dict(zip(names, values))
+            row.update(metrics)
+            row['index'] = index
+            row['error'] = error
+            rows.append(row)
+            if(filename):
+                writer.writerow(row)
+                f.flush()
+    finally:
+        if(filename):
+            f.close()
+
+    return rows
@@ -0,0 +1,125 @@
+# Background simulation worker for PyBERT.
+#
+# Original author: agent <agent@local>
+# Original date:   October 19, 2026
+#
+# Copyright (c) 2026 agent; all rights reserved World wide.
+
+"""
+Background simulation worker for PyBERT.
+
+This Python script provides a means of running the headless simulation
+(See 'simulation.py'.) on a background thread, so that the GUI remains
+responsive while it runs.
+
+The worker never touches the GUI. Instead, it posts its progress to a
+thread safe queue, which the GUI drains at its leisure, and it leaves
+its results for the GUI to collect, in one batch, when it's done.
+Cancellation is cooperative: the run is abandoned at the next progress
+report (i.e. - at the next stage boundary, or within 1% of the DFE run).
+"""
+
+import os
+import Queue
+import sys
+import threading
+import time
+import traceback
+
+from simulation import simulate
+
+class SimulationCancelled(Exception):
+    """Raised, from within the simulation, to abandon a cancelled run."""
+
+    pass
+
+class SimulationWorker(object):
+    """
+    Runs the simulation on a background thread.
+
+    Typical usage:
+
+        worker = SimulationWorker(params)
+        worker.start()
+        while(worker.is_alive()):
+            for (status, fraction) in worker.messages():
+                ...
+        if(worker.error is None):
+            results = worker.results
+    """
+
+    def __init__(self, params, results=None, force=False):
+        """
+        Inputs:
+
+          Required:
+
+          - params    The simulation parameters, as a 'Params' instance.
+
+          Optional:
+
+          - results   The 'Results' of a previous run, to be updated incrementally.
+                      (This object is modified by the worker; so, it mustn't be used
+                      by anyone else, until the worker is done.)
+
+          - force     If True, run every stage, regardless.
+        """
+
+        self.params     = params
+        self.results    = results
+        self.force      = force
+        self.error      = None  # Set to an error message, if the run doesn't complete. (Names where an exception was raised.)
+        self.traceback  = None  # Set to the full traceback, if the run raised an exception.
+        self.start_time = None
+        self.run_time   = None
+        self._queue     = Queue.Queue()
+        self._cancel    = threading.Event()
+        self._thread    = threading.Thread(target=self._run, name='PyBERT simulation')
+        self._thread.daemon = True # Don't hold up the application's exit.
+
+    def start(self):
+        """Start the simulation."""
+
+        self.start_time = time.time()
+        self._thread.start()
+
+    def cancel(self):
+        """Ask the simulation to stop, at its next opportunity."""
+
+        self._cancel.set()
+
+    def is_alive(self):
+        """Returns True, while the simulation is running."""
+
+        return self._thread.is_alive()
+
+    def join(self, timeout=None):
+        """Wait for the simulation to finish."""
+
+        self._thread.join(timeout)
+
+    def messages(self):
+        """Returns (without blocking) the list of (status, fraction) progress reports received since the last call."""
+
+        msgs = []
+        while(True):
+            try:
+                msgs.append(self._queue.get_nowait())
+            except Queue.Empty:
+                return msgs
+
+    def _report(self, status, fraction):
+        if(self._cancel.is_set()):
+            raise SimulationCancelled()
+        self._queue.put((status, fraction))
+
+    def _run(self):
+        try:
+            self.results = simulate(self.params, results=self.results, force=self.force, progress=self._report)
+        except SimulationCancelled:
+            self.error = 'Cancelled.'
+        except Exception, err:
+            (file_name, line, func, _) = traceback.extract_tb(sys.exc_info()[2])[-1]
+            self.error     = 'Error: %s (In %s(), at %s:%d.)' % (err, func, os.path.basename(file_name), line)
+            self.traceback = traceback.format_exc()
+        self.run_time = time.time() - self.start_time
@@ -0,0 +1,57 @@
+# Chunked vs. batch check of the eye diagram accumulator.
+#
+# Original author: agent <agent@local>
+# Original date:   October 19, 2026
+#
+# Copyright (c) 2026 agent; all rights reserved World wide.
+
+"""
+Checks that an eye diagram accumulated in chunks matches one formed in a single batch.
+
+Run from the top level directory:
+
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import unittest
+
+from numpy        import arange, repeat, convolve, ones, array, array_equal
+from numpy.random import RandomState
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'pybert'))
+
+from pybert_util import calc_eye, EyeAccumulator
+
+class TestEyeAccumulator(unittest.TestCase):
+
+    def _check(self, nspui, width, chunk_len, height=64, n_bits=2000):
+        ui    = 100.e-12
+        tsamp = ui / nspui
+        rng   = RandomState(0)
+        ys    = convolve(repeat(2. * rng.randint(2, size=n_bits) - 1., nspui), ones(nspui) / nspui)[: n_bits * nspui]
+        clock_times = (arange(1, n_bits) + 0.5) * ui + rng.normal(scale=0.02 * ui, size=n_bits - 1)
+
+        batch = calc_eye(ui, nspui, height, ys, list(clock_times), width=width)
+
+        eye = EyeAccumulator(ui, nspui, height, 1.1 * max(abs(ys)), width=width)
+        for start in range(0, len(ys), chunk_len):
+            stop  = min(start + chunk_len, len(ys))
+            clks  = clock_times[(clock_times >= start * tsamp) & (clock_times < stop * tsamp)]
+            eye.feed(ys[start : stop], clks)
+
+        self.assertTrue(array_equal(eye.img_array, batch),
+                        "%d of %d hits accumulated" % (eye.img_array.sum(), batch.sum()))
+
+    def test_one_column_per_sample(self):
+        self._check(nspui=16, width=32, chunk_len=1000)
+
+    def test_narrow(self):
+        self._check(nspui=16, width=4, chunk_len=1000)
+
+    def test_wide(self):
+        self._check(nspui=8, width=50, chunk_len=777)
+
+if __name__ == '__main__':
+    unittest.main()
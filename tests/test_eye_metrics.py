@@ -0,0 +1,68 @@
+# Checks of the eye opening and mask measurements, on eyes of known shape.
+#
+# Original author: agent <agent@local>
+# Original date:   October 19, 2026
+#
+# Copyright (c) 2026 agent; all rights reserved World wide.
+
+"""
+Checks of the eye opening and mask measurements, on eyes of known shape.
+
+Run from the top level directory:
+
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import unittest
+
+from numpy        import arange, repeat, convolve, ones, roll, where
+from numpy.random import RandomState
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'pybert'))
+
+from pybert_util import calc_eye, calc_eye_metrics, find_eye_center
+from simulation  import EYE_MASK
+
+class TestEyeMetrics(unittest.TestCase):
+
+    nspui  = 32
+    ui     = 100.e-12
+    height = 100
+
+    def setUp(self):
+        # A clean NRZ eye, w/ an 8 sample boxcar of ISI; so, its crossings are 8 samples wide.
+        bits        = RandomState(0).randint(2, size=2000)
+        ys          = convolve(repeat(2. * bits - 1., self.nspui), ones(8) / 8.)[: len(bits) * self.nspui]
+        self.img    = calc_eye(self.ui, self.nspui, self.height, ys)
+        self.eye_ys = (arange(self.height) - self.height // 2) * 2.2 * max(abs(ys)) / self.height
+
+    def _check_centered(self, img):
+        (heights, widths, areas, mask_hits, center_cols) = calc_eye_metrics([img], self.eye_ys, self.nspui, self.ui, mask=EYE_MASK)
+        center_col = center_cols[0]
+        self.assertEqual(mask_hits[0], 0)
+        self.assertTrue(heights[0] > 1.9)
+        self.assertTrue(widths[0] > 0.9 * self.ui)
+
+        # The center is midway between the crossings either side of it.
+        closed = where(img[self.height // 2] > 0)[0]
+        left   = closed[closed < center_col].max()
+        right  = closed[closed > center_col].min()
+        self.assertTrue(abs((center_col - left) - (right - center_col)) <= 1,
+                        "Eye center (%d) isn't midway between the crossings (%d and %d)!" % (center_col, left, right))
+
+    def test_open_eye(self):
+        self._check_centered(self.img)
+
+    def test_opening_straddling_middle_ui_boundary(self):
+        self._check_centered(roll(self.img, self.nspui // 2, axis=1))
+
+    def test_find_eye_center(self):
+        self.assertEqual(find_eye_center([0, 1, 1, 1, 1, 1, 0, 1]), 3)
+        self.assertEqual(find_eye_center([1, 1, 0, 1, 1, 1, 0, 1]), 4)
+        self.assertEqual(find_eye_center([1, 1, 1, 1]), None)
+        self.assertEqual(find_eye_center([0, 0, 0, 0]), None)
+
+if __name__ == '__main__':
+    unittest.main()